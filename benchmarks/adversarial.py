@@ -0,0 +1,82 @@
+"""
+Time the rejection (or parsing) of adversarial `COMBINED` entries — floods of
+backslashes, ``\\xHH`` escapes, quotes, spaces, & bracketed words, and very
+long lines — and `VHOST_COMBINED` entries in which every colon could end the
+virtual host with `LogParser`'s ``"regex"`` & ``"split"`` engines and with
+``max_line_length``, and report the worst-case time per entry for each.  Exits
+with status 1 if any worst case exceeds `LIMIT` microseconds, so that a
+regression to backtracking that grows exponentially (or quadratically) with
+the length of an entry gets caught.
+
+Run with ``python benchmarks/adversarial.py`` from the root of the repository.
+"""
+
+from functools import partial
+import sys
+from timing import best_of, report
+import apachelogs
+
+#: The most microseconds that rejecting or parsing any one entry may take
+LIMIT = 50000
+
+PREFIX = '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "'
+
+ENTRIES = {
+    "typical": (
+        PREFIX + 'GET / HTTP/1.1" 301 577 "-" "Mozilla/5.0 (Windows NT 6.1;'
+        ' Win64; x64; rv:58.0) Gecko/20100101 Firefox/58.0"'
+    ),
+    "\\xHH, bad tail": PREFIX + "\\x41" * 500 + '" 200 1 "-" "-" x',
+    "\\xHH, unterminated": PREFIX + "\\x41" * 500,
+    "backslash flood": PREFIX + "\\" * 4000,
+    "escaped quotes": PREFIX + '\\"' * 2000 + " 200",
+    "quote-spaces": PREFIX + '" "' * 1000 + "x",
+    "space flood": PREFIX + " " * 4000 + "x",
+    "bracketed words": "1.2.3.4 - " + "a [x] " * 2000 + "zz",
+    "spaced host": "1.2.3.4 " * 1500 + '- - [x] "r" 200 1 "-" "-" x',
+    "64 KB request line": PREFIX + "GET /" + "a" * 65536 + ' HTTP/1.1" 200 1 "-" "-"',
+}
+
+VHOST_ENTRIES = {
+    "vhost colons": "a:1 " * 4000 + "zz",
+    "vhost colons, all literals": "a:1 " * 4000 + '[x] "r" 200 1 "-" "-"',
+    "vhost colons & brackets": "a:1 [x] " * 2000 + '"r" 200 1 "-" "-"',
+}
+
+#: The ``max_line_length`` used for the guarded parser
+MAX_LINE_LENGTH = 4096
+
+
+def parse_one(parser, entry):
+    return list(parser.parse_lines([entry], ignore_invalid=True))
+
+
+def make_parsers(fmt):
+    return {
+        "regex": apachelogs.LogParser(fmt),
+        "split": apachelogs.LogParser(fmt, engine="split"),
+        "max_line_length": apachelogs.LogParser(fmt, max_line_length=MAX_LINE_LENGTH),
+    }
+
+
+def main():
+    worst = {}
+    for fmt, entries in [
+        (apachelogs.COMBINED, ENTRIES),
+        (apachelogs.VHOST_COMBINED, VHOST_ENTRIES),
+    ]:
+        parsers = make_parsers(fmt)
+        for label, entry in entries.items():
+            for name, parser in parsers.items():
+                usec = best_of(partial(parse_one, parser, entry), 10, repeat=3)
+                report(f"{label} ({name})", usec)
+                worst[name] = max(worst.get(name, 0), usec)
+    print()
+    for name, usec in worst.items():
+        report(f"worst case ({name})", usec)
+    if max(worst.values()) > LIMIT:
+        sys.exit(f"Worst case exceeds {LIMIT} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Compare parsing log lines read in text mode against parsing the same lines as
+`bytes`
+
+Run with ``python benchmarks/bytes_input.py`` from the root of the repository.
+"""
+
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+
+def main():
+    for name in ("COMMON", "COMBINED", "VHOST_COMBINED"):
+        fmt = getattr(apachelogs, name)
+        data = [ln.encode("iso-8859-1") for ln in lines(fmt, N)]
+        for encoding in ("iso-8859-1", "utf-8"):
+            parser = apachelogs.LogParser(fmt, encoding=encoding)
+
+            def text_mode(parser=parser, data=data, encoding=encoding):
+                for ln in data:
+                    parser.parse(ln.decode(encoding))
+
+            def bytes_mode(parser=parser, data=data):
+                for ln in data:
+                    parser.parse(ln)
+
+            base = best_of(text_mode, 1) / N
+            report(f"{name} {encoding} decode + parse", base)
+            report(f"{name} {encoding} parse bytes", best_of(bytes_mode, 1) / N, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the time per entry for constructing `LogEntry` objects from already
+matched entries with the function generated for each log format versus the
+generic code that loops over the groups, for `COMMON`, `COMBINED`, and a
+strftime-heavy format, with `str` & `bytes` entries and with ``slots=True``
+
+Run with ``python benchmarks/codegen.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import STRFTIME_FORMAT, lines
+from timing import best_of, report
+import apachelogs
+
+N = 20000
+
+FORMATS = {
+    "COMMON": apachelogs.COMMON,
+    "COMBINED": apachelogs.COMBINED,
+    "strftime": STRFTIME_FORMAT,
+}
+
+
+def generic(parser, compiled, matches):
+    return [parser._convert_match(e, compiled, m) for e, m in matches]
+
+
+def generated(parser, compiled, matches):
+    return [parser._entry_from_match(e, compiled, m) for e, m in matches]
+
+
+def parse_all(parser, data):
+    return [parser.parse(e) for e in data]
+
+
+def compare(label, fmt, data, **opts):
+    # Timestamp memoization would hide the cost of converting `%t`, so it is
+    # disabled to compare the code for all of the fields.
+    parser = apachelogs.LogParser(fmt, timestamp_cache_size=0, **opts)
+    compiled = parser._binary() if isinstance(data[0], bytes) else parser._compiled
+    matches = [(e, compiled.regex.fullmatch(e)) for e in data]
+    assert generic(parser, compiled, matches) == generated(parser, compiled, matches)
+    base = best_of(partial(generic, parser, compiled, matches), 1) / len(data)
+    report(f"{label} generic", base)
+    report(
+        f"{label} generated",
+        best_of(partial(generated, parser, compiled, matches), 1) / len(data),
+        base,
+    )
+
+
+def main():
+    for name, fmt in FORMATS.items():
+        data = [e.rstrip("\n") for e in lines(fmt, N)]
+        compare(name, fmt, data)
+        compare(f"{name} bytes", fmt, [e.encode() for e in data])
+        compare(f"{name} slots", fmt, data, slots=True)
+    print()
+    parser = apachelogs.LogParser(apachelogs.COMBINED)
+    print(parser.generated_source())
+
+
+if __name__ == "__main__":
+    main()
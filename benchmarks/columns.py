@@ -0,0 +1,44 @@
+"""
+Compare building columns of values by pivoting `LogEntry` objects against
+`LogParser.parse_columns()`
+
+Run with ``python benchmarks/columns.py`` from the root of the repository.
+"""
+
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+FIELDS = ["final_status", "bytes_sent", "request_line", "request_time"]
+
+
+def main():
+    data = lines(apachelogs.COMBINED, N)
+    parser = apachelogs.LogParser(apachelogs.COMBINED)
+
+    def pivot():
+        columns = {f: [] for f in FIELDS}
+        for e in parser.parse_lines(data):
+            columns["final_status"].append(e.final_status)
+            columns["bytes_sent"].append(e.bytes_sent)
+            columns["request_line"].append(e.request_line)
+            columns["request_time"].append(int(e.request_time.timestamp()))
+
+    def all_columns():
+        for _ in parser.parse_columns(data):
+            pass
+
+    def some_columns():
+        for _ in parser.parse_columns(data, fields=FIELDS):
+            pass
+
+    base = best_of(pivot, 1) / N
+    report("parse_lines() + pivot (4 fields)", base)
+    report("parse_columns() (all fields)", best_of(all_columns, 1) / N, base)
+    report("parse_columns() (4 fields)", best_of(some_columns, 1) / N, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare `LogParser.parse_columns()` with and without dictionary-encoding the
+repetitive `COMBINED` fields, both for parsing and for counting the entries per
+value of those fields afterwards
+
+Run with ``python benchmarks/dictionary.py`` from the root of the repository.
+"""
+
+from collections import Counter
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 20000
+
+FIELDS = [("headers_in", "Referer"), ("headers_in", "User-Agent")]
+
+
+def count_plain(batches):
+    for batch in batches:
+        for f in FIELDS:
+            Counter(batch[f])
+
+
+def count_encoded(batches):
+    for batch in batches:
+        for f in FIELDS:
+            counts = [0] * len(batch.dictionaries[f])
+            for code in batch[f]:
+                counts[code] += 1
+
+
+def main():
+    data = lines(apachelogs.COMBINED, N)
+    parser = apachelogs.LogParser(apachelogs.COMBINED)
+
+    def parse_plain():
+        return list(parser.parse_columns(data))
+
+    def parse_encoded():
+        return list(parser.parse_columns(data, encode=FIELDS))
+
+    base = best_of(parse_plain, 1) / N
+    report("parse_columns() (plain)", base)
+    report("parse_columns() (encoded)", best_of(parse_encoded, 1) / N, base)
+    plain = parse_plain()
+    encoded = parse_encoded()
+    base = best_of(lambda: count_plain(plain), 10) / N
+    report("Counter over plain columns", base)
+    report(
+        "count array over codes", best_of(lambda: count_encoded(encoded), 10) / N, base
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the time per entry for matching (and for fully parsing) entries in
+each of the built-in formats with `LogParser`'s default ``"regex"`` engine
+versus its ``"split"`` engine, both for typical entries and for `COMBINED`
+entries with 2 KB ``User-Agent`` headers
+
+Run with ``python benchmarks/engine.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+FORMATS = ["COMMON", "COMBINED", "VHOST_COMBINED"]
+
+
+def match_all(parser, data):
+    fullmatch = parser._compiled.regex.fullmatch
+    return [fullmatch(e) for e in data]
+
+
+def parse_all(parser, data):
+    return list(parser.parse_lines(data))
+
+
+def compare(label, fmt, data):
+    regex = apachelogs.LogParser(fmt)
+    split = apachelogs.LogParser(fmt, engine="split")
+    assert parse_all(regex, data) == parse_all(split, data)
+    for what, func in [("match", match_all), ("parse", parse_all)]:
+        base = best_of(partial(func, regex, data), 1) / len(data)
+        report(f"{label} {what} (regex)", base)
+        report(
+            f"{label} {what} (split)",
+            best_of(partial(func, split, data), 1) / len(data),
+            base,
+        )
+
+
+def main():
+    for name in FORMATS:
+        fmt = getattr(apachelogs, name)
+        compare(name, fmt, [e.rstrip("\n") for e in lines(fmt, N)])
+    long_ua = [
+        e.rstrip("\n")[:-1] + " " + "x" * 2048 + '"'
+        for e in lines(apachelogs.COMBINED, N // 5)
+    ]
+    compare("COMBINED, long UA", apachelogs.COMBINED, long_ua)
+
+
+if __name__ == "__main__":
+    main()
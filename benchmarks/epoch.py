@@ -0,0 +1,67 @@
+"""
+Compare getting epoch seconds from parsed entries via
+``entry.request_time.timestamp()`` against parsing with ``epoch="sec"``
+
+Run with ``python benchmarks/epoch.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+
+def via_datetime(parser, data):
+    for ln in data:
+        int(parser.parse(ln).request_time.timestamp())
+
+
+def via_epoch(parser, data):
+    for ln in data:
+        parser.parse(ln).request_time
+
+
+def main():
+    for name in ("COMMON", "COMBINED"):
+        fmt = getattr(apachelogs, name)
+        data = lines(fmt, N)
+        for cache_size in (128, 0):
+            label = f"{name} cache={cache_size}"
+            base = (
+                best_of(
+                    partial(
+                        via_datetime,
+                        apachelogs.LogParser(fmt, timestamp_cache_size=cache_size),
+                        data,
+                    ),
+                    1,
+                )
+                / N
+            )
+            report(f"{label} datetime", base)
+            parser = apachelogs.LogParser(
+                fmt, epoch="sec", timestamp_cache_size=cache_size
+            )
+            report(
+                f"{label} epoch", best_of(partial(via_epoch, parser, data), 1) / N, base
+            )
+        base = (
+            best_of(
+                partial(via_datetime, apachelogs.LogParser(fmt, fields=["%t"]), data),
+                1,
+            )
+            / N
+        )
+        report(f"{name} fields=['%t'] datetime", base)
+        parser = apachelogs.LogParser(fmt, fields=["%t"], epoch="sec")
+        report(
+            f"{name} fields=['%t'] epoch",
+            best_of(partial(via_epoch, parser, data), 1) / N,
+            base,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compare parsing entries with all fields against parsing them with only the
+``%h``, ``%t``, and ``%{User-Agent}i`` fields selected via ``fields``
+
+Run with ``python benchmarks/fields.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+FIELDS = ["%h", "%t", "%{User-Agent}i"]
+
+
+def parse_all(parser, data):
+    for ln in data:
+        parser.parse(ln)
+
+
+def main():
+    for name in ("COMBINED", "VHOST_COMBINED"):
+        fmt = getattr(apachelogs, name)
+        data = lines(fmt, N)
+        base = best_of(partial(parse_all, apachelogs.LogParser(fmt), data), 1) / N
+        report(f"{name} all fields", base)
+        for opts in [{}, {"slots": True}]:
+            parser = apachelogs.LogParser(fmt, fields=FIELDS, **opts)
+            label = "".join(f" {k}={v}" for k, v in opts.items())
+            report(
+                f"{name} 3 fields{label}",
+                best_of(partial(parse_all, parser, data), 1) / N,
+                base,
+            )
+
+
+if __name__ == "__main__":
+    main()
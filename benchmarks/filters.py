@@ -0,0 +1,79 @@
+"""
+Compare filtering parsed entries after the fact against passing the same
+predicates to `LogParser.parse_lines()` as ``filters``
+
+Run with ``python benchmarks/filters.py`` from the root of the repository.
+"""
+
+from datetime import datetime, timezone
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+from apachelogs import AnyOf, Equals, Prefix, Range, TimeRange
+
+N = 5000
+
+CASES = [
+    (
+        "status >= 500",
+        [Range("final_status", 500)],
+        lambda e: e.final_status >= 500,
+    ),
+    (
+        "status >= 500 or vhost",
+        [
+            AnyOf(
+                [Range("final_status", 500), Equals("virtual_host", "api.example.com")]
+            )
+        ],
+        lambda e: e.final_status >= 500 or e.virtual_host == "api.example.com",
+    ),
+    (
+        "path prefix",
+        [Prefix("request_line", "GET /static/")],
+        lambda e: (e.request_line or "").startswith("GET /static/"),
+    ),
+    (
+        "time range",
+        [
+            TimeRange(
+                datetime(2019, 5, 6, 10, 50, 0, tzinfo=timezone.utc),
+                datetime(2019, 5, 6, 10, 52, 0, tzinfo=timezone.utc),
+            )
+        ],
+        lambda e: (
+            datetime(2019, 5, 6, 10, 50, 0, tzinfo=timezone.utc)
+            <= e.request_time
+            < datetime(2019, 5, 6, 10, 52, 0, tzinfo=timezone.utc)
+        ),
+    ),
+]
+
+
+def posthoc(parser, data, pred):
+    return sum(1 for e in parser.parse_lines(data) if pred(e))
+
+
+def pushdown(parser, data, filters):
+    return sum(1 for _ in parser.parse_lines(data, filters=filters))
+
+
+def main():
+    parser = apachelogs.LogParser(apachelogs.VHOST_COMBINED)
+    data = lines(apachelogs.VHOST_COMBINED, N)
+    for label, filters, pred in CASES:
+        kept = posthoc(parser, data, pred)
+        assert kept == pushdown(parser, data, filters)
+        label = f"{label} (keeps {kept / N:.0%})"
+        base = best_of(partial(posthoc, parser, data, pred), 1) / N
+        report(f"{label} post-hoc", base)
+        report(
+            f"{label} filters",
+            best_of(partial(pushdown, parser, data, filters), 1) / N,
+            base,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Time per sample entry for `infer_format()` on samples of 5000 entries in each
+of four log formats with the default probe of 20 entries versus with every
+entry probed (i.e., without pruning candidates early), and print the best
+guess for each
+
+Run with ``python benchmarks/infer.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import STRFTIME_FORMAT, lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+FORMATS = {
+    "COMMON": apachelogs.COMMON,
+    "COMBINED": apachelogs.COMBINED,
+    "VHOST_COMBINED": apachelogs.VHOST_COMBINED,
+    "strftime": STRFTIME_FORMAT,
+}
+
+
+def main():
+    for label, fmt in FORMATS.items():
+        data = lines(fmt, N)
+        base = best_of(partial(apachelogs.infer_format, data, probe_size=N), 1, 3)
+        report(f"{label} no pruning", base / N)
+        usec = best_of(partial(apachelogs.infer_format, data), 1, 3)
+        report(f"{label} probe 20", usec / N, base / N)
+        print(f"    -> {apachelogs.infer_format(data)[0].format}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare the time per entry for matching (and for fully parsing) `COMBINED`
+entries whose remote host is logged with ``%a`` (or with ``%h`` and
+``hostname_lookups=False``) under each of `LogParser`'s ``ip_addresses``
+modes, for IPv4 and for IPv6 addresses, and for entries in a format made up
+mostly of addresses, with all distinct addresses or only 100 of them
+
+Run with ``python benchmarks/ip_addresses.py`` from the root of the repository.
+"""
+
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 20000
+
+FORMAT = apachelogs.COMBINED.replace("%h", "%a")
+
+ADDRESS_FORMAT = "%a:%{remote}p <-> %A:%p %>s"
+
+MODES = ["strict", "loose", "objects"]
+
+
+def match_all(parser, data):
+    fullmatch = parser._compiled.regex.fullmatch
+    return [fullmatch(e) for e in data]
+
+
+def parse_all(parser, data):
+    return list(parser.parse_lines(data))
+
+
+def to_ipv6(entry):
+    host, sep, rest = entry.partition(" ")
+    a, b, c, d = map(int, host.split("."))
+    return f"2001:db8::{a:x}:{b:x}:{c * 256 + d:x}{sep}{rest}"
+
+
+def address_entries(data):
+    return [f"{to_ipv6(e).split()[0]}:51234 <-> 10.0.0.1:443 200" for e in data]
+
+
+def compare(label, data, fmt=FORMAT, **opts):
+    parsers = {
+        mode: apachelogs.LogParser(fmt, ip_addresses=mode, **opts) for mode in MODES
+    }
+    for what, func in [("match", match_all), ("parse", parse_all)]:
+        base = None
+        for mode, parser in parsers.items():
+            usec = best_of(partial(func, parser, data), 1) / len(data)
+            report(f"{label} {what} ({mode})", usec, base)
+            if base is None:
+                base = usec
+
+
+def main():
+    ipv4 = [e.rstrip("\n") for e in lines(apachelogs.COMBINED, N)]
+    compare("IPv4", ipv4)
+    compare("IPv6", [to_ipv6(e) for e in ipv4])
+    compare("addresses", address_entries(ipv4), ADDRESS_FORMAT)
+    compare("100 addresses", address_entries(ipv4[:100]) * (N // 100), ADDRESS_FORMAT)
+    for mode in MODES:
+        parser = apachelogs.LogParser(
+            apachelogs.COMBINED, ip_addresses=mode, hostname_lookups=False
+        )
+        report(
+            f"IPv4 %h parse ({mode})",
+            best_of(partial(parse_all, parser, ipv4), 1) / len(ipv4),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measure the memory used per parsed `LogEntry` for each kind of entry that
+`LogParser` can produce
+
+Run with ``python benchmarks/memory.py`` from the root of the repository.
+"""
+
+import gc
+import tracemalloc
+from sampledata import lines
+import apachelogs
+
+N = 20000
+
+MODES = {
+    "default": {},
+    "lazy": {"lazy": True},
+    "slots": {"slots": True},
+    "intern": {"intern_fields": ["headers_in", "request_line"]},
+    "slots+intern": {"slots": True, "intern_fields": ["headers_in", "request_line"]},
+}
+
+
+def bytes_per_entry(fmt, options, data):
+    parser = apachelogs.LogParser(fmt, **options)
+    gc.collect()
+    tracemalloc.start()
+    entries = list(parser.parse_lines(data))
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return used / len(data)
+
+
+def main():
+    for name in ("COMBINED", "VHOST_COMBINED"):
+        fmt = getattr(apachelogs, name)
+        data = lines(fmt, N)
+        for mode, options in MODES.items():
+            print(
+                f"{name:<15} {mode:<13}"
+                f" {bytes_per_entry(fmt, options, data):8.0f} bytes/entry"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare parsing a log file through a text-mode or binary-mode file object with
+`LogParser.parse_lines()` against `LogParser.parse_mmap()`
+
+Run with ``python benchmarks/mmap_file.py`` from the root of the repository.
+"""
+
+from functools import partial
+from pathlib import Path
+import tempfile
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 50000
+
+
+def text_file(parser, path):
+    with path.open(encoding="iso-8859-1") as fp:
+        for _ in parser.parse_lines(fp):
+            pass
+
+
+def binary_file(parser, path):
+    with path.open("rb") as fp:
+        for _ in parser.parse_lines(fp):
+            pass
+
+
+def mapped(parser, path):
+    for _ in parser.parse_mmap(path):
+        pass
+
+
+def main():
+    for name in ("COMMON", "COMBINED", "VHOST_COMBINED"):
+        fmt = getattr(apachelogs, name)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "access.log")
+            with path.open("w", encoding="iso-8859-1") as fp:
+                fp.writelines(lines(fmt, N))
+            for label, lazy in [("", False), (" lazy", True)]:
+                parser = apachelogs.LogParser(fmt, lazy=lazy)
+                base = best_of(partial(text_file, parser, path), 1) / N
+                report(f"{name}{label} text file", base)
+                report(
+                    f"{name}{label} binary file",
+                    best_of(partial(binary_file, parser, path), 1) / N,
+                    base,
+                )
+                report(
+                    f"{name}{label} parse_mmap()",
+                    best_of(partial(mapped, parser, path), 1) / N,
+                    base,
+                )
+
+
+if __name__ == "__main__":
+    main()
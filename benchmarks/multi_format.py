@@ -0,0 +1,83 @@
+"""
+Compare the time per entry for parsing a shuffled stream of entries in four
+log formats by trying a `LogParser` for each format in turn versus with a
+`MultiFormatParser`, both without and with per-source memory of the last
+matching format, and print the `MultiFormatParser`'s hit counts.  The
+comparison is also made with ``lazy=True``, which leaves the time taken to
+find each entry's format as most of the total.
+
+Run with ``python benchmarks/multi_format.py`` from the root of the repository.
+"""
+
+from functools import partial
+import random
+from sampledata import STRFTIME_FORMAT, lines
+from timing import best_of, report
+import apachelogs
+
+N = 5000
+
+#: From most to least specific
+FORMATS = [
+    apachelogs.VHOST_COMBINED,
+    apachelogs.COMBINED,
+    apachelogs.COMMON,
+    STRFTIME_FORMAT,
+]
+
+
+def try_each(parsers, data):
+    entries = []
+    for _, e in data:
+        for p in parsers:
+            try:
+                entries.append(p.parse(e))
+            except apachelogs.InvalidEntryError:
+                continue
+            break
+    return entries
+
+
+def multi(parser, data):
+    return [parser.parse(e) for _, e in data]
+
+
+def multi_sources(parser, data):
+    return [parser.parse(e, source) for source, e in data]
+
+
+def compare(label, data, **opts):
+    parsers = [apachelogs.LogParser(fmt, **opts) for fmt in FORMATS]
+    base = best_of(partial(try_each, parsers, data), 1) / len(data)
+    report(f"{label}try each LogParser", base)
+    parser = apachelogs.MultiFormatParser(FORMATS, **opts)
+    report(
+        f"{label}MultiFormatParser",
+        best_of(partial(multi, parser, data), 1) / len(data),
+        base,
+    )
+    parser = apachelogs.MultiFormatParser(FORMATS, **opts)
+    report(
+        f"{label}MultiFormatParser, per source",
+        best_of(partial(multi_sources, parser, data), 1) / len(data),
+        base,
+    )
+    parser.hits.clear()
+    assert [e.entry for e in multi_sources(parser, data)] == [
+        e.entry for e in try_each(parsers, data)
+    ]
+    return parser
+
+
+def main():
+    data = [(fmt, e.rstrip("\n")) for fmt in FORMATS for e in lines(fmt, N)]
+    random.Random(0).shuffle(data)
+    compare("lazy: ", data, lazy=True)
+    parser = compare("", data)
+    print()
+    for i, count in parser.hits.most_common():
+        print(f"{count:>8}  {None if i is None else parser.formats[i]}")
+
+
+if __name__ == "__main__":
+    main()
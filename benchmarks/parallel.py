@@ -0,0 +1,48 @@
+"""
+Compare parsing a large log file with `LogParser.parse_lines()` against
+`LogParser.parse_file_parallel()` with varying numbers of worker processes
+
+Run with ``python benchmarks/parallel.py`` from the root of the repository.
+"""
+
+import os
+from pathlib import Path
+import tempfile
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+
+N = 50000
+
+
+def main():
+    fmt = apachelogs.VHOST_COMBINED
+    parser = apachelogs.LogParser(fmt)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "access.log")
+        with path.open("w", encoding="iso-8859-1") as fp:
+            for ln in lines(fmt, N):
+                fp.write(ln)
+
+        def serial():
+            with path.open("rb") as fp:
+                for _ in parser.parse_lines(fp):
+                    pass
+
+        base = best_of(serial, 1, repeat=3) / N
+        report("parse_lines()", base)
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+
+            def parallel(workers=workers):
+                for _ in parser.parse_file_parallel(path, workers=workers):
+                    pass
+
+            report(
+                f"parse_file_parallel(workers={workers})",
+                best_of(parallel, 1, repeat=3) / N,
+                base,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Deterministic generator of synthetic access log entries for the benchmarks
+"""
+
+from datetime import datetime, timedelta, timezone
+import random
+import apachelogs
+
+PATHS = [
+    "/",
+    "/index.html",
+    "/robots.txt",
+    "/favicon.ico",
+    "/static/css/site.css",
+    "/static/js/app.js",
+    "/api/v1/items?page=2&sort=desc",
+    "/blog/2019/05/06/some-post-title/",
+    "/wp-login.php",
+    "/images/logo.png",
+]
+
+METHODS = ["GET"] * 8 + ["POST", "HEAD"]
+
+STATUSES = [200] * 12 + [301, 302, 304, 304, 404, 404, 500, 503]
+
+REFERERS = [
+    "-",
+    "-",
+    "https://www.example.com/",
+    "https://www.google.com/search?q=apache+logs",
+]
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like"
+    " Gecko) Chrome/57.0.2987.133 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101" " Firefox/58.0",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 12_2 like Mac OS X) AppleWebKit/605.1.15"
+    " (KHTML, like Gecko) Version/12.1 Mobile/15E148 Safari/604.1",
+    "curl/7.58.0",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+]
+
+VHOSTS = ["www.example.com", "api.example.com", "static.example.com"]
+
+START = datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone(timedelta(hours=-4)))
+
+
+def records(n, seed=0):
+    """Yield ``n`` `dict`s of field values for synthetic log entries"""
+    rng = random.Random(seed)
+    when = START
+    for _ in range(n):
+        if rng.random() < 0.3:
+            when += timedelta(seconds=1)
+        yield {
+            "vhost": rng.choice(VHOSTS),
+            "port": rng.choice([80, 443]),
+            "host": "{}.{}.{}.{}".format(*(rng.randrange(1, 255) for _ in range(4))),
+            "time": when,
+            "request": "{} {} HTTP/1.1".format(rng.choice(METHODS), rng.choice(PATHS)),
+            "status": rng.choice(STATUSES),
+            "size": rng.randrange(200, 60000),
+            "referer": rng.choice(REFERERS),
+            "agent": rng.choice(USER_AGENTS),
+            "usec": rng.randrange(100, 2000000),
+        }
+
+
+def lines(fmt, n, seed=0):
+    """
+    Return a `list` of ``n`` newline-terminated synthetic log entries in the
+    log format ``fmt``, which must be one of the formats in `TEMPLATES`
+    """
+    template = TEMPLATES[fmt]
+    return [template(r) + "\n" for r in records(n, seed)]
+
+
+def _common(r):
+    ts = r["time"].strftime("%d/%b/%Y:%H:%M:%S %z")
+    return f'{r["host"]} - - [{ts}] "{r["request"]}" {r["status"]} {r["size"]}'
+
+
+def _combined(r):
+    return f'{_common(r)} "{r["referer"]}" "{r["agent"]}"'
+
+
+def _vhost_combined(r):
+    return f'{r["vhost"]}:{r["port"]} {_combined(r)}'
+
+
+#: Format with several strftime time directives plus the request duration
+STRFTIME_FORMAT = '%h [%{%Y-%m-%d %H:%M:%S}t.%{usec_frac}t %{%z}t] "%r" %>s %b %D'
+
+
+def _strftime(r):
+    ts = r["time"].strftime("%Y-%m-%d %H:%M:%S")
+    return (
+        f'{r["host"]} [{ts}.{r["usec"] % 1000000:06d} {r["time"]:%z}]'
+        f' "{r["request"]}" {r["status"]} {r["size"]} {r["usec"]}'
+    )
+
+
+TEMPLATES = {
+    apachelogs.COMMON: _common,
+    apachelogs.COMBINED: _combined,
+    apachelogs.VHOST_COMBINED: _vhost_combined,
+    STRFTIME_FORMAT: _strftime,
+}
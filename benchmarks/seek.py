@@ -0,0 +1,88 @@
+"""
+Compare selecting the entries for a ten-minute window of a day-long log file
+by filtering `LogParser.parse_lines()` with a `TimeRange` against
+`LogParser.parse_time_range()` with and without a `TimeIndex`, and time
+building the index
+
+Run with ``python benchmarks/seek.py`` from the root of the repository.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+import tempfile
+from timing import best_of, report
+import apachelogs
+
+N = 200000
+START = datetime(2019, 5, 6, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def write_log(path):
+    step = timedelta(days=1) / N
+    with path.open("w") as fp:
+        for i in range(N):
+            t = START + i * step
+            fp.write(
+                f"10.0.0.{i % 256} - - [{t:%d/%b/%Y:%H:%M:%S %z}]"
+                f' "GET /page/{i} HTTP/1.1" 200 {i % 5000}\n'
+            )
+
+
+def filtered(parser, path, start, end):
+    with path.open("rb") as fp:
+        return sum(
+            1
+            for _ in parser.parse_lines(fp, filters=[apachelogs.TimeRange(start, end)])
+        )
+
+
+def seeking(parser, path, start, end):
+    return sum(
+        1
+        for _ in parser.parse_time_range(path, start, end, slack=timedelta(seconds=30))
+    )
+
+
+def indexed(parser, path, start, end, index):
+    return sum(
+        1
+        for _ in parser.parse_time_range(
+            path, start, end, slack=timedelta(seconds=30), index=index
+        )
+    )
+
+
+def main():
+    parser = apachelogs.LogParser(apachelogs.COMMON)
+    start = START + timedelta(hours=13, minutes=5)
+    end = start + timedelta(minutes=10)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, "access.log")
+        write_log(path)
+        assert filtered(parser, path, start, end) == seeking(parser, path, start, end)
+        base = best_of(partial(filtered, parser, path, start, end), 1, repeat=3)
+        report("parse_lines + TimeRange", base)
+        report(
+            "parse_time_range",
+            best_of(partial(seeking, parser, path, start, end), 1, repeat=3),
+            base,
+        )
+        report(
+            "build_time_index",
+            best_of(partial(parser.build_time_index, path), 1, repeat=3),
+            base,
+        )
+        index = parser.build_time_index(path)
+        assert filtered(parser, path, start, end) == indexed(
+            parser, path, start, end, index
+        )
+        report(
+            "parse_time_range with index",
+            best_of(partial(indexed, parser, path, start, end, index), 1, repeat=3),
+            base,
+        )
+
+
+if __name__ == "__main__":
+    main()
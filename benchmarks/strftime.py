@@ -0,0 +1,60 @@
+"""
+Compare the `strptime()`-based converters used for the ``%F``, ``%T``, and
+``%z`` subdirectives of ``%{...}t`` up to v0.6.1 against the current ones,
+then time parsing entries in a ``%{%F %T %z}t`` format
+
+Run with ``python benchmarks/strftime.py`` from the root of the repository.
+"""
+
+from datetime import datetime
+from functools import partial
+from timing import best_of, report
+from apachelogs import LogParser
+from apachelogs.strftime import convert_time, convert_tzoffset, convert_ymd_date
+
+N = 10000
+
+# The converters from v0.6.1:
+OLD = {
+    "%F": lambda s: s and datetime.strptime(s, "%Y-%m-%d").date(),
+    "%T": lambda s: s and datetime.strptime(s, "%H:%M:%S").time(),
+    "%z": lambda s: datetime.strptime(s, "%z").tzinfo if s else None,
+}
+
+NEW = {"%F": convert_ymd_date, "%T": convert_time, "%z": convert_tzoffset}
+
+VALUES = {"%F": "2019-05-06", "%T": "13:42:26", "%z": "-0500"}
+
+FORMAT = '%h %{%F %T %z}t "%r" %>s %b'
+LINE = '127.0.0.1 2019-05-06 13:42:26 -0500 "GET / HTTP/1.1" 200 1234'
+
+
+def convert_all(converter, value):
+    for _ in range(N):
+        converter(value)
+
+
+def parse_all(parser, lines):
+    for ln in lines:
+        parser.parse(ln)
+
+
+def main():
+    for directive, value in VALUES.items():
+        base = best_of(partial(convert_all, OLD[directive], value), 1) / N
+        report(f"{directive} strptime", base)
+        report(
+            f"{directive} sliced",
+            best_of(partial(convert_all, NEW[directive], value), 1) / N,
+            base,
+        )
+    # Vary the seconds so that the `%T` values aren't all the same
+    lines = [LINE.replace(":26 ", f":{i % 60:02d} ") for i in range(N)]
+    report(
+        "%{%F %T %z}t entry",
+        best_of(partial(parse_all, LogParser(FORMAT), lines), 1) / N,
+    )
+
+
+if __name__ == "__main__":
+    main()
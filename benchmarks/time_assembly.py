@@ -0,0 +1,42 @@
+"""
+Compare `assemble_datetime()` against the assemblers built by
+`time_assembler()` for the time fields of some common custom time formats
+
+Run with ``python benchmarks/time_assembly.py`` from the root of the
+repository.
+"""
+
+from functools import partial
+from timing import best_of, report
+from apachelogs import LogParser
+from apachelogs.timeutil import assemble_datetime, time_assembler
+
+N = 10000
+
+FORMATS = {
+    "%{%Y-%m-%d %H:%M:%S}t": "2019-05-06 06:28:20",
+    "%{%Y-%m-%d %H:%M:%S %z}t": "2019-05-06 06:28:20 +0000",
+    "%{%d/%b/%Y:%H:%M:%S}t.%{msec_frac}t": "06/May/2019:06:28:20.123",
+    "%{%F %T}t": "2019-05-06 06:28:20",
+}
+
+
+def assemble_all(assemble, fields):
+    for _ in range(N):
+        assemble(fields)
+
+
+def main():
+    for fmt, line in FORMATS.items():
+        fields = LogParser(fmt).parse(line).request_time_fields
+        base = best_of(partial(assemble_all, assemble_datetime, fields), 1) / N
+        report(f"{fmt} generic", base)
+        report(
+            f"{fmt} planned",
+            best_of(partial(assemble_all, time_assembler(fields), fields), 1) / N,
+            base,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure the cost of converting ``%t`` timestamps: `parse_apache_timestamp()`
+against the regex-only implementation it replaced, and parsing entries with
+and without the parser's timestamp memo
+
+Run with ``python benchmarks/timestamps.py`` from the root of the repository.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from sampledata import lines
+from timing import best_of, report
+import apachelogs
+from apachelogs.timeutil import APACHE_TS_RGX, MONTH_SNAMES
+
+N = 5000
+
+TIMESTAMPS = [
+    "[06/May/2019:06:28:20 +0000]",
+    "[06/May/2019:06:28:20 -0400]",
+    "06/May/2019:06:28:20 +0530",
+]
+
+
+def regex_only(s):
+    """`parse_apache_timestamp()` as of v0.6.1"""
+    if s is None:
+        return None
+    m = APACHE_TS_RGX.match(s)
+    if not m:
+        raise ValueError(s)
+    data = m.groupdict()
+    for k in "year day hour minute second".split():
+        data[k] = int(data[k])
+    try:
+        data["month"] = MONTH_SNAMES[data["month"]]
+    except KeyError:
+        raise ValueError(s)
+    tzoffset = timedelta(
+        hours=int(data.pop("tzoffset_hour")),
+        minutes=int(data.pop("tzoffset_min")),
+    )
+    if data.pop("tzoffset_sign") == "-":
+        tzoffset *= -1
+    data["tzinfo"] = timezone(tzoffset)
+    return datetime(**data)
+
+
+def convert_all(func, ts, n):
+    for _ in range(n):
+        func(ts)
+
+
+def parse_all(parser, data):
+    for ln in data:
+        parser.parse(ln)
+
+
+def main():
+    for ts in TIMESTAMPS:
+        assert apachelogs.parse_apache_timestamp(ts) == regex_only(ts)
+        base = best_of(partial(convert_all, regex_only, ts, N), 1) / N
+        report(f"{ts} v0.6.1", base)
+        report(
+            f"{ts} current",
+            best_of(partial(convert_all, apachelogs.parse_apache_timestamp, ts, N), 1)
+            / N,
+            base,
+        )
+    for name in ("COMMON", "COMBINED"):
+        fmt = getattr(apachelogs, name)
+        data = lines(fmt, N)
+        plain = apachelogs.LogParser(fmt, timestamp_cache_size=0)
+        base = best_of(partial(parse_all, plain, data), 1) / N
+        report(f"{name} no timestamp memo", base)
+        memo = apachelogs.LogParser(fmt)
+        report(
+            f"{name} timestamp memo",
+            best_of(partial(parse_all, memo, data), 1) / N,
+            base,
+        )
+        info = memo.timestamp_cache_info()
+        print(f"    hit rate: {info.hit_rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Timing helpers for the benchmarks
+"""
+
+import timeit
+
+
+def best_of(func, number, repeat=5):
+    """
+    Call ``func`` ``number`` times in a row ``repeat`` times and return the
+    fastest average time per call in microseconds
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def report(label, usec, baseline=None):
+    """Print a timing result, optionally with its speedup over ``baseline``"""
+    line = f"{label:<40} {usec:9.2f} us"
+    if baseline is not None:
+        line += f"  ({baseline / usec:.2f}x)"
+    print(line)
@@ -0,0 +1,60 @@
+"""
+Compare resolving ISO & Sunday-based week dates with `datetime.strptime()` (as
+done up to v0.6.1) against `fromisocalendar()` & `fromweeknum()`, then time
+parsing entries with ``%{%G-W%V-%u %T}t`` timestamps
+
+Run with ``python benchmarks/week_dates.py`` from the root of the repository.
+"""
+
+from datetime import datetime
+from functools import partial
+from timing import best_of, report
+from apachelogs import LogParser
+from apachelogs.timeutil import fromisocalendar, fromweeknum
+
+N = 10000
+
+
+def strptime_iso(args):
+    for y, w, d in args:
+        datetime.strptime(f"{y} {w} {d}", "%G %V %u").date()
+
+
+def arith_iso(args):
+    for y, w, d in args:
+        fromisocalendar(y, w, d)
+
+
+def strptime_sunday(args):
+    for y, w, d in args:
+        datetime.strptime(f"{y} {w} {d % 7}", "%Y %U %w").date()
+
+
+def arith_sunday(args):
+    for y, w, d in args:
+        fromweeknum(y, w, d, False)
+
+
+def parse_all(parser, lines):
+    for ln in lines:
+        parser.parse(ln)
+
+
+def main():
+    # A day's worth of entries all have the same week date.
+    args = [(2019, 19, 1)] * N
+    base = best_of(partial(strptime_iso, args), 1) / N
+    report("ISO week strptime", base)
+    report("ISO week fromisocalendar", best_of(partial(arith_iso, args), 1) / N, base)
+    base = best_of(partial(strptime_sunday, args), 1) / N
+    report("%U week strptime", base)
+    report("%U week fromweeknum", best_of(partial(arith_sunday, args), 1) / N, base)
+    lines = [f"2019-W19-1 13:42:{i % 60:02d}" for i in range(N)]
+    report(
+        "%{%G-W%V-%u %T}t entry",
+        best_of(partial(parse_all, LogParser("%{%G-W%V-%u %T}t"), lines), 1) / N,
+    )
+
+
+if __name__ == "__main__":
+    main()
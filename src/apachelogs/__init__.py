@@ -17,31 +17,55 @@ __author_email__ = "apachelogs@varonathe.org"
 __license__ = "MIT"
 __url__ = "https://github.com/jwodder/apachelogs"
 
+from .columns import ColumnBatch
 from .errors import (
     Error,
     InvalidDirectiveError,
     InvalidEntryError,
+    StaleIndexError,
     UnknownDirectiveError,
 )
-from .parser import LogEntry, LogParser
-from .timeutil import parse_apache_timestamp
+from .filters import AnyOf, Equals, Filter, OneOf, Prefix, Range, TimeRange
+from .infer import FormatGuess, infer_format
+from .multi import MultiFormatParser
+from .parser import LogEntry, LogParser, clear_parser_cache, parser_cache_info
+from .timeindex import TimeIndex
+from .timeutil import apache_timestamp_to_epoch, parse_apache_timestamp
 
 __all__ = [
+    "AnyOf",
     "COMBINED",
     "COMBINED_DEBIAN",
     "COMMON",
     "COMMON_DEBIAN",
+    "ColumnBatch",
+    "Equals",
     "Error",
+    "Filter",
+    "FormatGuess",
     "InvalidDirectiveError",
     "InvalidEntryError",
     "LogEntry",
     "LogParser",
+    "MultiFormatParser",
+    "OneOf",
+    "Prefix",
+    "Range",
+    "StaleIndexError",
+    "TimeIndex",
+    "TimeRange",
     "UnknownDirectiveError",
     "VHOST_COMBINED",
     "VHOST_COMMON",
+    "apache_timestamp_to_epoch",
+    "clear_parser_cache",
+    "infer_format",
     "parse",
     "parse_apache_timestamp",
+    "parse_file_parallel",
     "parse_lines",
+    "parse_time_range",
+    "parser_cache_info",
 ]
 
 #: Common log format (CLF)
@@ -68,7 +92,9 @@ VHOST_COMBINED = '%v:%p %h %l %u %t "%r" %>s %O "%{Referer}i" "%{User-Agent}i"'
 def parse(format, entry, encoding="iso-8859-1", errors=None):  # noqa: A002
     """
     A convenience function for parsing a single logfile entry without having
-    to directly create a `LogParser` object.
+    to directly create a `LogParser` object.  The compiled form of ``format``
+    is cached between calls (see `parser_cache_info()`), so calling this
+    function repeatedly with the same format is cheap.
 
     ``encoding`` and ``errors`` have the same meaning as for `LogParser`.
     """
@@ -81,14 +107,76 @@ def parse_lines(
     encoding="iso-8859-1",
     errors=None,
     ignore_invalid=False,
+    filters=None,
 ):
     """
     A convenience function for parsing an iterable of logfile entries without
     having to directly create a `LogParser` object.
 
     ``encoding`` and ``errors`` have the same meaning as for `LogParser`.
-    ``ignore_invalid`` has the same meaning as for `LogParser.parse_lines()`.
+    ``ignore_invalid`` and ``filters`` have the same meaning as for
+    `LogParser.parse_lines()`.
+
+    .. versionchanged:: 0.7.0
+
+        ``filters`` argument added
+    """
+    parser = LogParser(format, encoding=encoding, errors=errors)
+    if filters is None:
+        return parser.parse_lines(entries, ignore_invalid)
+    return parser.parse_lines(entries, ignore_invalid, filters=filters)
+
+
+def parse_file_parallel(
+    format,  # noqa: A002
+    path,
+    workers=None,
+    encoding="iso-8859-1",
+    errors=None,
+    ignore_invalid=False,
+    ordered=True,
+    chunk_size=None,
+):
+    """
+    .. versionadded:: 0.7.0
+
+    A convenience function for parsing a log file in parallel across multiple
+    processes without having to directly create a `LogParser` object.
+
+    ``encoding`` and ``errors`` have the same meaning as for `LogParser`.  The
+    remaining arguments have the same meanings as for
+    `LogParser.parse_file_parallel()`.
+    """
+    return LogParser(format, encoding=encoding, errors=errors).parse_file_parallel(
+        path,
+        workers=workers,
+        ordered=ordered,
+        ignore_invalid=ignore_invalid,
+        chunk_size=chunk_size,
+    )
+
+
+def parse_time_range(
+    format,  # noqa: A002
+    path,
+    start=None,
+    end=None,
+    slack=None,
+    encoding="iso-8859-1",
+    errors=None,
+    ignore_invalid=False,
+):
+    """
+    .. versionadded:: 0.7.0
+
+    A convenience function for parsing the entries for a range of times in a
+    time-ordered log file without having to directly create a `LogParser`
+    object.
+
+    ``encoding`` and ``errors`` have the same meaning as for `LogParser`.  The
+    remaining arguments have the same meanings as for
+    `LogParser.parse_time_range()`.
     """
-    return LogParser(format, encoding=encoding, errors=errors).parse_lines(
-        entries, ignore_invalid
+    return LogParser(format, encoding=encoding, errors=errors).parse_time_range(
+        path, start=start, end=end, slack=slack, ignore_invalid=ignore_invalid
     )
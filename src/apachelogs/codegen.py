@@ -0,0 +1,234 @@
+"""
+Generating a specialized function per log format for constructing `LogEntry`
+objects
+
+.. versionadded:: 0.7.0
+"""
+
+import codecs
+from pydicti import dicti
+from .util import LRUCache, MemoizedConverter, unescape, unescape_bytes
+
+#: The cache of the compiled factories of entry-building functions, keyed by
+#: their source code
+_factory_cache = LRUCache(maxsize=128)
+
+
+def entry_builder(compiled, format, encoding, errors, entry_class):  # noqa: A002
+    """
+    Generate a function that takes a log entry and its match against the
+    regex of the `_CompiledFormat` ``compiled`` and returns the `LogEntry`
+    that a non-lazy `LogParser` with the given ``format``, ``encoding``, &
+    ``errors`` would construct for it.  ``entry_class`` is the `LogEntry`
+    class generated for the format for ``slots=True``, or `None` to construct
+    plain `LogEntry` instances.
+
+    The function unpacks the groups of the match directly into local
+    variables, converts each one with the converter's steps (the ``-`` check
+    of a `clf()` converter, `int()`, and unescaping & decoding strings that
+    contain no escape sequences) inlined where they are known, and builds the
+    entry's attributes, ``directives``, & time fields with literal
+    expressions, instead of looping over the groups and their names as
+    `LogEntry.__init__()` does.
+
+    The code is generated & compiled once per shared compiled format, entry
+    class, and set of memoized groups, and is cached in ``compiled.builders``,
+    so that constructing further parsers for the format only binds their own
+    converters to it.
+
+    Returns a pair of the function and its source code, or ``(None, None)``
+    if the format has a combination of fields that the generated code does
+    not handle (two spellings of the same key in a case-insensitive `dict`
+    attribute), in which case the entry should be constructed the generic
+    way.
+    """
+    key = (
+        entry_class,
+        tuple(
+            isinstance(conv, MemoizedConverter) for _, _, conv in compiled.group_defs
+        ),
+    )
+    try:
+        generated = compiled.builders[key]
+    except KeyError:
+        generated = compiled.builders[key] = _generate(
+            compiled, format, encoding, errors, entry_class
+        )
+    if generated is None:
+        return (None, None)
+    factory, source, bindings, called, assembled = generated
+    bindings = dict(bindings)
+    for i in called:
+        bindings[f"c{i}"] = compiled.group_defs[i][2]
+    for j, target in enumerate(assembled):
+        bindings[f"a{j}"] = compiled.time_assemblers[target]
+    return (factory(**bindings), source)
+
+
+def _generate(compiled, format, encoding, errors, entry_class):  # noqa: A002
+    """
+    Generate the code for `entry_builder()`.  Returns `None` if the format
+    cannot be handled, or else a tuple of:
+
+    - the factory that takes the variables used by the code as keyword
+      arguments and returns the entry-building function
+    - the source code of the factory
+    - a `dict` of the variables that are the same for every parser
+    - a list of the indices of the groups whose converters are called (as
+      variables named ``c{i}``)
+    - a list of the time attributes whose assemblers are called (as variables
+      named ``a{j}``, with ``j`` the index into the list)
+    """
+    # Imported here to avoid a circular import:
+    from .parser import NOCASEDICTS, LogEntry
+
+    binary = isinstance(compiled.regex.pattern, bytes)
+    decode = encoding != "bytes"
+    errors = errors or "strict"
+    bindings = {
+        "fmt": format,
+        "cls": LogEntry if entry_class is None else entry_class,
+        "new": object.__new__,
+        "dicti": dicti,
+        "unescape": unescape,
+        "unescape_bytes": unescape_bytes,
+    }
+    called = []
+    body = []
+    nodes = {}
+    directives = []
+    for i, (name, directive, conv) in enumerate(compiled.group_defs):
+        v = f"v{i}"
+        expr, known = _conversion(conv, f"g{i}", binary, decode, encoding, errors)
+        if expr is None:
+            called.append(i)
+            expr = f"c{i}(g{i})"
+        body.append(f"{v} = {expr}")
+        if decode and not known:
+            body.append(
+                f"if {v}.__class__ is bytes: {v} = {v}.decode({encoding!r}, {errors!r})"
+            )
+        path = name if isinstance(name, tuple) else (name,)
+        node = nodes
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+            if not isinstance(node, dict):
+                return None
+        leaf = node.setdefault(path[-1], [])
+        if not isinstance(leaf, list):
+            return None
+        leaf.append(v)
+        directives.append(f"{directive!r}: {v}")
+    for top, node in nodes.items():
+        if top in NOCASEDICTS and isinstance(node, dict):
+            if len({k.lower() for k in node}) != len(node):
+                return None
+    attrs = {top: _value_expr(node, top in NOCASEDICTS) for top, node in nodes.items()}
+    assembled = list(compiled.time_assemblers)
+    times = {}
+    for j, target in enumerate(assembled):
+        body.append(f"t{j} = {attrs[target + '_fields']}")
+        attrs[target + "_fields"] = f"t{j}"
+        times[target] = f"a{j}(t{j})"
+    ngroups = len(compiled.group_defs)
+    if ngroups:
+        unpack = "".join(f"g{i}, " for i in range(ngroups))
+        body.insert(0, f"{unpack}= m.groups()")
+    body.append("e = new(cls)")
+    if entry_class is None:
+        items = [
+            '"entry": entry',
+            '"format": fmt',
+            '"directives": {' + ", ".join(directives) + "}",
+        ]
+        items.extend(f"{k!r}: {x}" for k, x in {**attrs, **times}.items())
+        body.append("e.__dict__ = {" + ", ".join(items) + "}")
+    else:
+        body.append("e.entry = entry")
+        for i, slot in enumerate(entry_class._group_slots):
+            body.append(f"e.{slot} = v{i}")
+        for target, x in times.items():
+            body.append(f"e.{target} = {x}")
+    body.append("return e")
+    params = [*bindings, *(f"c{i}" for i in called)]
+    params.extend(f"a{j}" for j in range(len(assembled)))
+    source = f"def make({', '.join(params)}):\n    def build(entry, m):\n"
+    source += "".join(f"        {ln}\n" for ln in body)
+    source += "    return build\n"
+    factory = _factory_cache.get(source, lambda: _compile_factory(source))
+    return (factory, source, bindings, called, assembled)
+
+
+def _conversion(conv, g, binary, decode, encoding, errors):
+    """
+    Return a pair of an expression that converts the captured value in the
+    variable ``g`` the same way as ``conv`` (followed by decoding `bytes`
+    results, if ``decode`` is true), or `None` if ``conv`` must be called, and
+    whether the result is known not to need decoding
+    """
+    inner = getattr(conv, "clf_converter", None)
+    if inner is not None:
+        expr, known = _conversion(inner, g, binary, decode, encoding, errors)
+        if expr is None:
+            return (None, False)
+        dash = 'b"-"' if binary else '"-"'
+        return (f"None if {g} == {dash} else {expr}", known)
+    if conv is int:
+        return (f"int({g})", True)
+    if conv is str and not binary:
+        return (g, True)
+    if isinstance(conv, MemoizedConverter):
+        # Timestamps and interned values (which are decoded by the memo's own
+        # converter) are never `bytes` that still need decoding.
+        return (None, True)
+    if conv is unescape_bytes and binary:
+        unescaped = f'({g} if b"\\\\" not in {g} else unescape_bytes({g}))'
+        if decode:
+            return (f"{unescaped}.decode({encoding!r}, {errors!r})", True)
+        return (unescaped, True)
+    if conv is unescape and not binary:
+        if not decode:
+            return (f"unescape({g})", True)
+        decoded = f"unescape({g}).decode({encoding!r}, {errors!r})"
+        if _ascii_compatible(encoding):
+            # Text without escape sequences is all ASCII and so decodes back to
+            # itself.
+            return (f'({g} if "\\\\" not in {g} else {decoded})', True)
+        return (decoded, True)
+    return (None, False)
+
+
+def _value_expr(node, nocase):
+    """
+    Return an expression for the value of an attribute (or `dict` key) given
+    either a list of the variables holding the values of its groups, of which
+    the first non-`None` one is used, or a `dict` of its keys' nodes
+    """
+    if isinstance(node, list):
+        expr = node[-1]
+        for v in reversed(node[:-1]):
+            expr = f"{v} if {v} is not None else {expr}"
+        return expr
+    items = ", ".join(f"{k!r}: {_value_expr(sub, False)}" for k, sub in node.items())
+    return f"dicti({{{items}}})" if nocase else f"{{{items}}}"
+
+
+def _ascii_compatible(encoding):
+    """Return whether ``encoding`` encodes ASCII text as ASCII bytes"""
+    try:
+        return codecs.encode(_ASCII, encoding) == _ASCII.encode("ascii")
+    except (LookupError, UnicodeError):
+        return False
+
+
+_ASCII = "".join(map(chr, range(128)))
+
+
+def _compile_factory(source):
+    """
+    Compile the source code of an entry-building function's factory and
+    return the factory
+    """
+    namespace = {}
+    exec(compile(source, "<apachelogs entry builder>", "exec"), namespace)
+    return namespace["make"]
@@ -0,0 +1,299 @@
+"""
+Parsing log entries into columns of values
+
+.. versionadded:: 0.7.0
+"""
+
+from array import array
+from collections.abc import Mapping
+import attr
+from .util import InvalidAddressError, converts_to_int
+
+#: The default number of entries per `ColumnBatch`
+DEFAULT_BATCH_SIZE = 10000
+
+
+@attr.s
+class ColumnBatch(Mapping):
+    r"""
+    .. versionadded:: 0.7.0
+
+    A batch of log entries parsed by `LogParser.parse_columns()`, stored as a
+    mapping from field names to columns of values, one value per successfully
+    parsed entry.  A field name is either the name of a `LogEntry` attribute
+    (e.g., ``"status"`` or ``"request_time"``) or, for the values of `dict`
+    attributes, a `tuple` of the attribute name and the key (e.g.,
+    ``("headers_in", "User-Agent")``).
+
+    Fields whose values are always integers are stored in `array.array`\s of
+    type ``'q'``; missing (`None`) values in such fields are stored as the
+    ``int_null`` value passed to `~LogParser.parse_columns()`.  The
+    ``request_time`` field and its variants are stored the same way as
+    integer seconds since the epoch (as returned by
+    `datetime.datetime.timestamp()`, and so naïve times are treated as local
+    time), or as counts of the parser's ``epoch`` unit if it has one.  (A
+    column of integers that do not all fit in 64 bits is stored in a `list`
+    instead.)  All other fields are stored in `list`\s.
+
+    Fields that were dictionary-encoded by passing them in the ``encode``
+    argument to `~LogParser.parse_columns()` are instead stored as
+    `array.array`\s of type ``'q'`` of codes that index into the field's
+    table of distinct values in `dictionaries`, so that the values of entry
+    ``i`` are ``batch.dictionaries[name][batch[name][i]]``.
+    """
+
+    #: A `dict` mapping field names to columns
+    columns = attr.ib()
+    #: The number of parsed entries, i.e., the length of each column
+    size = attr.ib()
+    #: The number of entries in the batch that did not match the log format and
+    #: were skipped
+    rejected = attr.ib()
+    #: A `dict` mapping the names of dictionary-encoded fields to `list`\s of
+    #: their distinct values, in order of first appearance.  If the tables are
+    #: shared between batches, they are the same `list` objects in every
+    #: batch, and later batches only ever append to them.
+    dictionaries = attr.ib(factory=dict)
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+
+@attr.s
+class ColumnSpec:
+    """
+    The definition of a column: which groups of a compiled log format it is
+    filled from and how
+    """
+
+    #: The column's field name
+    name = attr.ib()
+    #: ``"int"`` for integer fields, ``"time"`` for ``request_time`` and its
+    #: variants, ``"dict"`` for dictionary-encoded fields, ``"object"`` for
+    #: everything else
+    kind = attr.ib()
+    #: The indices of the groups that the column's value is taken from.  For
+    #: ``"int"`` & ``"object"`` columns, the value is that of the first group
+    #: with a non-`None` value (which, for ``"dict"`` columns, is then
+    #: encoded).  For ``"time"`` columns, the groups are the ones stored in the
+    #: corresponding ``*_fields`` attribute.
+    groups = attr.ib()
+
+
+def column_specs(group_names, converters, time_attrs, fields=None, encode=()):
+    """
+    Determine the columns to create for a log format.
+
+    :param list group_names: the ``(name, directive)`` pairs for the format's
+        groups
+    :param list converters: the converters for the format's groups
+    :param list time_attrs: the ``request_time`` attributes produced by the
+        format
+    :param fields: the field names to create columns for; `None` means all
+        attributes other than the ``*_fields`` attributes, which are
+        represented by their ``request_time`` attributes instead.  A top-level
+        `dict` attribute name selects all of its keys.
+    :param encode: the names of the fields (given the same way as in
+        ``fields``) to dictionary-encode
+    :rtype: list of `ColumnSpec`
+    :raises ValueError: if a requested field is not produced by the format,
+        or if a field to encode is not a non-integer, non-time column
+    """
+    by_name = {}
+    by_attr = {}
+    for i, (name, _) in enumerate(group_names):
+        by_name.setdefault(name, []).append(i)
+        top = name[0] if isinstance(name, tuple) else name
+        by_attr.setdefault(top, []).append(name)
+    if fields is None:
+        fields = [
+            a
+            for a in by_attr
+            if not (a.endswith("_fields") and a[: -len("_fields")] in time_attrs)
+        ]
+        fields.extend(time_attrs)
+    encoded = set()
+    for f in encode:
+        if f in time_attrs:
+            encoded.add(f)
+        elif f in by_attr:
+            encoded.update(by_attr[f])
+        elif f in by_name:
+            encoded.add(f)
+        else:
+            raise ValueError(f"Field not produced by log format: {f!r}")
+    specs = []
+    for f in fields:
+        if f in time_attrs:
+            specs.append(
+                ColumnSpec(
+                    name=f,
+                    kind="time",
+                    groups=[i for n in by_attr[f + "_fields"] for i in by_name[n]],
+                )
+            )
+            continue
+        if f in by_attr:
+            names = list(dict.fromkeys(by_attr[f]))
+        elif f in by_name:
+            names = [f]
+        else:
+            raise ValueError(f"Field not produced by log format: {f!r}")
+        for n in names:
+            groups = by_name[n]
+            if all(converts_to_int(converters[i]) for i in groups):
+                kind = "int"
+            elif n in encoded:
+                kind = "dict"
+            else:
+                kind = "object"
+            specs.append(ColumnSpec(name=n, kind=kind, groups=groups))
+    unencoded = encoded.difference(s.name for s in specs if s.kind == "dict")
+    if unencoded:
+        raise ValueError(
+            f"Field cannot be dictionary-encoded: {min(unencoded, key=repr)!r}"
+        )
+    return specs
+
+
+def iter_column_batches(
+    parser, entries, fields, batch_size, int_null, encode=(), shared_dictionaries=False
+):
+    """Implementation of `LogParser.parse_columns()`"""
+    # Mapping from `id()`s of `_CompiledFormat`s (one for `str` entries, one
+    # for `bytes` entries) to their `ColumnSpec`s.  The specs for `str` entries
+    # are computed up front so that invalid ``fields`` are reported at once
+    # and so that batches with no valid entries still have all their columns.
+    specs = {}
+    encode = tuple(encode)
+    _specs_for(parser._compiled, specs, fields, encode)
+    return _iter_batches(
+        parser,
+        entries,
+        fields,
+        batch_size,
+        int_null,
+        specs,
+        encode,
+        shared_dictionaries,
+    )
+
+
+def _iter_batches(
+    parser, entries, fields, batch_size, int_null, specs, encode, shared_dictionaries
+):
+    # Mapping from the names of dictionary-encoded fields to pairs of a `dict`
+    # mapping values to codes and the `list` of values
+    encoders = {}
+    batch = []
+    rejected = 0
+    for e in entries:
+        _, compiled, m = parser._match(e)
+        if m:
+            batch.append((compiled, m))
+        else:
+            rejected += 1
+        if len(batch) + rejected >= batch_size:
+            yield _build_batch(
+                parser, batch, rejected, specs, fields, int_null, encode, encoders
+            )
+            batch = []
+            rejected = 0
+            if not shared_dictionaries:
+                encoders = {}
+    if batch or rejected:
+        yield _build_batch(
+            parser, batch, rejected, specs, fields, int_null, encode, encoders
+        )
+
+
+def _specs_for(compiled, specs, fields, encode):
+    try:
+        return specs[id(compiled)]
+    except KeyError:
+        cspecs = specs[id(compiled)] = column_specs(
+            compiled.group_names,
+            [gdef[2] for gdef in compiled.group_defs],
+            compiled.time_attrs,
+            fields,
+            encode,
+        )
+        return cspecs
+
+
+def _build_batch(parser, batch, rejected, specs, fields, int_null, encode, encoders):
+    columns = {}
+    size = 0
+    for compiled, m in batch:
+        cspecs = _specs_for(compiled, specs, fields, encode)
+        # All of the entry's values are converted before any are stored, so
+        # that an entry with an invalid loosely-matched IP address can still be
+        # rejected as a whole.
+        row = []
+        try:
+            for spec in cspecs:
+                if spec.kind == "time":
+                    tfields = {}
+                    for i in spec.groups:
+                        v = parser._convert(compiled.group_defs[i][2], m.group(i + 1))
+                        key = compiled.group_names[i][0][-1]
+                        if tfields.get(key) is None:
+                            tfields[key] = v
+                    t = compiled.time_assemblers[spec.name](tfields)
+                    if t is None:
+                        value = int_null
+                    elif isinstance(t, int):
+                        # The parser has an ``epoch`` unit
+                        value = t
+                    else:
+                        value = int(t.timestamp())
+                else:
+                    value = None
+                    for i in spec.groups:
+                        value = parser._convert(
+                            compiled.group_defs[i][2], m.group(i + 1)
+                        )
+                        if value is not None:
+                            break
+                    if value is None and spec.kind == "int":
+                        value = int_null
+                row.append(value)
+        except InvalidAddressError:
+            rejected += 1
+            continue
+        for spec, value in zip(cspecs, row):
+            if spec.kind == "dict":
+                try:
+                    codes, table = encoders[spec.name]
+                except KeyError:
+                    codes, table = encoders[spec.name] = ({}, [])
+                try:
+                    value = codes[value]
+                except KeyError:
+                    codes[value] = len(table)
+                    table.append(value)
+                    value = len(table) - 1
+            columns.setdefault(spec.name, []).append(value)
+        size += 1
+    dictionaries = {}
+    for cspecs in specs.values():
+        for spec in cspecs:
+            values = columns.setdefault(spec.name, [])
+            if spec.kind != "object" and not isinstance(values, array):
+                try:
+                    columns[spec.name] = array("q", values)
+                except OverflowError:
+                    # A value too big for a signed 64-bit integer (e.g., a
+                    # huge ``%B``) leaves the column as a `list`.
+                    pass
+            if spec.kind == "dict":
+                dictionaries[spec.name] = encoders.setdefault(spec.name, ({}, []))[1]
+    return ColumnBatch(
+        columns=columns, size=size, rejected=rejected, dictionaries=dictionaries
+    )
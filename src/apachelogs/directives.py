@@ -1,8 +1,7 @@
 import re
 from pydicti import dicti
 from .errors import InvalidDirectiveError, UnknownDirectiveError
-from .strftime import strftime2regex
-from .timeutil import parse_apache_timestamp
+from .strftime import apache_timestamp, strftime2regex
 from .util import (
     FieldType,
     clf,
@@ -10,8 +9,12 @@ from .util import (
     clf_word,
     cookie_value,
     esc_string,
+    esc_word,
+    int_converter,
     integer,
     ip_address,
+    ip_address_obj,
+    loose_ip_address,
     remote_user,
     status_code,
     uinteger,
@@ -27,7 +30,14 @@ PLAIN_DIRECTIVES = {
     "D": ("request_duration_microseconds", integer),
     # `%f` is '-' for malformed requests.
     "f": ("request_file", clf_string),
-    "h": ("remote_host", esc_string),
+    # `%h` is either an IP address or a hostname, neither of which contains
+    # whitespace.  Letting it match spaces would make the regex for a format
+    # starting with `%h` try every space in an entry as the end of it, taking
+    # time quadratic in the length of an entry to reject it.  (`%v` and `%V`,
+    # below, may contain spaces, as `%V` is taken from the Host header when
+    # `UseCanonicalName` is off; see `splitter.GuardedRegex` for how entries
+    # are rejected quickly anyway.)
+    "h": ("remote_host", esc_word),
     # In some versions of Apache (I think this includes 2.4.18, the version
     # available to Xenial), `%H` is everything in the request line from the
     # third word onward, and thus it can be anything.  In some other versions
@@ -57,7 +67,7 @@ PLAIN_DIRECTIVES = {
     "q": (
         "request_query",
         FieldType(
-            r"(?:\?(?:[!\x24-\x5B\x5D-\x7E]|\\x[0-9A-Fa-f]{2}|\\.)*?)?",
+            r"(?:\?(?:[!\x24-\x5B\x5D-\x7E]|\\.)*?)?",
             unescape,
         ),
     ),
@@ -70,10 +80,7 @@ PLAIN_DIRECTIVES = {
     # than or equal to zero to "-".  I'm not sure when that can happen, but
     # apparently it can.
     "s": ("status", clf(status_code)),
-    "t": (
-        ("request_time_fields", "timestamp"),
-        FieldType(r"\[[^]]+\]", parse_apache_timestamp),
-    ),
+    "t": (("request_time_fields", "timestamp"), apache_timestamp),
     "T": ("request_duration_seconds", integer),
     "u": ("remote_user", remote_user),
     # Starting somewhere between versions 2.4.18 and 2.4.29 of Apache (or maybe
@@ -98,7 +105,7 @@ PARAMETERIZED_DIRECTIVES = {
     "C": ("cookies", cookie_value),
     "e": ("env_vars", clf_string),
     "h": {
-        "c": ("remote_underlying_host", esc_string),
+        "c": ("remote_underlying_host", esc_word),
     },
     "i": ("headers_in", clf_string),
     # `%{c}L` is derived the same way as `%L`; see above.
@@ -119,7 +126,10 @@ PARAMETERIZED_DIRECTIVES = {
             "pid": ("pid", integer),
             # `%{tid}P` is formatted as an unsigned integer.
             "tid": ("tid", uinteger),
-            "hextid": ("tid", FieldType(r"[0-9A-Fa-f]+", lambda s: int(s, 16))),
+            "hextid": (
+                "tid",
+                FieldType(r"[0-9A-Fa-f]+", int_converter(lambda s: int(s, 16))),
+            ),
         }
     ),
     "t": strftime2regex,
@@ -150,6 +160,37 @@ DIRECTIVE_RGX = re.compile(
     flags=re.X,
 )
 
+#: The `FieldType` instances for the IP address directives for each value of
+#: `LogParser`'s ``ip_addresses`` option
+IP_ADDRESS_TYPES = {
+    "strict": ip_address,
+    "loose": loose_ip_address,
+    "objects": ip_address_obj,
+}
+
+
+def address_directives(ip_addresses="strict", hostname_lookups=True):
+    """
+    Return a pair of copies of `PLAIN_DIRECTIVES` and
+    `PARAMETERIZED_DIRECTIVES` in which the IP address directives (``%a``,
+    ``%A``, and ``%{c}a``) are matched & converted as specified by the given
+    value of `LogParser`'s ``ip_addresses`` option.  If ``hostname_lookups``
+    is false, ``%h`` and ``%{c}h`` are treated as IP address directives as
+    well, as that is what they log when Apache's ``HostnameLookups`` is off.
+
+    .. versionadded:: 0.7.0
+    """
+    dtype = IP_ADDRESS_TYPES[ip_addresses]
+    plain = dict(PLAIN_DIRECTIVES)
+    parameterized = dict(PARAMETERIZED_DIRECTIVES)
+    plain["a"] = ("remote_address", dtype)
+    plain["A"] = ("local_address", dtype)
+    parameterized["a"] = {"c": ("remote_client_address", dtype)}
+    if not hostname_lookups:
+        plain["h"] = ("remote_host", dtype)
+        parameterized["h"] = {"c": ("remote_underlying_host", dtype)}
+    return (plain, parameterized)
+
 
 def format2regex(
     fmt, plain_directives=None, parameterized_directives=None, simple=False
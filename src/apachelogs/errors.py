@@ -10,18 +10,26 @@ class InvalidEntryError(Error, ValueError):
     log format
     """
 
-    def __init__(self, entry, format):  # noqa: A002
+    def __init__(self, entry, format, offset=None):  # noqa: A002
         #: The invalid log entry
         self.entry = entry
         #: The log format string the entry failed to match against
         self.format = format
-        super().__init__(entry, format)
+        #: .. versionadded:: 0.7.0
+        #:
+        #: The byte offset of the start of the entry in the file it was read
+        #: from, if known
+        self.offset = offset
+        super().__init__(entry, format, offset)
 
     def __str__(self):
-        return (
+        s = (
             f"Could not match log entry {self.entry!r}"
             f" against log format {self.format!r}"
         )
+        if self.offset is not None:
+            s += f" at byte offset {self.offset}"
+        return s
 
 
 class InvalidDirectiveError(Error, ValueError):
@@ -55,3 +63,20 @@ class UnknownDirectiveError(Error, ValueError):
 
     def __str__(self):
         return f"Unknown log format directive: {self.directive!r}"
+
+
+class StaleIndexError(Error, ValueError):
+    """
+    .. versionadded:: 0.7.0
+
+    Raised when using a `TimeIndex` for a log file that has changed since the
+    index was built
+    """
+
+    def __init__(self, path):
+        #: The path to the log file
+        self.path = path
+        super().__init__(path)
+
+    def __str__(self):
+        return f"Time index is out of date for log file {str(self.path)!r}"
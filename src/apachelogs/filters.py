@@ -0,0 +1,354 @@
+"""
+Predicates for selecting log entries before they are converted
+
+.. versionadded:: 0.7.0
+"""
+
+from abc import ABC, abstractmethod
+import attr
+from .util import converts_to_int
+
+
+class Filter(ABC):
+    """
+    .. versionadded:: 0.7.0
+
+    Base class for the predicates that can be passed to
+    `LogParser.parse_lines()` via its ``filters`` argument.  Filters are
+    evaluated against the text captured for each entry before the entry is
+    converted, and only the text of the fields that a filter tests is
+    examined.
+    """
+
+    @abstractmethod
+    def compile(self, parser, compiled):
+        """
+        Return a function that takes a regex match for a log entry and returns
+        whether the entry passes the filter
+
+        :param LogParser parser: the parser whose entries are being filtered
+        :param compiled: the `_CompiledFormat` that produced the matches
+        :raises ValueError: if the filter tests a field that is not produced by
+            the log format
+        """
+
+
+@attr.s(frozen=True)
+class Equals(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries in which the given field equals ``value``.  A field is
+    either a directive as it appears in `LogEntry.directives` (e.g., ``"%s"``)
+    or the name of (or `tuple` path to) an attribute with a non-`dict` value
+    (e.g., ``"status"`` or ``("headers_in", "User-Agent")``).  If the format
+    has more than one directive for the field, the first non-`None` value is
+    tested, as for `LogEntry` attributes.
+    """
+
+    field = attr.ib()
+    value = attr.ib()
+
+    def compile(self, parser, compiled):
+        return _member_test(parser, compiled, self.field, [self.value])
+
+
+@attr.s(frozen=True)
+class OneOf(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries in which the given field (as for `Equals`) equals one of
+    the given ``values``
+    """
+
+    field = attr.ib()
+    values = attr.ib(converter=frozenset)
+
+    def compile(self, parser, compiled):
+        return _member_test(parser, compiled, self.field, self.values)
+
+
+@attr.s(frozen=True)
+class Prefix(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries in which the given string field (as for `Equals`) starts
+    with ``prefix``.  Entries in which the field is `None` are not selected.
+    """
+
+    field = attr.ib()
+    prefix = attr.ib()
+
+    def compile(self, parser, compiled):
+        indices = _field_groups(compiled, self.field)
+        get = _value_getter(parser, compiled, indices)
+        prefix = self.prefix
+
+        def test(m):
+            v = get(m)
+            return v is not None and v.startswith(prefix)
+
+        raw_prefix = _raw_text(parser, compiled, indices, prefix)
+        # An empty prefix can't be tested on the captured text, as a "-" that
+        # converts to `None` starts with it too.
+        if not raw_prefix:
+            return test
+        group = indices[0] + 1
+        backslash = _backslash(compiled)
+
+        def raw_test(m):
+            raw = m.group(group)
+            if raw is None:
+                return False
+            # An escape sequence can only turn text into the prefix if it
+            # occurs in the text.
+            return raw.startswith(raw_prefix) or (backslash in raw and test(m))
+
+        return raw_test
+
+
+@attr.s(frozen=True)
+class Range(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries in which the given field (as for `Equals`) is greater than
+    or equal to ``min`` and less than ``max``.  Either bound may be `None` to
+    leave that side of the range open.  Entries in which the field is `None`
+    are not selected.
+    """
+
+    field = attr.ib()
+    min = attr.ib(default=None)  # noqa: A003
+    max = attr.ib(default=None)  # noqa: A003
+
+    def compile(self, parser, compiled):
+        indices = _field_groups(compiled, self.field)
+        get = _value_getter(parser, compiled, indices)
+        lo, hi = self.min, self.max
+
+        def test(m):
+            v = get(m)
+            return v is not None and (lo is None or lo <= v) and (hi is None or v < hi)
+
+        if not _is_int_field(compiled, indices):
+            return test
+        group = indices[0] + 1
+
+        def int_test(m):
+            raw = m.group(group)
+            if raw is None or not raw.isdigit():
+                return test(m)
+            v = int(raw)
+            return (lo is None or lo <= v) and (hi is None or v < hi)
+
+        return int_test
+
+
+@attr.s(frozen=True)
+class TimeRange(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries whose ``request_time`` (or the given variant of it, e.g.,
+    ``"begin_request_time"``) is greater than or equal to ``start`` and less
+    than ``end``.  Either bound may be `None` to leave that side of the range
+    open.  Entries whose time is `None` are not selected.  As the comparison
+    is between `datetime.datetime` objects, the bounds must be aware if and
+    only if the log format's timestamps include a timezone.  If the parser
+    has an ``epoch`` unit, the bounds must instead be `int` counts of that
+    unit since the epoch.
+
+    Only the date & time directives are converted, and the result for the
+    most recent timestamp is remembered, as consecutive entries often share a
+    timestamp.
+    """
+
+    start = attr.ib(default=None)
+    end = attr.ib(default=None)
+    field = attr.ib(default="request_time")
+
+    def compile(self, parser, compiled):
+        get_time = _time_getter(parser, compiled, self.field)
+        start, end = self.start, self.end
+
+        def test(m):
+            t = get_time(m)
+            return (
+                t is not None
+                and (start is None or start <= t)
+                and (end is None or t < end)
+            )
+
+        return test
+
+
+@attr.s(frozen=True)
+class AnyOf(Filter):
+    """
+    .. versionadded:: 0.7.0
+
+    Select entries that pass at least one of the given filters
+    """
+
+    filters = attr.ib(converter=tuple)
+
+    def compile(self, parser, compiled):
+        tests = [f.compile(parser, compiled) for f in self.filters]
+        return lambda m: any(t(m) for t in tests)
+
+
+def _field_groups(compiled, field):
+    """
+    Return the indices of the groups of ``compiled`` that produce the value of
+    ``field``
+
+    :raises ValueError: if no group produces the field
+    """
+    indices = [
+        i
+        for i, (name, directive) in enumerate(compiled.group_names)
+        if field in (name, directive)
+    ]
+    if not indices:
+        raise ValueError(f"Field not produced by log format: {field!r}")
+    return indices
+
+
+def _time_getter(parser, compiled, field):
+    """
+    Return a function that takes a match and returns the value of the given
+    ``request_time`` attribute (or variant) for it, converting only the date &
+    time directives.  The result for the most recent captured text is
+    remembered.
+
+    :raises ValueError: if the attribute is not produced by the log format
+    """
+    if field not in compiled.time_attrs:
+        raise ValueError(f"Field not produced by log format: {field!r}")
+    indices = compiled.attr_groups[field + "_fields"]
+    groups = [i + 1 for i in indices]
+    single = len(groups) == 1
+    defs = [compiled.group_defs[i] for i in indices]
+    assemble = compiled.time_assemblers[field]
+    last = [None, None]
+
+    def get_time(m):
+        raw = m.group(*groups)
+        if raw == last[0]:
+            return last[1]
+        fields = {}
+        for (name, _, conv), value in zip(defs, (raw,) if single else raw):
+            value = parser._convert(conv, value)
+            if fields.get(name[-1]) is None:
+                fields[name[-1]] = value
+        t = assemble(fields)
+        last[:] = [raw, t]
+        return t
+
+    return get_time
+
+
+def _value_getter(parser, compiled, indices):
+    """
+    Return a function that takes a match and returns the converted value of
+    the first of the given groups with a non-`None` value
+    """
+    convs = [(i + 1, compiled.group_defs[i][2]) for i in indices]
+
+    def get(m):
+        for group, conv in convs:
+            v = parser._convert(conv, m.group(group))
+            if v is not None:
+                return v
+        return None
+
+    return get
+
+
+def _member_test(parser, compiled, field, values):
+    """
+    Return a test for whether the value of ``field`` is in ``values``, using
+    the captured text directly where possible
+    """
+    indices = _field_groups(compiled, field)
+    get = _value_getter(parser, compiled, indices)
+    values = frozenset(values)
+
+    def test(m):
+        return get(m) in values
+
+    if len(indices) > 1:
+        return test
+    group = indices[0] + 1
+    if _is_int_field(compiled, indices) and all(
+        type(v) is int for v in values  # noqa: E721
+    ):
+
+        def int_test(m):
+            raw = m.group(group)
+            if raw is None or not raw.isdigit():
+                return test(m)
+            return int(raw) in values
+
+        return int_test
+    raw_values = set()
+    for v in values:
+        raw = _raw_text(parser, compiled, indices, v)
+        if raw is None:
+            return test
+        raw_values.add(raw)
+    backslash = _backslash(compiled)
+
+    def raw_test(m):
+        raw = m.group(group)
+        if raw is None:
+            return None in values
+        # Text without escape sequences converts to itself (as checked by
+        # `_raw_text()`), so only text with escapes needs converting.
+        return raw in raw_values or (backslash in raw and test(m))
+
+    return raw_test
+
+
+def _raw_text(parser, compiled, indices, value):
+    """
+    If ``value`` is a string of printable ASCII characters that, when captured
+    by the single group in ``indices``, converts to itself, return it in the
+    form that it is captured in (`str` or `bytes`); otherwise, return `None`
+    """
+    if len(indices) != 1:
+        return None
+    if isinstance(value, bytes):
+        try:
+            text = value.decode("ascii")
+        except UnicodeDecodeError:
+            return None
+    elif isinstance(value, str):
+        text = value
+    else:
+        return None
+    if not all(" " <= c <= "~" and c not in '"\\' for c in text):
+        return None
+    raw = text.encode("ascii") if _is_binary(compiled) else text
+    conv = compiled.group_defs[indices[0]][2]
+    try:
+        if parser._convert(conv, raw) != value:
+            return None
+    except Exception:
+        return None
+    return raw
+
+
+def _is_int_field(compiled, indices):
+    return len(indices) == 1 and converts_to_int(compiled.group_defs[indices[0]][2])
+
+
+def _is_binary(compiled):
+    return isinstance(compiled.regex.pattern, bytes)
+
+
+def _backslash(compiled):
+    return b"\\" if _is_binary(compiled) else "\\"
@@ -0,0 +1,308 @@
+"""
+Inferring the log format of sample log entries
+
+.. versionadded:: 0.7.0
+"""
+
+from functools import partial
+from itertools import product
+import re
+import time
+import attr
+from .directives import DIRECTIVE_RGX, format2regex
+from .multi import _format_literals, _has_literals
+from .parser import LogParser, _CompiledFormat
+
+#: The default number of sample entries that candidate formats are first
+#: checked against
+DEFAULT_PROBE_SIZE = 20
+
+#: The directives that may be found before a built-in format in the candidates
+#: tried by `infer_format()`
+PREFIXES = ["", "%v ", "%v:%p "]
+
+#: The directives that may be found after a built-in format in the candidates
+#: tried by `infer_format()`
+SUFFIXES = ["", " %D", " %T", " %{ms}T", " %I %O", " %X", " %k"]
+
+#: The directives tried, in order, for each column of unquoted text when
+#: building a format from scratch; columns that are always ``-`` are instead
+#: assigned ``%l`` and then ``%u``
+BARE_DIRECTIVES = ["%a", "%A", "%v:%p", "%>s", "%b", "%D", "%T"]
+
+#: Regex for a token of a log entry when building a format from scratch: a
+#: bracketed string, a double-quoted string with escape sequences, or a run of
+#: non-space characters
+_TOKEN_RGX = re.compile(r'\[[^]]*\]|"(?:[^"\\]|\\.)*"|[^ ]+')
+
+#: Regex for the request line of an entry, used to decide whether a quoted
+#: string is ``%r`` when building a format from scratch
+_REQUEST_LINE_RGX = re.compile(r"-|[A-Z]+ [^ ]+(?: [A-Z]+/[0-9.]+)?")
+
+#: The maximum number of matching entries that each candidate format is timed
+#: parsing
+_TIMING_SIZE = 500
+
+
+@attr.s(frozen=True)
+class FormatGuess:
+    """
+    .. versionadded:: 0.7.0
+
+    A log format proposed by `infer_format()`
+    """
+
+    #: The log format
+    format = attr.ib()  # noqa: A003
+    #: The fraction of the sample entries that match the format and whose
+    #: fields all convert
+    match_rate = attr.ib()
+    #: The average time taken to parse a matching entry, in microseconds
+    parse_usec = attr.ib()
+
+
+def infer_format(
+    entries,
+    threshold=1.0,
+    probe_size=DEFAULT_PROBE_SIZE,
+    encoding="iso-8859-1",
+    errors=None,
+):
+    """
+    .. versionadded:: 0.7.0
+
+    Propose log formats for a sample of log entries whose format is not known,
+    returning a list of `FormatGuess` objects for the candidate formats that
+    parse at least ``threshold`` (a fraction from 0 to 1) of the entries.  An
+    entry counts as parsed if it matches the format and all of its fields
+    convert (e.g., a timestamp with an impossible date does not).  The
+    list is sorted by descending match rate, then from most to least specific
+    (i.e., by descending number of directives), and then from fastest to
+    slowest to parse.
+
+    The candidates are the built-in formats (e.g., `COMBINED`), each with and
+    without ``%v`` or ``%v:%p`` before it and/or one of ``%D``, ``%T``,
+    ``%{ms}T``, ``%I %O``, ``%X``, or ``%k`` after it.  If none of them match
+    enough of the entries, a format is built from scratch by splitting the
+    first entry into bracketed, quoted, & unquoted fields and choosing a
+    directive for each field (e.g., ``%t``, ``%r``, ``%a``, ``%>s``, or
+    ``%b``) that matches and converts its text in the first ``probe_size``
+    entries.  Fields that no directive is chosen for are given as
+    ``%{fieldN}e`` placeholders.
+
+    The candidates are compiled without going through the cache of compiled
+    formats shared by `LogParser` instances (see `parser_cache_info()`), so
+    inference does not evict the formats that the program actually uses.
+
+    To keep inference fast on large samples, each candidate is first checked
+    against the first ``probe_size`` entries, and candidates that miss more
+    of them than ``threshold`` allows are discarded without being tried on
+    the rest.
+
+    :param entries: an iterable of log entries (`str`, or `bytes` decoded
+        with ``encoding`` & ``errors``)
+    :rtype: list[FormatGuess]
+    """
+    entries = [
+        (e.decode(encoding, errors or "strict") if isinstance(e, bytes) else e).rstrip(
+            "\r\n"
+        )
+        for e in entries
+    ]
+    if not entries:
+        return []
+    probe = entries[:probe_size]
+    guesses = _rank(_candidates(), entries, probe, threshold)
+    if not guesses:
+        guesses = _rank([_generic_format(probe)], entries, probe, threshold)
+    return guesses
+
+
+def _candidates():
+    """Return the candidate formats built from the built-in formats"""
+    from . import (
+        COMBINED,
+        COMBINED_DEBIAN,
+        COMMON,
+        COMMON_DEBIAN,
+        VHOST_COMBINED,
+        VHOST_COMMON,
+    )
+
+    formats = [
+        COMBINED,
+        COMBINED_DEBIAN,
+        COMMON,
+        COMMON_DEBIAN,
+        VHOST_COMBINED,
+        VHOST_COMMON,
+    ]
+    candidates = {}
+    for fmt, prefix, suffix in product(formats, PREFIXES, SUFFIXES):
+        if not fmt.startswith(("%v ", "%v:%p ")) or not prefix:
+            candidates.setdefault(prefix + fmt + suffix, None)
+    return list(candidates)
+
+
+def _rank(candidates, entries, probe, threshold):
+    """
+    Return `FormatGuess` objects for the formats in ``candidates`` that parse
+    at least ``threshold`` of ``entries``, sorted as for `infer_format()`
+    """
+    guesses = []
+    for fmt in candidates:
+        has_literals = partial(_has_literals_of, _format_literals(fmt))
+        if not _enough(probe, threshold, has_literals):
+            continue
+        try:
+            compiled = _CompiledFormat.compile(fmt)
+        except ValueError:
+            continue
+        if not _enough(probe, threshold, compiled.regex.fullmatch):
+            continue
+        parser = _PrecompiledParser(fmt, compiled=compiled)
+        # Entries whose fields fail to convert (e.g., an impossible date)
+        # count as misses just like entries that don't match at all:
+        parsed = _enough(entries, threshold, partial(_parses, parser))
+        if not parsed:
+            continue
+        timed = parsed[:_TIMING_SIZE]
+        start = time.perf_counter()
+        for e in timed:
+            parser.parse(e)
+        usec = (time.perf_counter() - start) / len(timed) * 1e6
+        guesses.append(FormatGuess(fmt, len(parsed) / len(entries), usec))
+    guesses.sort(
+        key=lambda g: (-g.match_rate, -_directive_count(g.format), g.parse_usec)
+    )
+    return guesses
+
+
+@attr.s(eq=False)
+class _PrecompiledParser(LogParser):
+    """
+    A `LogParser` that uses a `_CompiledFormat` that has already been compiled
+    for it instead of looking one up in (and adding it to) the shared parser
+    cache, for timing candidate formats
+    """
+
+    #: The `_CompiledFormat` for `str` log entries
+    compiled = attr.ib(default=None, kw_only=True, repr=False)
+
+    def _shared_compiled(self, binary):
+        if binary:
+            return self._compile(binary)
+        return self.compiled
+
+
+def _enough(entries, threshold, pred):
+    """
+    Return the list of the elements of ``entries`` that satisfy ``pred`` if
+    they make up at least ``threshold`` of ``entries``; otherwise, return an
+    empty list, stopping as soon as too many elements have failed
+    """
+    allowed_misses = int(len(entries) * (1 - threshold) + 1e-9)
+    passed = []
+    misses = 0
+    for e in entries:
+        if pred(e):
+            passed.append(e)
+        else:
+            misses += 1
+            if misses > allowed_misses:
+                return []
+    return passed
+
+
+def _parses(parser, entry):
+    """
+    Return whether ``entry`` matches the log format of ``parser`` and all of
+    its fields convert
+    """
+    try:
+        parser.parse(entry)
+    except ValueError:
+        return False
+    return True
+
+
+def _has_literals_of(literals, entry):
+    """`_has_literals()` with the arguments reordered for `functools.partial`"""
+    return _has_literals(entry, *literals)
+
+
+def _directive_count(fmt):
+    """Return the number of directives (other than ``%%``) in a log format"""
+    return sum(
+        m.group("literal") is None and m.group(0) != "%%"
+        for m in DIRECTIVE_RGX.finditer(fmt)
+    )
+
+
+def _generic_format(probe):
+    """
+    Build a log format from scratch for the sample entries in ``probe`` by
+    splitting the first entry into fields and choosing a directive for each
+    one based on its text in all of the entries with the same number of fields
+    """
+    tokens = [list(_TOKEN_RGX.finditer(e)) for e in probe]
+    first = tokens[0]
+    columns = [
+        [ts[i].group() for ts in tokens if len(ts) == len(first)]
+        for i in range(len(first))
+    ]
+    used = set()
+    nfields = 0
+
+    def choose(directives, values):
+        nonlocal nfields
+        for d in directives:
+            if d not in used and _matches_all(d, values):
+                used.add(d)
+                return d
+        nfields += 1
+        return f"%{{field{nfields}}}e"
+
+    fmt = ""
+    pos = 0
+    for m, values in zip(first, columns):
+        fmt += probe[0][pos : m.start()].replace("%", "%%")
+        pos = m.end()
+        if m.group().startswith('"') and m.group().endswith('"') and len(m.group()) > 1:
+            inner = [v[1:-1] for v in values]
+            if all(_REQUEST_LINE_RGX.fullmatch(v) for v in inner):
+                d = choose(["%r"], inner)
+            else:
+                d = choose([], inner)
+            fmt += f'"{d}"'
+        elif m.group().startswith("[") and m.group().endswith("]"):
+            if "%t" not in used and _matches_all("%t", values):
+                used.add("%t")
+                fmt += "%t"
+            else:
+                fmt += "[" + choose([], [v[1:-1] for v in values]) + "]"
+        elif all(v == "-" for v in values):
+            fmt += choose(["%l", "%u"], values)
+        else:
+            fmt += choose(BARE_DIRECTIVES, values)
+    fmt += probe[0][pos:].replace("%", "%%")
+    return fmt
+
+
+def _matches_all(directive, values):
+    """
+    Return whether all of ``values`` match the regex for ``directive`` and can
+    be converted to its field's type
+    """
+    groups, rgx = format2regex(directive)
+    rgx = re.compile(rgx)
+    for v in values:
+        m = rgx.fullmatch(v)
+        if m is None:
+            return False
+        try:
+            for (_, _, conv), gr in zip(groups, m.groups()):
+                conv(gr)
+        except ValueError:
+            return False
+    return True
@@ -0,0 +1,189 @@
+"""
+Parsing log entries that may be in any of several log formats
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import Counter
+from .directives import DIRECTIVE_RGX
+from .errors import InvalidEntryError
+from .parser import LogParser
+from .util import LRUCache
+
+
+class MultiFormatParser:
+    """
+    .. versionadded:: 0.7.0
+
+    A parser for streams of log entries in a mixture of log formats, e.g.,
+    from multiple virtual hosts logging to the same syslog stream.  Each entry
+    is parsed with the first of the formats that it matches, trying first the
+    format that most recently matched an entry from the same source (if a
+    source is given) and then the others in the order given.  Before an entry
+    is matched against a format's regex, it is checked that the entry contains
+    the literal text of the format (e.g., the spaces, quotes, and brackets
+    between the directives) in order, so that formats that cannot match are
+    skipped cheaply.
+
+    As an entry may match more than one format (e.g., a `VHOST_COMBINED`
+    entry also matches `COMBINED`, as ``%u`` may contain spaces), formats
+    should be given from most to least specific, and entries from a source
+    should not mix formats that each other's entries match.
+
+    The format that an entry matched is given by the ``format`` attribute of
+    the returned `LogEntry`, and the number of entries that have matched each
+    parser is recorded in `hits`.
+
+    :param formats: an iterable of Apache log formats and/or `LogParser`
+        instances (for formats that need different options)
+    :param int max_sources: the maximum number of sources for which to
+        remember the most recently matched format; the least recently seen
+        sources are forgotten first.  `None` means no limit.
+    :param kwargs: options to pass to `LogParser` for each format that is not
+        already a `LogParser`
+    :raises ValueError: if ``formats`` is empty
+    """
+
+    def __init__(self, formats, max_sources=1024, **kwargs):
+        #: The `LogParser` for each format, in the order given
+        self.parsers = [
+            f if isinstance(f, LogParser) else LogParser(f, **kwargs) for f in formats
+        ]
+        if not self.parsers:
+            raise ValueError("No log formats given")
+        #: A `collections.Counter` mapping the index of each parser in
+        #: `parsers` to the number of entries that have matched it, plus `None`
+        #: to the number that matched no format.  (Parsers are counted by
+        #: index rather than by format, as two parsers may have the same
+        #: format with different options.)  Clear it to reset the counts.
+        self.hits = Counter()
+        self._literals = [_format_literals(p.format) for p in self.parsers]
+        self._bytes_literals = None
+        # A one-element list of the index of the parser that most recently
+        # matched an entry from each source (or `None` if no entry from the
+        # source has matched yet), so that it can be updated in place
+        self._last = LRUCache(max_sources)
+
+    @property
+    def formats(self):
+        """The `tuple` of the log formats, in the order given"""
+        return tuple(p.format for p in self.parsers)
+
+    def parse(self, entry, source=None):
+        """
+        Parse a log entry with the first format that it matches and return a
+        `LogEntry`.  ``entry`` may be `str` or `bytes`, as for
+        `LogParser.parse()`.
+
+        :param source: a hashable identifier (e.g., a syslog tag or hostname)
+            for the stream that ``entry`` came from; the format that the
+            previous entry from the same source matched is tried first.  If
+            `None`, the formats are tried in the order given.
+        :rtype: LogEntry
+        :raises InvalidEntryError: if ``entry`` does not match any of the
+            formats.  The exception's ``format`` attribute is the `tuple` of
+            formats.
+        """
+        if isinstance(entry, bytes):
+            entry = entry.rstrip(b"\r\n")
+            literals = self._binary_literals()
+        else:
+            entry = entry.rstrip("\r\n")
+            literals = self._literals
+        if source is not None:
+            last_cell = self._last.get(source, lambda: [None])
+            last = last_cell[0]
+        else:
+            last = None
+        if last is not None:
+            order = [last] + [i for i in range(len(self.parsers)) if i != last]
+        else:
+            order = range(len(self.parsers))
+        for i in order:
+            if not _has_literals(entry, *literals[i]):
+                continue
+            parser = self.parsers[i]
+            _, compiled, m = parser._match(entry)
+            if not m:
+                continue
+            log_entry = parser._entry_from_match(entry, compiled, m)
+            if log_entry is not None:
+                if source is not None:
+                    last_cell[0] = i
+                self.hits[i] += 1
+                return log_entry
+        self.hits[None] += 1
+        raise InvalidEntryError(entry, self.formats)
+
+    def parse_lines(self, entries, ignore_invalid=False, source=None):
+        r"""
+        Parse the elements in an iterable of log entries with `parse()` and
+        return a generator of `LogEntry`\s.  If ``ignore_invalid`` is `True`,
+        any entries that do not match any of the formats will be silently
+        discarded.  ``source`` is passed to `parse()` for every entry.
+
+        :raises InvalidEntryError: if an entry does not match any of the
+            formats and ``ignore_invalid`` is `False`
+        """
+        for e in entries:
+            try:
+                yield self.parse(e, source)
+            except InvalidEntryError:
+                if not ignore_invalid:
+                    raise
+
+    def _binary_literals(self):
+        """
+        Return the literals of the formats encoded with their parsers'
+        encodings for testing `bytes` entries
+        """
+        if self._bytes_literals is None:
+            self._bytes_literals = []
+            for parser, (lead, middle, trail) in zip(self.parsers, self._literals):
+                encoding = parser.encoding
+                if encoding == "bytes":
+                    encoding = "iso-8859-1"
+                self._bytes_literals.append(
+                    (
+                        lead.encode(encoding),
+                        [s.encode(encoding) for s in middle],
+                        trail.encode(encoding),
+                    )
+                )
+        return self._bytes_literals
+
+
+def _format_literals(fmt):
+    """
+    Return a triple of the literal text at the start of the log format
+    ``fmt``, a list of the nonempty runs of literal text between its
+    directives, and the literal text at its end
+    """
+    runs = [""]
+    for m in DIRECTIVE_RGX.finditer(fmt):
+        if m.group("literal") is not None:
+            runs[-1] += m.group("literal")
+        elif m.group(0) == "%%":
+            runs[-1] += "%"
+        else:
+            runs.append("")
+    if len(runs) == 1:
+        return (runs[0], [], "")
+    return (runs[0], [s for s in runs[1:-1] if s], runs[-1])
+
+
+def _has_literals(entry, lead, middle, trail):
+    """
+    Return whether ``entry`` starts with ``lead``, ends with ``trail``, and
+    contains the strings in ``middle`` in order in between, as it must in
+    order to match a log format with those literals
+    """
+    if not entry.startswith(lead):
+        return False
+    pos = len(lead)
+    for s in middle:
+        pos = entry.find(s, pos)
+        if pos < 0:
+            return False
+        pos += len(s)
+    return pos <= len(entry) - len(trail) and entry.endswith(trail)
@@ -0,0 +1,140 @@
+"""
+Parsing a log file in parallel across multiple processes
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import attr
+from .errors import InvalidEntryError
+from .parser import LogParser
+
+#: The default size in bytes of the ranges of a file parsed by each task
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def split_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Divide the file at ``path`` into consecutive byte ranges of roughly
+    ``chunk_size`` bytes each, with each range ending just after a newline (or
+    at the end of the file), and return a list of ``(start, end)`` pairs
+
+    :raises ValueError: if ``chunk_size`` is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Invalid chunk size: {chunk_size!r}")
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as fp:
+        while start < size:
+            if start + chunk_size >= size:
+                end = size
+            else:
+                fp.seek(start + chunk_size - 1)
+                fp.readline()
+                end = min(fp.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_lines(data, base=0):
+    """
+    Yield ``(offset, line)`` pairs for each line in the `bytes`-like object
+    ``data``, where ``offset`` is the line's offset plus ``base``.  Lines
+    include their trailing newline, if any.
+    """
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = data.find(b"\n", pos)
+        end = size if end == -1 else end + 1
+        yield (base + pos, data[pos:end])
+        pos = end
+
+
+def parse_chunk(config, path, start, end, ignore_invalid):
+    """
+    Parse the log entries in bytes ``start`` through ``end`` of the file at
+    ``path`` using a `LogParser` constructed with the keyword arguments
+    ``config``.  This is the function run by the worker processes.
+
+    :return: a pair of a `list` of the parsed `LogEntry` objects and either
+        `None` or the `InvalidEntryError` for the first invalid entry (after
+        which parsing stopped)
+    """
+    parser = LogParser(**config)
+    with open(path, "rb") as fp:
+        fp.seek(start)
+        data = fp.read(end - start)
+    entries = []
+    for offset, line in iter_lines(data, start):
+        try:
+            entries.append(parser.parse(line))
+        except InvalidEntryError as e:
+            if not ignore_invalid:
+                return (entries, InvalidEntryError(e.entry, e.format, offset))
+    return (entries, None)
+
+
+def parse_file_parallel(
+    parser,
+    path,
+    workers=None,
+    ordered=True,
+    ignore_invalid=False,
+    chunk_size=None,
+):
+    """Implementation of `LogParser.parse_file_parallel()`"""
+    # Split the file now (checking ``chunk_size``) rather than when the
+    # generator is first advanced:
+    ranges = split_file(path, DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size)
+    return _iter_parallel(parser, path, ranges, workers, ordered, ignore_invalid)
+
+
+def _iter_parallel(parser, path, ranges, workers, ordered, ignore_invalid):
+    config = attr.asdict(parser, recurse=False)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Keep a bounded number of chunks in flight so that results for the whole
+    # file don't pile up in memory when the consumer is slower than the pool.
+    max_pending = 2 * workers
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        todo = iter(ranges)
+
+        def submit():
+            rng = next(todo, None)
+            if rng is None:
+                return None
+            return executor.submit(parse_chunk, config, path, *rng, ignore_invalid)
+
+        if ordered:
+            pending = deque()
+            while len(pending) < max_pending and (fut := submit()) is not None:
+                pending.append(fut)
+            while pending:
+                entries, error = pending.popleft().result()
+                if (fut := submit()) is not None:
+                    pending.append(fut)
+                yield from entries
+                if error is not None:
+                    raise error
+        else:
+            pending = set()
+            while len(pending) < max_pending and (fut := submit()) is not None:
+                pending.add(fut)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    entries, error = fut.result()
+                    if (new := submit()) is not None:
+                        pending.add(new)
+                    yield from entries
+                    if error is not None:
+                        raise error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
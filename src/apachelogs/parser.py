@@ -1,9 +1,32 @@
+import mmap
+import os
 import re
 import attr
 from pydicti import dicti
-from .directives import format2regex
+from .codegen import entry_builder
+from .columns import DEFAULT_BATCH_SIZE, iter_column_batches
+from .directives import IP_ADDRESS_TYPES, address_directives, format2regex
 from .errors import InvalidEntryError
-from .timeutil import assemble_datetime
+from .seek import parse_time_range
+from .splitter import guarded_regex, split_matcher
+from .timeindex import DEFAULT_INDEX_INTERVAL, build_time_index
+from .timeutil import (
+    EPOCH_UNITS,
+    apache_timestamp_to_epoch,
+    assemble_datetime,
+    time_assembler,
+)
+from .util import (
+    CacheInfo,
+    FieldType,
+    InvalidAddressError,
+    LRUCache,
+    MemoizedConverter,
+    bytes_converter,
+    clf,
+    converts_to_int,
+    int_converter,
+)
 
 # The parameterized directives corresponding to the following `dict` attributes
 # all look up their parameters case-insensitively (either because Apache stores
@@ -23,6 +46,370 @@ NOCASEDICTS = {
     "variables",
 }
 
+#: The names of the `LogEntry` attributes that are assembled from the values in
+#: the attributes of the same name plus a ``_fields`` suffix
+REQUEST_TIME_ATTRS = [
+    prefix + midfix + "request_time"
+    for prefix in ("original_", "", "final_")
+    for midfix in ("begin_", "", "end_")
+]
+
+#: The values of `LogParser`'s ``engine`` option
+ENGINES = ("regex", "split")
+
+#: The cache of compiled log formats, keyed by `LogParser` construction
+#: arguments
+_parser_cache = LRUCache(maxsize=128)
+
+#: The cache of the `LogEntry` classes with ``__slots__`` generated for each log
+#: format, keyed by format
+_entry_class_cache = LRUCache(maxsize=128)
+
+
+@attr.s(frozen=True)
+class _CompiledFormat:
+    """
+    The result of compiling a log format: everything a `LogParser` needs that
+    depends only on its construction arguments.  Instances are shared between
+    parsers via the parser cache and must not be modified.
+    """
+
+    #: The list of ``(name, directive, converter)`` triples returned by
+    #: `format2regex()`
+    group_defs = attr.ib()
+    #: The compiled regex for matching log entries, or a `SplitMatcher` or
+    #: `_LengthLimit` that can be used in its place
+    regex = attr.ib()
+    #: The ``(name, directive)`` pairs passed to `LogEntry`
+    group_names = attr.ib()
+    #: A `dict` mapping each top-level `LogEntry` attribute produced by the
+    #: format to the indices of the groups stored in it
+    attr_groups = attr.ib()
+    #: The elements of `REQUEST_TIME_ATTRS` that entries in the format have
+    time_attrs = attr.ib()
+    #: The indices of the groups for ``%t`` timestamps
+    timestamp_groups = attr.ib()
+    #: A `dict` mapping each element of ``time_attrs`` to the function for
+    #: assembling it from its `dict` of time fields (see `time_assembler()`)
+    time_assemblers = attr.ib()
+    #: A `dict` in which `entry_builder()` caches the code generated for the
+    #: format; shared by all copies of the compiled format, and the only part
+    #: of it that is ever modified
+    builders = attr.ib(factory=dict, eq=False, repr=False)
+
+    @classmethod
+    def compile(
+        cls,
+        format,  # noqa: A002
+        binary=False,
+        encoding=None,
+        errors=None,
+        fields=None,
+        epoch=None,
+        engine="regex",
+        ip_addresses="strict",
+        hostname_lookups=True,
+    ):
+        """
+        Compile a log format.  If ``binary`` is true, the regex and converters
+        are for matching `bytes` log entries, and the regex's non-ASCII
+        characters are encoded in & the converters decode captured values with
+        the given ``encoding`` & ``errors``.  If ``fields`` is not `None`, only
+        the groups for the given fields (see `LogParser`) are captured.  If
+        ``epoch`` is not `None`, ``%t`` timestamps are converted to & times
+        are assembled as integers in the given unit (see `LogParser`).  If
+        ``engine`` is ``"split"``, entries are matched with a `SplitMatcher`
+        when the format allows it; with the ``"regex"`` engine, they are
+        matched with a `GuardedRegex` when the format needs one.
+        ``ip_addresses`` and ``hostname_lookups`` are as for `LogParser`.
+        """
+        if ip_addresses == "strict" and hostname_lookups:
+            group_defs, rgx = format2regex(format)
+        else:
+            group_defs, rgx = format2regex(
+                format, *address_directives(ip_addresses, hostname_lookups)
+            )
+        if fields is not None:
+            keep = _select_groups(group_defs, fields)
+            group_defs = [gdef for i, gdef in enumerate(group_defs) if i in keep]
+            rgx = _uncapture(rgx, keep)
+        if epoch is not None:
+            group_defs = [
+                (
+                    (name, directive, _epoch_converter(conv, epoch))
+                    if _is_timestamp(name)
+                    else (name, directive, conv)
+                )
+                for (name, directive, conv) in group_defs
+            ]
+        text_rgx = rgx
+        if binary:
+            if encoding is None or encoding == "bytes":
+                encoding = "iso-8859-1"
+            errors = errors or "strict"
+            group_defs = [
+                (name, directive, bytes_converter(conv, encoding, errors))
+                for (name, directive, conv) in group_defs
+            ]
+            try:
+                rgx = _bytes_regex(rgx, encoding)
+            except UnicodeEncodeError:
+                raise ValueError(
+                    f"Log format {format!r} cannot be encoded in {encoding!r}"
+                    " for parsing bytes entries"
+                )
+        regex = re.compile(rgx)
+        if engine == "split":
+            regex = (
+                split_matcher(text_rgx, regex, encoding if binary else None) or regex
+            )
+        else:
+            regex = (
+                guarded_regex(text_rgx, regex, encoding if binary else None) or regex
+            )
+        attr_groups = {}
+        for i, (name, _, _) in enumerate(group_defs):
+            top = name[0] if isinstance(name, tuple) else name
+            attr_groups.setdefault(top, []).append(i)
+        time_assemblers = {
+            t: time_assembler(
+                [group_defs[i][0][-1] for i in attr_groups[t + "_fields"]], epoch
+            )
+            for t in REQUEST_TIME_ATTRS
+            if t + "_fields" in attr_groups
+        }
+        return cls(
+            group_defs=group_defs,
+            regex=regex,
+            group_names=[gdef[:2] for gdef in group_defs],
+            attr_groups=attr_groups,
+            time_attrs=list(time_assemblers),
+            timestamp_groups=[
+                i for i, (name, _, _) in enumerate(group_defs) if _is_timestamp(name)
+            ],
+            time_assemblers=time_assemblers,
+        )
+
+    def with_group_defs(self, group_defs):
+        """
+        Return a copy of the compiled format with ``group_defs`` in place of
+        its groups (which must have the same names & directives)
+        """
+        # Much faster than `attr.evolve()`, which matters as this is done for
+        # every `LogParser` with timestamp memoization
+        return _CompiledFormat(
+            group_defs=group_defs,
+            regex=self.regex,
+            group_names=self.group_names,
+            attr_groups=self.attr_groups,
+            time_attrs=self.time_attrs,
+            timestamp_groups=self.timestamp_groups,
+            time_assemblers=self.time_assemblers,
+            builders=self.builders,
+        )
+
+    def with_max_length(self, max_length):
+        """
+        Return a copy of the compiled format whose regex does not match entries
+        longer than ``max_length``
+        """
+        return _CompiledFormat(
+            group_defs=self.group_defs,
+            regex=_LengthLimit(self.regex, max_length),
+            group_names=self.group_names,
+            attr_groups=self.attr_groups,
+            time_attrs=self.time_attrs,
+            timestamp_groups=self.timestamp_groups,
+            time_assemblers=self.time_assemblers,
+            builders=self.builders,
+        )
+
+
+class _LengthLimit:
+    """
+    A wrapper around the compiled regex (or `SplitMatcher`) of a log format
+    that rejects entries longer than ``max_length`` without matching them
+    """
+
+    def __init__(self, regex, max_length):
+        self.regex = regex
+        self.max_length = max_length
+
+    @property
+    def pattern(self):
+        """The pattern of the wrapped regex"""
+        return self.regex.pattern
+
+    @property
+    def groups(self):
+        """The number of capturing groups in the wrapped regex"""
+        return self.regex.groups
+
+    def fullmatch(self, entry):
+        """
+        Return `None` if ``entry`` is longer than ``max_length``; otherwise,
+        match it with the wrapped regex
+        """
+        if len(entry) > self.max_length:
+            return None
+        return self.regex.fullmatch(entry)
+
+
+def _is_timestamp(name):
+    """Return whether a group with the given name is for a ``%t`` timestamp"""
+    return isinstance(name, tuple) and name[-1] == "timestamp"
+
+
+def _epoch_converter(converter, unit):
+    r"""
+    Given the ``converter`` for a ``%t`` timestamp, return a converter that
+    produces the number of ``unit``\s since the epoch instead of a
+    `datetime.datetime`
+    """
+    if hasattr(converter, "clf_converter"):
+        # A conditional ``%t``
+        inner = _epoch_converter(converter.clf_converter, unit)
+        return clf(FieldType("", inner)).converter
+    per_sec = EPOCH_UNITS[unit]
+    if per_sec == 1:
+        return apache_timestamp_to_epoch
+    return lambda s: None if s is None else apache_timestamp_to_epoch(s) * per_sec
+
+
+def _decoding_converter(converter, encoding, errors):
+    """
+    Return a converter that applies ``converter`` and then decodes `bytes`
+    results with ``encoding`` & ``errors``, as done by `LogParser._convert()`
+    """
+
+    def convert(value):
+        value = converter(value)
+        if isinstance(value, bytes):
+            value = value.decode(encoding, errors or "strict")
+        return value
+
+    if converts_to_int(converter):
+        int_converter(convert)
+    return convert
+
+
+def _select_groups(group_defs, fields):
+    """
+    Return the `set` of the indices of the groups in ``group_defs`` that
+    produce the values of the given fields.  A field is either a directive as
+    it appears in `LogEntry.directives`, an attribute name, a path of names to
+    a value in a `dict` attribute, or the name of a ``request_time`` attribute
+    (which selects all of the groups in its ``*_fields`` attribute).
+
+    :raises ValueError: if a field is not produced by any group
+    """
+    keep = set()
+    for f in fields:
+        found = False
+        for i, (name, directive, _) in enumerate(group_defs):
+            top = name[0] if isinstance(name, tuple) else name
+            if f in (name, directive, top) or (
+                isinstance(f, str) and top == f + "_fields"
+            ):
+                keep.add(i)
+                found = True
+        if not found:
+            raise ValueError(f"Field not produced by log format: {f!r}")
+    return keep
+
+
+def _uncapture(rgx, keep):
+    """
+    Turn the capturing groups of the regex string ``rgx`` whose (0-based)
+    indices are not in ``keep`` into non-capturing groups so that the regex
+    engine skips saving them
+    """
+    out = []
+    index = 0
+    in_class = False
+    i = 0
+    while i < len(rgx):
+        c = rgx[i]
+        if c == "\\":
+            out.append(rgx[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            # A "]" right after the "[" (or "[^") is a literal.
+            j = i + 1
+            if rgx[j : j + 1] == "^":
+                j += 1
+            if rgx[j : j + 1] == "]":
+                out.append(rgx[i : j + 1])
+                i = j + 1
+                continue
+        elif c == "(" and rgx[i + 1 : i + 2] != "?":
+            if index not in keep:
+                c = "(?:"
+            index += 1
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _bytes_regex(rgx, encoding):
+    """
+    Convert the `str` regex ``rgx`` produced by `format2regex()` to a `bytes`
+    regex.  Because ``\\w`` only matches ASCII characters in a `bytes` regex,
+    it is extended to match any non-ASCII byte so that it still matches
+    non-English words (e.g., localized month names) in ASCII-compatible
+    encodings.
+    """
+    # Escaped backslashes are consumed as pairs so that the "w" in the escaped
+    # literal "\\w" is left alone.
+    rgx = re.sub(
+        r"\\(.)",
+        lambda m: r"(?:\w|[\x80-\xFF])" if m.group(1) == "w" else m.group(0),
+        rgx,
+        flags=re.S,
+    )
+    return rgx.encode(encoding)
+
+
+def _sum_cache_info(memos, maxsize):
+    r"""
+    Return a `CacheInfo` of the statistics of the `MemoizedConverter`\s in
+    ``memos`` summed together, with the given ``maxsize``
+    """
+    infos = [memo.info() for memo in memos]
+    return CacheInfo(
+        hits=sum(i.hits for i in infos),
+        misses=sum(i.misses for i in infos),
+        evictions=sum(i.evictions for i in infos),
+        maxsize=maxsize,
+        currsize=sum(i.currsize for i in infos),
+    )
+
+
+def parser_cache_info():
+    """
+    .. versionadded:: 0.7.0
+
+    Return the statistics of the cache of compiled log formats shared by all
+    `LogParser` instances (and thus by `parse()` and `parse_lines()`) as a
+    named tuple with ``hits``, ``misses``, ``evictions``, ``maxsize``, and
+    ``currsize`` attributes
+    """
+    return _parser_cache.info()
+
+
+def clear_parser_cache():
+    """
+    .. versionadded:: 0.7.0
+
+    Empty the cache of compiled log formats and reset its statistics
+    """
+    _parser_cache.clear()
+
 
 @attr.s
 class LogParser:
@@ -39,6 +426,137 @@ class LogParser:
         instead of `str`.
     :param str errors: the error handling scheme to use when decoding; defaults
         to ``'strict'``
+    :param bool lazy: .. versionadded:: 0.7.0
+
+        If true, `parse()` only checks that entries match the log format and
+        returns `LogEntry` objects that convert each attribute (and the
+        ``directives`` mapping) the first time it is accessed.  This is much
+        faster when only a few of a format's attributes are actually used.
+        Defaults to `False`.
+    :param bool slots: .. versionadded:: 0.7.0
+
+        If true, `parse()` returns instances of a class generated for the log
+        format that has the same attributes as `LogEntry` (and compares equal
+        to `LogEntry` objects with the same attribute values) but that stores
+        each directive's value in a ``__slots__`` attribute instead of an
+        instance ``__dict__``.  (As a consequence, the class is not a subclass
+        of `LogEntry`.)  The
+        ``directives`` mapping and any `dict` attributes (e.g.,
+        ``headers_in``) are computed from the stored values whenever they are
+        accessed, and so modifying them has no effect on the entry.  This
+        makes entries several times smaller, which matters when holding large
+        numbers of them in memory.  Cannot be combined with ``lazy``.
+        Defaults to `False`.
+    :param fields: .. versionadded:: 0.7.0
+
+        If not `None`, an iterable of the only fields that parsed entries
+        should have.  Each field is either a directive as it appears in
+        `LogEntry.directives` (e.g., ``"%h"`` or ``"%{User-Agent}i"``), an
+        attribute name (e.g., ``"remote_host"`` or ``"headers_in"``), a
+        `tuple` path to a value in a `dict` attribute (e.g., ``("headers_in",
+        "User-Agent")``), or ``"request_time"`` (or one of its variants, e.g.,
+        ``"begin_request_time"``) to select all of the date & time directives
+        it is assembled from.  The text matching all other directives is
+        still checked against the directives' patterns but is not captured or
+        converted, and entries do not have the corresponding attributes or
+        ``directives`` keys.  Defaults to `None`, meaning all fields.
+    :param int timestamp_cache_size: .. versionadded:: 0.7.0
+
+        The number of distinct ``%t`` timestamps (beyond the most recent one)
+        for which the parser remembers the converted `datetime.datetime`, so
+        that entries with repeated timestamps share the conversion.  `None`
+        means unlimited, and 0 disables the memo.  Defaults to 128.  See
+        `timestamp_cache_info()`.
+    :param str epoch: .. versionadded:: 0.7.0
+
+        If not `None`, ``request_time`` and its variants (e.g.,
+        ``begin_request_time``) are `int` counts of seconds, milliseconds, or
+        microseconds (for ``"sec"``, ``"msec"``, or ``"usec"``, respectively)
+        since the epoch instead of `datetime.datetime` objects.  ``%t``
+        timestamps are converted straight to such counts, which are also
+        their values in the ``*_fields`` attributes and ``directives``, and
+        ``%{sec}t``, ``%{msec}t``, & ``%{usec}t`` values are used directly;
+        other date & time directives are assembled into a
+        `datetime.datetime` first.  As for
+        `datetime.datetime.timestamp()`, naïve times are treated as local
+        time.  Defaults to `None`.
+    :param intern_fields: .. versionadded:: 0.7.0
+
+        If not `None`, an iterable of fields (given the same way as for
+        ``fields``) whose values are interned: for each directive of the
+        fields, the parser remembers the converted values of up to
+        ``intern_cache_size`` distinct captured strings (discarding the least
+        recently used), and entries with the same text for the directive share
+        one value object instead of each holding its own copy.  This reduces
+        the memory used by large numbers of parsed entries with repetitive
+        fields, like ``request_method``, ``virtual_host``, or ``("headers_in",
+        "User-Agent")``, while the bound keeps fields with many unique values
+        from growing the memos without limit.  Defaults to `None`.  See
+        `intern_cache_info()`.
+    :param int intern_cache_size: .. versionadded:: 0.7.0
+
+        The number of distinct values remembered for each interned directive
+        (beyond the most recent one); `None` means unlimited.  Defaults to
+        1024.
+    :param str engine: .. versionadded:: 0.7.0
+
+        How entries are matched against the log format.  The default,
+        ``"regex"``, matches each entry with a single regex for the whole
+        format.  ``"split"`` instead splits each entry at the literal text
+        between the format's directives (e.g., spaces, quotes, and brackets)
+        in one scan and checks each directive's text against its own pattern,
+        which is faster for entries with long string fields, like
+        ``User-Agent`` headers.  Entries whose split texts do not match (e.g.,
+        because a quoted string contains an unescaped ``" "``) are matched with
+        the regex instead, and formats in which a directive other than a
+        string might contain the literal after it (e.g., the space-padded day
+        in ``%{%d %H}t``) always use the regex, so the results are the same
+        either way.
+    :param int max_line_length: .. versionadded:: 0.7.0
+
+        If not `None`, entries longer than this many characters (or bytes, for
+        `bytes` entries), not counting any trailing line ending, are treated
+        as not matching the log format without being matched against it, so
+        that very long junk lines cost next to nothing to reject.  Such
+        entries raise `InvalidEntryError` or, when ``ignore_invalid`` is true,
+        are skipped.  Defaults to `None`.
+
+        The regexes for the directives are written so that entries in the
+        built-in formats are matched or rejected in time roughly linear in
+        their length.  However, a format with two or more string directives
+        that can contain the literal text between them (e.g., ``%u %{X}i``,
+        as both may contain spaces) can still take time quadratic (or worse)
+        in the length of an entry to reject it, and setting
+        ``max_line_length`` is then the way to bound that time.
+    :param str ip_addresses: .. versionadded:: 0.7.0
+
+        How the IP address directives (``%a``, ``%A``, and ``%{c}a``) are
+        matched & converted.  The default, ``"strict"``, matches them with a
+        regex that only accepts valid IPv4 & IPv6 addresses and leaves them as
+        `str` values.  ``"loose"`` matches them with a much cheaper regex that
+        accepts any run of hexadecimal digits, colons, & periods and checks
+        that the address is valid when the field is converted (and so not at
+        all for fields excluded by ``fields`` or not accessed on a ``lazy``
+        entry), still producing `str` values.  ``"objects"`` is like
+        ``"loose"``, but produces `ipaddress.IPv4Address` &
+        `ipaddress.IPv6Address` objects, shared between entries with the same
+        address via a bounded cache.  In the latter two modes, an entry with
+        an invalid address in a converted field is treated as not matching the
+        log format (raising `InvalidEntryError` or, when ``ignore_invalid`` is
+        true, being skipped, and being counted as rejected by
+        `parse_columns()`), except that on a ``lazy`` entry, accessing the
+        field raises a `ValueError`.
+    :param bool hostname_lookups: .. versionadded:: 0.7.0
+
+        Whether Apache's ``HostnameLookups`` was on for the log, i.e., whether
+        ``%h`` and ``%{c}h`` may be hostnames.  If false, they are instead
+        treated as IP address directives, as specified by ``ip_addresses``.
+        Defaults to `True`.
+    :raises ValueError: if ``lazy`` and ``slots`` are both true, if a field in
+        ``fields`` or ``intern_fields`` is not produced by the log format (or,
+        for ``intern_fields``, is excluded by ``fields``), if ``epoch``,
+        ``engine``, or ``ip_addresses`` is not one of the above values, or if
+        ``max_line_length`` is negative
     :raises InvalidDirectiveError: if an invalid directive occurs in ``format``
     :raises UnknownDirectiveError: if an unknown directive occurs in ``format``
     """
@@ -46,25 +564,276 @@ class LogParser:
     format = attr.ib()  # noqa: A003
     encoding = attr.ib(default="iso-8859-1")
     errors = attr.ib(default=None)
+    lazy = attr.ib(default=False)
+    slots = attr.ib(default=False)
+    fields = attr.ib(default=None, converter=attr.converters.optional(tuple))
+    timestamp_cache_size = attr.ib(default=128)
+    epoch = attr.ib(default=None)
+    intern_fields = attr.ib(default=None, converter=attr.converters.optional(tuple))
+    intern_cache_size = attr.ib(default=1024)
+    engine = attr.ib(default="regex")
+    max_line_length = attr.ib(default=None)
+    ip_addresses = attr.ib(default="strict")
+    hostname_lookups = attr.ib(default=True)
 
     def __attrs_post_init__(self):
-        self._group_defs, self._rgx = format2regex(self.format)
-        self._rgx = re.compile(self._rgx)
+        if self.epoch is not None and self.epoch not in EPOCH_UNITS:
+            raise ValueError(f"Invalid epoch unit: {self.epoch!r}")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Invalid engine: {self.engine!r}")
+        if self.max_line_length is not None and self.max_line_length < 0:
+            raise ValueError(f"Invalid max_line_length: {self.max_line_length!r}")
+        if self.ip_addresses not in IP_ADDRESS_TYPES:
+            raise ValueError(f"Invalid ip_addresses: {self.ip_addresses!r}")
+        self._timestamp_memos = []
+        self._intern_memos = []
+        compiled = self._shared_compiled(binary=False)
+        if self.intern_fields is not None:
+            self._intern_groups = _select_groups(
+                compiled.group_defs, self.intern_fields
+            ).difference(compiled.timestamp_groups)
+        else:
+            self._intern_groups = set()
+        self._compiled = self._customize(compiled)
+        self._group_defs = self._compiled.group_defs
+        self._rgx = self._compiled.regex
+        self._bytes_compiled = None
+        self._entry_class = None
+        if self.slots:
+            if self.lazy:
+                raise ValueError("lazy and slots cannot both be true")
+            self._entry_class = _slotted_entry_class(
+                self.format, self._compiled, self.fields, self.epoch
+            )
+        self._build, self._build_source = self._entry_builder(self._compiled)
+        self._bytes_build = self._bytes_build_source = None
+
+    def _binary(self):
+        """Return the `_CompiledFormat` for parsing `bytes` log entries"""
+        if self._bytes_compiled is None:
+            compiled = self._customize(self._shared_compiled(binary=True))
+            self._bytes_build, self._bytes_build_source = self._entry_builder(compiled)
+            self._bytes_compiled = compiled
+        return self._bytes_compiled
+
+    def _entry_builder(self, compiled):
+        """
+        Return a pair of the function generated by `entry_builder()` for
+        constructing `LogEntry` objects from matches against the regex of
+        ``compiled`` and its source code, or ``(None, None)`` if entries are
+        constructed the generic way
+        """
+        if self.lazy:
+            return (None, None)
+        return entry_builder(
+            compiled, self.format, self.encoding, self.errors, self._entry_class
+        )
+
+    def generated_source(self, binary=False):
+        """
+        .. versionadded:: 0.7.0
+
+        Return the source code of the function generated for the log format
+        that `parse()` uses to construct `LogEntry` objects from `str` log
+        entries (or from `bytes` log entries, if ``binary`` is true), for
+        debugging.  The function unpacks & converts the captured values of an
+        entry and builds its attributes in straight-line code specialized for
+        the format.  Returns `None` if the parser does not use such a function
+        (i.e., if ``lazy`` is true or the format has two spellings of the same
+        key in a case-insensitive `dict` attribute).
+
+        :rtype: str or None
+        """
+        if binary:
+            self._binary()
+            return self._bytes_build_source
+        return self._build_source
+
+    def _shared_compiled(self, binary):
+        """
+        Return the `_CompiledFormat` for the parser's construction arguments
+        (for `bytes` log entries if ``binary`` is true) from the parser cache,
+        compiling it if it is not cached.  Compiling a format is far more
+        expensive than parsing an entry, so the result is shared between all
+        parsers constructed with the same arguments.
+        """
+        key = (
+            self.format,
+            self.encoding,
+            self.errors,
+            self.fields,
+            self.epoch,
+            self.engine,
+            self.ip_addresses,
+            bool(self.hostname_lookups),
+        )
+        if binary:
+            key += ("binary",)
+        return _parser_cache.get(key, lambda: self._compile(binary))
+
+    def _compile(self, binary):
+        """
+        Compile the `_CompiledFormat` for the parser's construction arguments
+        (for `bytes` log entries if ``binary`` is true) without consulting the
+        parser cache
+        """
+        return _CompiledFormat.compile(
+            self.format,
+            binary=binary,
+            encoding=self.encoding,
+            errors=self.errors,
+            fields=self.fields,
+            epoch=self.epoch,
+            engine=self.engine,
+            ip_addresses=self.ip_addresses,
+            hostname_lookups=self.hostname_lookups,
+        )
+
+    def _customize(self, compiled):
+        """
+        Return a copy of the shared `_CompiledFormat` ``compiled`` with the
+        parser's own timestamp memos, interning memos, and length limit applied
+        """
+        return self._limit_length(
+            self._intern_values(self._memoize_timestamps(compiled))
+        )
+
+    def _match(self, entry):
+        """
+        Strip any trailing line ending from the `str` or `bytes` log entry
+        ``entry`` and match it against the parser's `_CompiledFormat` for its
+        type.  Returns a triple of the stripped entry, the `_CompiledFormat`,
+        and the match (or `None` if the entry does not match).
+        """
+        if isinstance(entry, bytes):
+            compiled = self._binary()
+            entry = entry.rstrip(b"\r\n")
+        else:
+            compiled = self._compiled
+            entry = entry.rstrip("\r\n")
+        return entry, compiled, compiled.regex.fullmatch(entry)
+
+    def _limit_length(self, compiled):
+        """
+        Return a copy of the `_CompiledFormat` ``compiled`` whose regex rejects
+        entries longer than ``max_line_length``, or ``compiled`` itself if
+        there is no limit
+        """
+        if self.max_line_length is None:
+            return compiled
+        return compiled.with_max_length(self.max_line_length)
+
+    def _memoize_timestamps(self, compiled):
+        r"""
+        Return a copy of the shared `_CompiledFormat` ``compiled`` in which the
+        converters for ``%t`` timestamps are wrapped in this parser's own
+        `MemoizedConverter`\s, or ``compiled`` itself if there are no such
+        converters or memoization is disabled
+        """
+        if self.timestamp_cache_size == 0 or not compiled.timestamp_groups:
+            return compiled
+        group_defs = list(compiled.group_defs)
+        for i in compiled.timestamp_groups:
+            name, directive, conv = group_defs[i]
+            memo = MemoizedConverter(conv, self.timestamp_cache_size)
+            self._timestamp_memos.append(memo)
+            group_defs[i] = (name, directive, memo)
+        return compiled.with_group_defs(group_defs)
+
+    def _intern_values(self, compiled):
+        r"""
+        Return a copy of the `_CompiledFormat` ``compiled`` in which the
+        converters for the groups of ``intern_fields`` are wrapped in this
+        parser's own `MemoizedConverter`\s (which also decode `bytes` values
+        the same way as `_convert()`, so that the decoded values are shared),
+        or ``compiled`` itself if there are no such groups
+        """
+        if not self._intern_groups:
+            return compiled
+        group_defs = list(compiled.group_defs)
+        for i in sorted(self._intern_groups):
+            name, directive, conv = group_defs[i]
+            if self.encoding != "bytes":
+                conv = _decoding_converter(conv, self.encoding, self.errors)
+            memo = MemoizedConverter(conv, self.intern_cache_size)
+            self._intern_memos.append(memo)
+            group_defs[i] = (name, directive, memo)
+        return compiled.with_group_defs(group_defs)
+
+    def timestamp_cache_info(self):
+        """
+        .. versionadded:: 0.7.0
+
+        Return the statistics of the parser's memo of converted ``%t``
+        timestamps as a named tuple with ``hits``, ``misses``, ``evictions``,
+        ``maxsize``, and ``currsize`` attributes and a ``hit_rate`` property.
+        If the format has multiple ``%t`` directives or the parser has parsed
+        both `str` and `bytes` entries, the statistics of their memos are
+        summed.
+        """
+        return _sum_cache_info(self._timestamp_memos, self.timestamp_cache_size)
+
+    def intern_cache_info(self):
+        """
+        .. versionadded:: 0.7.0
+
+        Return the statistics of the parser's memos of interned values (see
+        ``intern_fields``), summed over all of the interned directives, as a
+        named tuple with ``hits``, ``misses``, ``evictions``, ``maxsize``, and
+        ``currsize`` attributes and a ``hit_rate`` property
+        """
+        return _sum_cache_info(self._intern_memos, self.intern_cache_size)
 
     def parse(self, entry):
         """
         Parse an access log entry according to the log format and return a
         `LogEntry` object.
 
-        :param str entry: an access log entry to parse
+        .. versionchanged:: 0.7.0
+
+            ``entry`` may now be a `bytes` value, e.g., a line read from a log
+            file opened in binary mode.  The entry is then matched without
+            first being decoded, escape sequences are decoded straight from the
+            raw bytes, and the `LogEntry`'s ``entry`` attribute is `bytes`.
+            Strings that are not subject to escaping (see :ref:`directives`)
+            are decoded using the parser's ``encoding`` (or ISO-8859-1 if that
+            is ``'bytes'``).
+
+        :param entry: an access log entry to parse
+        :type entry: str or bytes
         :rtype: LogEntry
         :raises InvalidEntryError: if ``entry`` does not match the log format
         """
-        entry = entry.rstrip("\r\n")
-        m = self._rgx.fullmatch(entry)
-        if not m:
-            raise InvalidEntryError(entry, self.format)
-        groups = [conv(gr) for (_, _, conv), gr in zip(self._group_defs, m.groups())]
+        entry, compiled, m = self._match(entry)
+        if m:
+            log_entry = self._entry_from_match(entry, compiled, m)
+            if log_entry is not None:
+                return log_entry
+        raise InvalidEntryError(entry, self.format)
+
+    def _entry_from_match(self, entry, compiled, m):
+        """
+        Construct the `LogEntry` for ``entry`` from its match ``m`` against the
+        regex of ``compiled``.  Returns `None` if converting the captured
+        values shows that the entry does not match the format after all (i.e.,
+        if a loosely-matched IP address is invalid).
+        """
+        if self.lazy:
+            return _LazyLogEntry(entry, self, compiled, m)
+        build = self._build if compiled is self._compiled else self._bytes_build
+        try:
+            if build is not None:
+                return build(entry, m)
+            return self._convert_match(entry, compiled, m)
+        except InvalidAddressError:
+            return None
+
+    def _convert_match(self, entry, compiled, m):
+        """
+        Construct the `LogEntry` for ``entry`` from its match ``m`` against the
+        regex of ``compiled`` without a generated function
+        """
+        groups = [conv(gr) for (_, _, conv), gr in zip(compiled.group_defs, m.groups())]
         if self.encoding != "bytes":
             groups = [
                 (
@@ -74,14 +843,27 @@ class LogParser:
                 )
                 for gr in groups
             ]
+        if self.slots:
+            return self._entry_class(entry, groups)
         return LogEntry(
             entry,
             self.format,
-            [gdef[:2] for gdef in self._group_defs],
+            compiled.group_names,
             groups,
+            time_assemblers=compiled.time_assemblers,
         )
 
-    def parse_lines(self, entries, ignore_invalid=False):
+    def _convert(self, converter, value):
+        """
+        Convert the text ``value`` captured by a group of the format's regex
+        with the group's ``converter``
+        """
+        value = converter(value)
+        if isinstance(value, bytes) and self.encoding != "bytes":
+            value = value.decode(self.encoding, self.errors or "strict")
+        return value
+
+    def parse_lines(self, entries, ignore_invalid=False, filters=None):
         r"""
         Parse the elements in an iterable of access log entries (e.g., an open
         text file handle) and return a generator of `LogEntry`\s.  If
@@ -89,13 +871,37 @@ class LogParser:
         format will be silently discarded; otherwise, such an entry will cause
         an `InvalidEntryError` to be raised.
 
-        :param entries: an iterable of `str`
+        .. versionchanged:: 0.7.0
+
+            ``filters`` argument added
+
+        :param entries: an iterable of `str` or `bytes`
         :param bool ignore_invalid: whether to silently discard entries that do
             not match the log format
+        :param filters: an iterable of `Filter`\s (e.g., `Range` or
+            `TimeRange`); if given, only the entries that pass all of the
+            filters are yielded.  The filters are evaluated against each
+            entry's captured text before the entry is converted, and so
+            entries that are filtered out are never converted.  Entries that
+            do not match the log format are handled according to
+            ``ignore_invalid`` regardless of the filters.
         :rtype: `LogEntry` generator
         :raises InvalidEntryError: if an element of ``entries`` does not match
             the log format and ``ignore_invalid`` is `False`
+        :raises ValueError: if a filter tests a field that is not produced by
+            the log format
         """
+        if filters is None:
+            return self._parse_lines(entries, ignore_invalid)
+        filters = list(filters)
+        # Mapping from `id()`s of `_CompiledFormat`s (one for `str` entries,
+        # one for `bytes` entries) to the compiled filters.  Those for `str`
+        # entries are compiled up front so that bad fields are reported at
+        # once.
+        tests = {id(self._compiled): [f.compile(self, self._compiled) for f in filters]}
+        return self._filter_lines(entries, ignore_invalid, filters, tests)
+
+    def _parse_lines(self, entries, ignore_invalid):
         for e in entries:
             try:
                 yield self.parse(e)
@@ -103,8 +909,309 @@ class LogParser:
                 if not ignore_invalid:
                     raise
 
+    def _filter_lines(self, entries, ignore_invalid, filters, tests):
+        for e in entries:
+            e, compiled, m = self._match(e)
+            log_entry = None
+            if m:
+                try:
+                    ctests = tests[id(compiled)]
+                except KeyError:
+                    ctests = tests[id(compiled)] = [
+                        f.compile(self, compiled) for f in filters
+                    ]
+                try:
+                    if not all(t(m) for t in ctests):
+                        continue
+                except InvalidAddressError:
+                    pass
+                else:
+                    log_entry = self._entry_from_match(e, compiled, m)
+            if log_entry is not None:
+                yield log_entry
+            elif not ignore_invalid:
+                raise InvalidEntryError(e, self.format)
+
+    def parse_columns(
+        self,
+        entries,
+        fields=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        int_null=-1,
+        encode=None,
+        shared_dictionaries=False,
+    ):
+        r"""
+        .. versionadded:: 0.7.0
+
+        Parse an iterable of access log entries into columns of values and
+        return a generator of `ColumnBatch`\s, each covering ``batch_size``
+        consecutive elements of ``entries`` (except possibly the last).
+        Entries that do not match the log format are skipped and counted in
+        the batch's ``rejected`` attribute.
+
+        No `LogEntry` objects are created, and only the groups needed for the
+        requested fields are converted, making this faster than
+        `parse_lines()` for analytics that work on columns.
+
+        :param entries: an iterable of `str` or `bytes`
+        :param fields: the names of the fields to produce columns for, as
+            described for `ColumnBatch`; a top-level `dict` attribute name
+            (e.g., ``"headers_in"``) selects all of its keys.  Defaults to all
+            attributes, with ``request_time`` (and its variants, if present)
+            in place of ``request_time_fields``.
+        :param int batch_size: the number of elements of ``entries`` per batch
+        :param int int_null: the value to store for missing values in integer
+            columns
+        :param encode: the names of fields (given the same way as in
+            ``fields``) to dictionary-encode, storing each as a column of
+            integer codes plus a table of its distinct values in the batch's
+            ``dictionaries`` attribute.  This suits fields with few distinct
+            values that repeat heavily, like ``request_method``,
+            ``virtual_host``, or ``("headers_in", "User-Agent")``, as the codes
+            can be grouped & counted without hashing the values again.
+        :param bool shared_dictionaries: If true, the tables of values for
+            encoded fields are shared by all of the batches, so that a code
+            means the same value throughout ``entries``; if false (the
+            default), each batch has its own tables.
+        :rtype: `ColumnBatch` generator
+        :raises ValueError: if a field in ``fields`` or ``encode`` is not
+            produced by the log format, or if a field in ``encode`` is not
+            among the columns or is an integer or ``request_time`` field
+        """
+        return iter_column_batches(
+            self,
+            entries,
+            fields,
+            batch_size,
+            int_null,
+            encode=encode or (),
+            shared_dictionaries=shared_dictionaries,
+        )
+
+    def parse_file_parallel(
+        self,
+        path,
+        workers=None,
+        ordered=True,
+        ignore_invalid=False,
+        chunk_size=None,
+    ):
+        r"""
+        .. versionadded:: 0.7.0
+
+        Parse the access log file at ``path`` using a pool of ``workers``
+        processes (default: the number of CPUs) and return a generator of
+        `LogEntry`\s.  The file is divided at newlines into byte ranges of
+        about ``chunk_size`` bytes (default: 4 MiB), and each range is read in
+        binary mode and parsed by a worker with a `LogParser` configured the
+        same as this one; as a result, each entry's ``entry`` attribute is
+        `bytes` (see `parse()`).
+
+        If ``ordered`` is true (the default), the entries are yielded in the
+        same order as they appear in the file; otherwise, the entries for
+        each range are yielded as soon as the range has been parsed, which
+        keeps the workers busier.
+
+        :param path: the path to an access log file
+        :param int workers: the number of worker processes to use
+        :param bool ordered: whether to yield entries in file order
+        :param bool ignore_invalid: whether to silently discard entries that do
+            not match the log format
+        :param int chunk_size: the approximate number of bytes for each worker
+            to parse at a time
+        :rtype: `LogEntry` generator
+        :raises ValueError: if ``chunk_size`` is not positive
+        :raises InvalidEntryError: if an entry in the file does not match the
+            log format and ``ignore_invalid`` is `False`.  The exception's
+            ``offset`` attribute is set to the byte offset of the entry in the
+            file, and all entries before it are yielded before it is raised
+            (if ``ordered`` is true).
+        """
+        # Imported here to avoid a circular import:
+        from .parallel import parse_file_parallel
+
+        return parse_file_parallel(
+            self,
+            path,
+            workers=workers,
+            ordered=ordered,
+            ignore_invalid=ignore_invalid,
+            chunk_size=chunk_size,
+        )
+
+    def parse_mmap(self, path, ignore_invalid=False):
+        r"""
+        .. versionadded:: 0.7.0
+
+        Parse the access log file at ``path`` by memory-mapping it and locating
+        the line boundaries directly in the mapping, and return a generator of
+        `LogEntry`\s.  This avoids the overhead of reading the file through a
+        text-mode file object and of decoding every line to a `str`.  As with
+        passing `bytes` to `parse()`, each entry's ``entry`` attribute is
+        `bytes`.
+
+        The file is mapped for as long as the generator is being iterated over,
+        and so it must not be truncated in the meantime.
+
+        :param path: the path to an access log file
+        :param bool ignore_invalid: whether to silently discard entries that do
+            not match the log format
+        :rtype: `LogEntry` generator
+        :raises InvalidEntryError: if an entry in the file does not match the
+            log format and ``ignore_invalid`` is `False`.  The exception's
+            ``offset`` attribute is set to the byte offset of the entry in the
+            file.
+        """
+        compiled = self._binary()
+        with open(path, "rb") as fp:
+            try:
+                buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                if os.fstat(fp.fileno()).st_size == 0:
+                    return
+                raise
+        with buf:
+            size = len(buf)
+            fullmatch = compiled.regex.fullmatch
+            pos = 0
+            while pos < size:
+                nl = buf.find(b"\n", pos)
+                nextpos = size if nl == -1 else nl + 1
+                # Every parsed entry keeps its line as its ``entry`` attribute,
+                # so the slice is needed anyway; matching against it is as
+                # fast as matching against the mapping with `pos`/`endpos`.
+                entry = buf[pos:nextpos].rstrip(b"\r\n")
+                m = fullmatch(entry)
+                log_entry = m and self._entry_from_match(entry, compiled, m)
+                if log_entry is not None:
+                    yield log_entry
+                elif not ignore_invalid:
+                    raise InvalidEntryError(entry, self.format, pos)
+                pos = nextpos
+
+    def parse_time_range(
+        self,
+        path,
+        start=None,
+        end=None,
+        slack=None,
+        field="request_time",
+        ignore_invalid=False,
+        index=None,
+    ):
+        r"""
+        .. versionadded:: 0.7.0
+
+        Return a generator of the `LogEntry`\s in the access log file at
+        ``path`` whose ``request_time`` (or the given variant of it, e.g.,
+        ``"begin_request_time"``) is greater than or equal to ``start`` and
+        less than ``end``, without reading the whole file.  Either bound may be
+        `None` to leave that side of the range open.  The bounds are compared
+        with entries' times as for `TimeRange`.  As with passing `bytes` to
+        `parse()`, each entry's ``entry`` attribute is `bytes`.
+
+        The entries in the file are assumed to be in order of time.  The file
+        is binary-searched by byte offset for the first entry at or after
+        ``start - slack``, converting only the date & time directives of each
+        line examined, and then read sequentially until an entry at or after
+        ``end + slack``.  Apache logs each request when it finishes but
+        timestamps it with the time that it started, so a log's timestamps
+        can be out of order by as much as the longest request takes; set
+        ``slack`` to a `datetime.timedelta` (or, if the parser has an
+        ``epoch`` unit, an `int`) of at least that much so that such entries
+        are not missed.  Entries whose time is `None` are skipped.
+
+        If a `TimeIndex` of the file is passed as ``index``, the offset at
+        which to start reading is instead looked up in the index.
+
+        :param path: the path to an access log file
+        :param start: the start of the range of times
+        :param end: the end of the range of times
+        :param slack: how far out of order the entries in the file may be
+        :param str field: the ``request_time`` attribute to select entries by
+        :param bool ignore_invalid: whether to silently discard entries that do
+            not match the log format
+        :param TimeIndex index: an index of the times of the file's entries
+        :rtype: `LogEntry` generator
+        :raises ValueError: if ``field`` is not produced by the log format or
+            is not the field that ``index`` is for, or if ``index`` is for a
+            different file
+        :raises StaleIndexError: if the file has changed since ``index`` was
+            built
+        :raises InvalidEntryError: if an entry read sequentially does not match
+            the log format and ``ignore_invalid`` is `False`.  The exception's
+            ``offset`` attribute is set to the byte offset of the entry in the
+            file.  (Invalid lines examined during the binary search are always
+            skipped.)
+        """
+        return parse_time_range(
+            self,
+            path,
+            start=start,
+            end=end,
+            slack=slack,
+            field=field,
+            ignore_invalid=ignore_invalid,
+            index=index,
+        )
+
+    def build_time_index(
+        self,
+        path,
+        index_path=None,
+        interval=DEFAULT_INDEX_INTERVAL,
+        field="request_time",
+    ):
+        """
+        .. versionadded:: 0.7.0
+
+        Build a `TimeIndex` of the access log file at ``path``, sampling the
+        ``request_time`` (or the given variant of it) of the first entry in
+        each block of ``interval`` lines, and save it to ``index_path``
+        (default: ``path`` plus ``".timeidx"``).  Only the sampled entries are
+        parsed (skipping lines that do not match the log format or have no
+        time), and only their date & time directives are captured & converted.
+
+        The index can later be read back with `TimeIndex.load()` and passed to
+        `parse_time_range()`, as long as the log file has not changed in the
+        meantime.
+
+        :param path: the path to an access log file
+        :param index_path: the path at which to save the index
+        :param int interval: the number of lines in each block of the index
+        :param str field: the ``request_time`` attribute to index
+        :rtype: TimeIndex
+        :raises ValueError: if ``field`` is not produced by the log format or
+            ``interval`` is not from 1 to 2**32 - 1
+        """
+        return build_time_index(
+            self, path, index_path=index_path, interval=interval, field=field
+        )
+
+
+class _BaseLogEntry:
+    """
+    Base class of `LogEntry` and of the classes generated for ``slots=True``
+    (which cannot be subclasses of `LogEntry`, as they would then have an
+    instance ``__dict__``).  Subclasses must define `_attributes()`.
+    """
+
+    __slots__ = ()
+
+    def _attributes(self):
+        """Return a `dict` of the entry's attributes"""
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        if isinstance(other, _BaseLogEntry):
+            return self._attributes() == other._attributes()
+        else:
+            return NotImplemented
+
 
-class LogEntry:
+class LogEntry(_BaseLogEntry):
     """
     A parsed Apache access log entry.  The value associated with each directive
     in the log format is stored as an attribute on the `LogEntry` object; for
@@ -120,10 +1227,19 @@ class LogEntry:
     The values of date & time directives are stored in a ``request_time_fields:
     dict`` attribute.  If this `dict` contains enough information to assemble a
     complete (possibly naïve) `datetime.datetime`, then the `LogEntry` will
-    have a ``request_time`` attribute equal to that `datetime.datetime`.
+    have a ``request_time`` attribute equal to that `datetime.datetime` (or,
+    if the `LogParser` was constructed with an ``epoch`` unit, to the number
+    of such units since the epoch).
     """
 
-    def __init__(self, entry, format, group_names, groups):  # noqa: A002
+    def __init__(
+        self,
+        entry,
+        format,  # noqa: A002
+        group_names,
+        groups,
+        time_assemblers=None,
+    ):
         #: The original logfile entry with trailing newlines removed
         self.entry = entry
         #: The entry's log format string
@@ -140,6 +1256,8 @@ class LogEntry:
         #: named attributes.
         self.directives = {}
         for (k, drct), v in zip(group_names, groups):
+            # This is `_store()` inlined, as this loop runs for every group of
+            # every entry
             d = self.__dict__
             if isinstance(k, tuple):
                 for i, k2 in enumerate(k[:-1]):
@@ -153,18 +1271,237 @@ class LogEntry:
                 d[k] = v
             # else: Assume d[k] == v
             self.directives[drct] = v
-        for prefix in ("original_", "", "final_"):
-            for midfix in ("begin_", "", "end_"):
-                target = prefix + midfix + "request_time"
-                if getattr(self, target + "_fields", None):
-                    setattr(
-                        self,
-                        target,
-                        assemble_datetime(getattr(self, target + "_fields")),
-                    )
+        if time_assemblers is None:
+            time_assemblers = dict.fromkeys(REQUEST_TIME_ATTRS, assemble_datetime)
+        for target, assemble in time_assemblers.items():
+            if getattr(self, target + "_fields", None):
+                setattr(self, target, assemble(getattr(self, target + "_fields")))
 
-    def __eq__(self, other):
-        if isinstance(other, LogEntry):
-            return vars(self) == vars(other)
+    def _attributes(self):
+        return vars(self)
+
+
+class _LazyLogEntry(LogEntry):
+    """
+    A `LogEntry` produced by a ``lazy`` `LogParser`.  The entry holds on to the
+    regex match for the log entry, and each attribute is converted, stored in
+    the instance ``__dict__``, and returned the first time it is looked up.
+    """
+
+    # Storing the lazy state in slots keeps it out of `vars()`
+    __slots__ = ("_parser", "_compiled", "_match", "_values")
+
+    def __init__(self, entry, parser, compiled, match):
+        self.entry = entry
+        self.format = parser.format
+        self._parser = parser
+        self._compiled = compiled
+        self._match = match
+        self._values = {}
+
+    def _value(self, i):
+        """Return the converted value of group ``i``"""
+        try:
+            return self._values[i]
+        except KeyError:
+            v = self._values[i] = self._parser._convert(
+                self._compiled.group_defs[i][2], self._match.group(i + 1)
+            )
+            return v
+
+    def __getattr__(self, name):
+        # `__getattr__` is only called for attributes that have not been
+        # computed yet.  Private & special names are never computed, which also
+        # guards against infinite recursion when the slots are unset (e.g.,
+        # during unpickling).
+        if name.startswith("_") or getattr(self, "_match", None) is None:
+            raise AttributeError(name)
+        compiled = self._compiled
+        if name == "directives":
+            value = {
+                drct: self._value(i) for i, (_, drct) in enumerate(compiled.group_names)
+            }
+        elif name in compiled.attr_groups:
+            d = {}
+            for i in compiled.attr_groups[name]:
+                _store(d, compiled.group_names[i][0], self._value(i))
+            value = d[name]
+        elif name in compiled.time_attrs:
+            value = compiled.time_assemblers[name](getattr(self, name + "_fields"))
         else:
-            return NotImplemented
+            raise AttributeError(name)
+        self.__dict__[name] = value
+        return value
+
+    def _attributes(self):
+        if getattr(self, "_match", None) is not None:
+            compiled = self._compiled
+            for name in ["directives", *compiled.attr_groups, *compiled.time_attrs]:
+                getattr(self, name)
+            # Everything has been converted, so the match is no longer needed.
+            self._match = self._parser = self._compiled = self._values = None
+        return vars(self)
+
+    def __getstate__(self):
+        return self._attributes()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._match = self._parser = self._compiled = self._values = None
+
+
+class _SlottedLogEntry(_BaseLogEntry):
+    """
+    Base class for the log entry classes with ``__slots__`` generated for
+    each log format by `_slotted_entry_class()`.  The value of each directive
+    is stored in a slot: either the slot for the attribute, if the directive
+    is the only one stored in a top-level attribute, or else a private slot
+    from which the attribute is computed on access.
+    """
+
+    __slots__ = ()
+
+    #: The log format string; set on each generated class
+    format = None
+    #: The ``fields`` of the `LogParser` that the class was generated for
+    _fields = None
+    #: The ``epoch`` of the `LogParser` that the class was generated for
+    _epoch = None
+    #: A `dict` mapping each element of ``_time_attrs`` to the function for
+    #: assembling it
+    _time_assemblers = {}
+    #: The ``(name, directive)`` pairs for the format's groups
+    _group_names = ()
+    #: The name of the slot in which the value of each group is stored
+    _group_slots = ()
+    #: The names of the top-level attributes produced by the format (not
+    #: including the `REQUEST_TIME_ATTRS`)
+    _attr_names = ()
+    #: The elements of `REQUEST_TIME_ATTRS` that entries in the format have
+    _time_attrs = ()
+
+    def __init__(self, entry, groups):
+        self.entry = entry
+        for slot, v in zip(self._group_slots, groups):
+            setattr(self, slot, v)
+        for target, assemble in self._time_assemblers.items():
+            setattr(self, target, assemble(getattr(self, target + "_fields")))
+
+    @property
+    def directives(self):
+        return {
+            drct: getattr(self, slot)
+            for (_, drct), slot in zip(self._group_names, self._group_slots)
+        }
+
+    def _attributes(self):
+        attrs = {
+            "entry": self.entry,
+            "format": self.format,
+            "directives": self.directives,
+        }
+        for name in (*self._attr_names, *self._time_attrs):
+            attrs[name] = getattr(self, name)
+        return attrs
+
+    def __reduce__(self):
+        # The generated classes can't be found by name, so pickle the entry as
+        # a call that regenerates (or looks up) the class.
+        return (
+            _make_slotted_entry,
+            (
+                self.format,
+                self.entry,
+                [getattr(self, slot) for slot in self._group_slots],
+                self._fields,
+                self._epoch,
+            ),
+        )
+
+
+def _slotted_entry_class(format, compiled=None, fields=None, epoch=None):  # noqa: A002
+    """
+    Return the `_SlottedLogEntry` subclass for the given log format, selection
+    of fields, & epoch unit, creating it if it is not already cached.
+    ``compiled`` is the format's `_CompiledFormat`, if available.
+    """
+
+    def make():
+        if compiled is not None:
+            cf = compiled
+        else:
+            cf = _CompiledFormat.compile(format, fields=fields, epoch=epoch)
+        slots = ["entry"]
+        group_slots = []
+        namespace = {}
+        for name, indices in cf.attr_groups.items():
+            if len(indices) == 1 and not isinstance(
+                cf.group_names[indices[0]][0], tuple
+            ):
+                slots.append(name)
+                group_slots.append((indices[0], name))
+            else:
+                for i in indices:
+                    slots.append(f"_g{i}")
+                    group_slots.append((i, f"_g{i}"))
+                namespace[name] = _attribute_view(
+                    name,
+                    [cf.group_names[i][0] for i in indices],
+                    [f"_g{i}" for i in indices],
+                )
+        slots.extend(cf.time_attrs)
+        namespace.update(
+            __slots__=tuple(slots),
+            __module__=__name__,
+            format=format,
+            _fields=fields,
+            _epoch=epoch,
+            _time_assemblers=cf.time_assemblers,
+            _group_names=tuple(cf.group_names),
+            _group_slots=tuple(slot for _, slot in sorted(group_slots)),
+            _attr_names=tuple(cf.attr_groups),
+            _time_attrs=tuple(cf.time_attrs),
+        )
+        return type("SlottedLogEntry", (_SlottedLogEntry,), namespace)
+
+    return _entry_class_cache.get((format, fields, epoch), make)
+
+
+def _attribute_view(name, group_names, slots):
+    """
+    Return a `property` that assembles the top-level attribute ``name`` of a
+    `_SlottedLogEntry` from the values of the groups with the given names
+    stored in the given slots
+    """
+
+    def getter(self):
+        d = {}
+        for k, slot in zip(group_names, slots):
+            _store(d, k, getattr(self, slot))
+        return d[name]
+
+    return property(getter)
+
+
+def _make_slotted_entry(format, entry, groups, fields=None, epoch=None):  # noqa: A002
+    """Unpickle a `_SlottedLogEntry`"""
+    return _slotted_entry_class(format, fields=fields, epoch=epoch)(entry, groups)
+
+
+def _store(d, k, v):
+    """
+    Store the directive value ``v`` in the `dict` ``d`` under the name (if a
+    `str`) or path (if a `tuple` of `str`) ``k``, unless a non-`None` value is
+    already stored there
+    """
+    if isinstance(k, tuple):
+        for i, k2 in enumerate(k[:-1]):
+            if i == 0 and k2 in NOCASEDICTS:
+                subd = dicti()
+            else:
+                subd = {}
+            d = d.setdefault(k2, subd)
+        k = k[-1]
+    if d.get(k) is None:
+        d[k] = v
+    # else: Assume d[k] == v
@@ -0,0 +1,121 @@
+"""
+Finding the entries for a range of times in a time-ordered log file
+
+.. versionadded:: 0.7.0
+"""
+
+import os
+from .errors import InvalidEntryError, StaleIndexError
+from .filters import _time_getter
+from .timeindex import time_to_usec
+
+
+def find_time_offset(parser, fp, target, field="request_time"):
+    """
+    Binary-search the log file ``fp`` (opened in binary mode) for the first
+    entry whose ``field`` time is greater than or equal to ``target`` and
+    return the byte offset of the start of its line, or the size of the file
+    if there is no such entry.  The times of the entries in the file are
+    assumed to be nondecreasing; lines that do not match the log format or
+    whose time is `None` are skipped over.  For each line examined, only the
+    date & time directives are converted.
+
+    :param LogParser parser: the parser for the log file's entries
+    :raises ValueError: if ``field`` is not produced by the log format
+    """
+    compiled = parser._binary()
+    get_time = _time_getter(parser, compiled, field)
+
+    def first_time(pos):
+        """
+        Return the time & end offset of the first line starting at or after
+        ``pos`` that has a time, or `None` if there is no such line
+        """
+        if pos > 0:
+            # Skip the rest of the line containing byte ``pos - 1``; if `pos`
+            # is the start of a line, this just reads the preceding newline.
+            fp.seek(pos - 1)
+            fp.readline()
+        else:
+            fp.seek(0)
+        while line := fp.readline():
+            m = compiled.regex.fullmatch(line.rstrip(b"\r\n"))
+            if m and (t := get_time(m)) is not None:
+                return (t, fp.tell())
+        return None
+
+    # Invariant: All entries with times that start before `lo` are before
+    # `target`, and the first entry with a time that starts at or after `hi` is
+    # not (or there is none).  `lo` is always the start of a line.
+    lo = 0
+    hi = fp.seek(0, os.SEEK_END)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        found = first_time(mid)
+        if found is None or found[0] >= target:
+            hi = mid
+        else:
+            lo = found[1]
+    return lo
+
+
+def parse_time_range(
+    parser,
+    path,
+    start=None,
+    end=None,
+    slack=None,
+    field="request_time",
+    ignore_invalid=False,
+    index=None,
+):
+    """Implementation of `LogParser.parse_time_range()`"""
+    # Check the arguments now rather than when the generator is first
+    # advanced:
+    _time_getter(parser, parser._binary(), field)
+    if index is not None:
+        if index.field != field:
+            raise ValueError(f"Time index is for field {index.field!r}, not {field!r}")
+        if not index.is_current():
+            raise StaleIndexError(index.path)
+        if not os.path.samefile(index.path, path):
+            raise ValueError(
+                f"Time index is for log file {str(index.path)!r}, not {str(path)!r}"
+            )
+    return _iter_time_range(
+        parser, path, start, end, slack, field, ignore_invalid, index
+    )
+
+
+def _iter_time_range(parser, path, start, end, slack, field, ignore_invalid, index):
+    compiled = parser._binary()
+    get_time = _time_getter(parser, compiled, field)
+    if slack is not None:
+        first = None if start is None else start - slack
+        stop = None if end is None else end + slack
+    else:
+        first, stop = start, end
+    with open(path, "rb") as fp:
+        if first is None:
+            pos = 0
+        elif index is not None:
+            pos = index.find_offset(time_to_usec(first, parser.epoch))
+        else:
+            pos = find_time_offset(parser, fp, first, field)
+        fp.seek(pos)
+        for line in fp:
+            entry = line.rstrip(b"\r\n")
+            m = compiled.regex.fullmatch(entry)
+            if not m:
+                if not ignore_invalid:
+                    raise InvalidEntryError(entry, parser.format, pos)
+            elif (t := get_time(m)) is not None:
+                if stop is not None and t >= stop:
+                    return
+                if (start is None or start <= t) and (end is None or t < end):
+                    log_entry = parser._entry_from_match(entry, compiled, m)
+                    if log_entry is not None:
+                        yield log_entry
+                    elif not ignore_invalid:
+                        raise InvalidEntryError(entry, parser.format, pos)
+            pos += len(line)
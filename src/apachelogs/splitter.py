@@ -0,0 +1,585 @@
+"""
+Matching log entries by splitting them on the literal text of their log format
+
+.. versionadded:: 0.7.0
+"""
+
+import re
+from .util import clf_string, clf_word, esc_string, esc_word, remote_user
+
+#: The regexes of the field types for strings with escape sequences (which
+#: match as few characters as possible) mapped to regexes that match the same
+#: strings without any ambiguity, so that they can be matched as many
+#: characters at a time without backtracking
+_LINEAR = {
+    esc_string.regex: r"[ !\x23-\x5B\x5D-\x7E]*(?:\\.[ !\x23-\x5B\x5D-\x7E]*)*",
+    esc_word.regex: r"[!\x23-\x5B\x5D-\x7E]*(?:\\.[!\x23-\x5B\x5D-\x7E]*)*",
+}
+
+#: The regexes of the field types that match as few characters as possible.
+#: When such a field is followed by a literal, the regex for the log format
+#: ends the field at the first occurrence of the literal at which the field &
+#: the rest of the entry match.
+_SHORTEST = {
+    ftype.regex for ftype in (esc_string, esc_word, clf_string, clf_word, remote_user)
+}
+
+#: Strings matched by the field types in `_SHORTEST` that are not matched by
+#: the `_LINEAR` equivalents of the string types within them (the ``-`` of
+#: `clf` types being matched by both)
+_EXTRA = {remote_user.regex: ('""',)}
+
+#: The minimum length of the entries that a `GuardedRegex` checks with its
+#: `LinearCheck` before matching them with the regex; the time taken by the
+#: regex to reject shorter entries is negligible even when it is quadratic in
+#: their length
+GUARD_LENGTH = 1024
+
+#: The separator between the fields when validating them with a single regex;
+#: entries containing it are matched with the regex for the whole format
+_SEP = "\x00"
+
+
+class SplitMatcher:
+    r"""
+    A drop-in replacement for the compiled regex of a log format that matches
+    entries by splitting them at the literal text between the format's
+    directives in a single left-to-right scan, taking each directive's text to
+    end at the first occurrence of the literal after it, and then checking the
+    directives' texts against their regexes all at once.  This is only done
+    for formats in which the first occurrence is always where the regex for
+    the whole format would end the directive (see `split_matcher()`).  If the
+    texts do not match (e.g., because a directive's text contains the literal
+    after it), the entry is matched with the regex for the whole format
+    instead, unless its `LinearCheck` shows that the entry cannot match.
+
+    Unlike the lazy quantifiers in the regex for the whole format, the scan
+    does not have to retry the rest of the format after each character of a
+    long string field (e.g., a ``User-Agent`` header), and the directives are
+    checked with regexes that cannot backtrack.
+    """
+
+    def __init__(self, regex, lead, steps, trail, validator, check):
+        #: The compiled regex for the whole format
+        self.regex = regex
+        #: The literal at the start of the format
+        self.lead = lead
+        #: A list of ``(search, keep)`` pairs, one for each directive (or run
+        #: of adjacent directives) other than the last.  The directive's text
+        #: ends at the first occurrence of ``search``, plus the first ``keep``
+        #: characters of ``search`` (a literal at the end of the directive's
+        #: regex).
+        self.steps = steps
+        #: The literal at the end of the format
+        self.trail = trail
+        #: The compiled regex that the directives' texts joined with `_SEP`
+        #: must match.  It has the same groups as `regex`.
+        self.validator = validator
+        #: The `LinearCheck` for the format, used before falling back to
+        #: `regex`
+        self.check = check
+        if isinstance(lead, bytes):
+            self._sep = _SEP.encode("iso-8859-1")
+        else:
+            self._sep = _SEP
+
+    @property
+    def pattern(self):
+        """The pattern of the regex for the whole format"""
+        return self.regex.pattern
+
+    @property
+    def groups(self):
+        """The number of capturing groups in the regex for the whole format"""
+        return self.regex.groups
+
+    def fullmatch(self, entry):
+        """
+        Match ``entry`` against the log format, returning a match object whose
+        groups are the same as those from `regex` or `None` if there is no
+        match
+        """
+        if not entry.startswith(self.lead):
+            return None
+        if self._sep in entry:
+            return self._fallback(entry)
+        pos = len(self.lead)
+        parts = []
+        find = entry.find
+        for search, keep in self.steps:
+            i = find(search, pos)
+            if i < 0:
+                # As the directives' texts can only end later in a match by
+                # the regex, the literals can't all be found in it either.
+                return None
+            parts.append(entry[pos : i + keep])
+            pos = i + len(search)
+        end = len(entry) - len(self.trail)
+        if end < pos or not entry.endswith(self.trail):
+            return None
+        parts.append(entry[pos:end])
+        m = self.validator.fullmatch(self._sep.join(parts))
+        if m is None:
+            m = self._fallback(entry)
+        return m
+
+    def _fallback(self, entry):
+        """Match ``entry`` with `regex` if `check` allows it"""
+        if not self.check.possible(entry):
+            return None
+        return self.regex.fullmatch(entry)
+
+
+class GuardedRegex:
+    """
+    A drop-in replacement for the compiled regex of a log format in which a
+    string directive may contain the literal after it (e.g., ``%v``, which
+    may contain the colon after it in `VHOST_COMBINED`).  The regex for such a
+    format tries each occurrence of the literal as the end of the directive,
+    matching the rest of the format from each one, and so may take time
+    quadratic in the length of an entry to reject it.  Entries of at least
+    `GUARD_LENGTH` characters are therefore first checked with a `LinearCheck`
+    and only matched with the regex if they pass.
+    """
+
+    def __init__(self, regex, check):
+        #: The compiled regex for the whole format
+        self.regex = regex
+        #: The `LinearCheck` for the format
+        self.check = check
+
+    @property
+    def pattern(self):
+        """The pattern of the regex for the whole format"""
+        return self.regex.pattern
+
+    @property
+    def groups(self):
+        """The number of capturing groups in the regex for the whole format"""
+        return self.regex.groups
+
+    def fullmatch(self, entry):
+        """
+        Match ``entry`` against the log format, returning a match object or
+        `None` if there is no match
+        """
+        if len(entry) >= GUARD_LENGTH and not self.check.possible(entry):
+            return None
+        return self.regex.fullmatch(entry)
+
+
+class LinearCheck:
+    """
+    A test of whether an entry could match a log format that takes time
+    linear in the length of the entry (for each directive), used to reject
+    entries that the regex for the format would take a long time to reject.
+
+    The test follows the set of all of the positions in the entry at which
+    each directive (or run of adjacent directives) could start, given where
+    the ones before it could have ended.  A directive that cannot contain the
+    literal after it can only end at the first occurrence of the literal,
+    where its text is checked against its regex.  A string directive that may
+    contain the literal can end at any occurrence of it before the first
+    character that the directive cannot contain, which is found with the
+    directive's `_LINEAR` regex once for each run of such positions.  (Whether
+    such an occurrence would split an escape sequence is not checked, so the
+    test may pass entries that do not match, but never the reverse.)
+    """
+
+    def __init__(self, lead, slots, trail):
+        #: The literal at the start of the format
+        self.lead = lead
+        #: A list of ``(search, keep, regex, string, extra)`` tuples, one for
+        #: each directive (or run of adjacent directives), where:
+        #:
+        #: - ``search`` and ``keep`` are as for `SplitMatcher.steps` (`None` and
+        #:   0 for the last directive)
+        #: - ``regex`` is the compiled regex for the directive's text
+        #: - ``string`` is true if the directive is a string field type in
+        #:   `_SHORTEST`, in which case ``regex`` is its `_LINEAR` form
+        #: - ``extra`` is a tuple of the `_EXTRA` strings for the directive
+        self.slots = slots
+        #: The literal at the end of the format
+        self.trail = trail
+        self._backslash = b"\\" if isinstance(lead, bytes) else "\\"
+
+    def possible(self, entry):
+        """Return `False` if ``entry`` cannot match the log format"""
+        if not entry.startswith(self.lead) or not entry.endswith(self.trail):
+            return False
+        end = len(entry) - len(self.trail)
+        if end < len(self.lead):
+            return False
+        starts = [len(self.lead)]
+        for search, keep, regex, string, extra in self.slots:
+            if search is None:
+                return self._can_end(entry, starts, end, regex, string, extra)
+            ends = []
+            if string:
+                # `reach` is the furthest that the directive can extend from
+                # any of the starts at or before the current occurrence
+                reach = -1
+                i = 0
+                o = entry.find(search, starts[0])
+                while 0 <= o and o + len(search) <= end:
+                    while i < len(starts) and starts[i] <= o:
+                        p = starts[i]
+                        i += 1
+                        reach = self._reach(entry, p, reach, regex)
+                        for x in extra:
+                            e = p + len(x) + len(search)
+                            if e <= end and entry.startswith(x + search, p):
+                                ends.append(e)
+                    if o <= reach:
+                        ends.append(o + len(search))
+                    elif i == len(starts):
+                        # No later occurrence can be reached either
+                        break
+                    o = entry.find(search, o + 1)
+                ends = sorted(set(ends))
+            else:
+                o = -1
+                for p in starts:
+                    if o < p:
+                        o = entry.find(search, p)
+                        if o < 0 or o + len(search) > end:
+                            break
+                    if regex.fullmatch(entry, p, o + keep) and (
+                        not ends or ends[-1] != o + len(search)
+                    ):
+                        ends.append(o + len(search))
+            if not ends:
+                return False
+            starts = ends
+        # Not reached, as the last directive has no `search`
+        return True  # pragma: no cover
+
+    def _can_end(self, entry, starts, end, regex, string, extra):
+        """
+        Return whether the last directive can start at one of ``starts`` and
+        end at ``end``
+        """
+        reach = -1
+        for p in starts:
+            if p > end:
+                break
+            if string:
+                reach = self._reach(entry, p, reach, regex)
+                if end <= reach or any(
+                    end - p == len(x) and entry.startswith(x, p) for x in extra
+                ):
+                    return True
+            elif regex.fullmatch(entry, p, end):
+                return True
+        return False
+
+    def _reach(self, entry, p, reach, regex):
+        """
+        Return the furthest that a string directive with the `_LINEAR` regex
+        ``regex`` can extend from ``p`` or from the earlier starts from which
+        it can extend up to ``reach``
+        """
+        # A start within the text matched from an earlier start is at the
+        # boundary of an escape sequence in that text (and so the match from it
+        # ends at the same place) unless it follows a backslash.
+        if p > reach or entry[p - 1 : p] == self._backslash:
+            reach = max(reach, regex.match(entry, p).end())
+        return reach
+
+
+def split_matcher(rgx, regex, encoding=None):
+    """
+    Return a `SplitMatcher` for the regex string ``rgx`` produced by
+    `format2regex()`, whose compiled form is ``regex``, or `None` if entries
+    cannot be split on the format's literals.  If ``encoding`` is not `None`,
+    the matcher is for `bytes` entries, ``regex`` is the `bytes` form of
+    ``rgx``, and the literals are encoded with ``encoding``.
+
+    Splitting is possible if ``rgx`` consists only of literals and groups, and
+    each group (or run of adjacent groups) followed by a literal either cannot
+    match the literal's first character (apart from in a literal at the end
+    of the group) or is a string field type that matches as few characters as
+    possible.
+    """
+    plan = _split(rgx, encoding)
+    if plan is None:
+        return None
+    lead, steps, trail, validator, check, _ = plan
+    return SplitMatcher(regex, lead, steps, trail, validator, check)
+
+
+def guarded_regex(rgx, regex, encoding=None):
+    """
+    Return a `GuardedRegex` for the regex string ``rgx`` produced by
+    `format2regex()`, whose compiled form is ``regex``, or `None` if the
+    format has no string directive that may contain the literal after it or
+    cannot be split on its literals (see `split_matcher()`).  ``encoding`` is
+    as for `split_matcher()`.
+    """
+    plan = _split(rgx, encoding)
+    if plan is None or not plan[-1]:
+        return None
+    return GuardedRegex(regex, plan[-2])
+
+
+def _split(rgx, encoding):
+    """
+    Split the regex string ``rgx`` as for `split_matcher()` and return a tuple
+    of the lead, steps, trail, and compiled validator for a `SplitMatcher`,
+    the `LinearCheck` for the format, and whether any directive may contain
+    the literal after it, or return `None` if the format cannot be split
+    """
+    items = _top_level(rgx)
+    if items is None:
+        return None
+    # Combine the items into alternating literals & runs of groups
+    literals = [""]
+    slots = []
+    for kind, text in items:
+        if kind == "literal":
+            literals[-1] += text
+        elif len(literals) > len(slots):
+            slots.append([text])
+            literals.append("")
+        else:
+            slots[-1].append(text)
+    if not slots:
+        return None
+    steps = []
+    patterns = []
+    strings = []
+    extras = []
+    ambiguous = False
+    for i, groups in enumerate(slots):
+        following = literals[i + 1]
+        if len(groups) == 1:
+            body, tail = _split_tail(groups[0])
+            patterns.append(_linearize(groups[0]))
+        else:
+            body, tail = "".join(map(_inner, groups)), ""
+            patterns.append("".join(groups))
+        string = not tail and body in _SHORTEST
+        strings.append(string)
+        extras.append(_EXTRA.get(body, ()) if string else ())
+        if i == len(slots) - 1:
+            break
+        if not following:
+            # Can't happen, as adjacent groups are combined
+            return None  # pragma: no cover
+        search = tail + following
+        c = search[0]
+        if _may_match(body, c):
+            if not string:
+                return None
+            ambiguous = True
+        steps.append((search, len(tail)))
+    validator = r"\x00".join(patterns)
+    lead = literals[0]
+    trail = literals[-1]
+    if encoding is not None:
+        from .parser import _bytes_regex
+
+        def encode(s):
+            return s.encode(encoding)
+
+        lead = encode(lead)
+        trail = encode(trail)
+        steps = [(encode(s), len(encode(s[:keep]))) for s, keep in steps]
+        validator = _bytes_regex(validator, encoding)
+        patterns = [_bytes_regex(p, encoding) for p in patterns]
+        extras = [tuple(map(encode, x)) for x in extras]
+    check = LinearCheck(
+        lead,
+        [
+            (search, keep, re.compile(pattern), string, extra)
+            for (search, keep), pattern, string, extra in zip(
+                [*steps, (None, 0)], patterns, strings, extras
+            )
+        ],
+        trail,
+    )
+    return (lead, steps, trail, re.compile(validator), check, ambiguous)
+
+
+def _top_level(rgx):
+    """
+    Split the regex string ``rgx`` into a list of ``("literal", char)`` and
+    ``("group", text)`` pairs for its top-level literal characters & groups,
+    or return `None` if it contains anything else at the top level
+    """
+    items = []
+    i = 0
+    while i < len(rgx):
+        c = rgx[i]
+        if c == "\\":
+            nxt = rgx[i + 1 : i + 2]
+            if not nxt or nxt.isalnum():
+                return None
+            items.append(("literal", nxt))
+            i += 2
+        elif c == "(":
+            j = _group_end(rgx, i)
+            if j is None:
+                return None
+            items.append(("group", rgx[i:j]))
+            i = j
+        elif c in ".^$|)[]*+?{}":
+            return None
+        else:
+            items.append(("literal", c))
+            i += 1
+        if rgx[i : i + 1] in ("*", "+", "?", "{"):
+            # A quantified literal or group
+            return None
+    return items
+
+
+def _group_end(rgx, i):
+    """
+    Return the index just past the end of the group that starts at index ``i``
+    of the regex string ``rgx``
+    """
+    depth = 0
+    while i < len(rgx):
+        c = rgx[i]
+        if c == "\\":
+            i += 2
+            continue
+        elif c == "[":
+            i = _class_end(rgx, i)
+            continue
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return None
+
+
+def _class_end(rgx, i):
+    """
+    Return the index just past the end of the character class that starts at
+    index ``i`` of the regex string ``rgx``
+    """
+    j = i + 1
+    if rgx[j : j + 1] == "^":
+        j += 1
+    # A "]" right after the "[" (or "[^") is a literal.
+    if rgx[j : j + 1] == "]":
+        j += 1
+    while j < len(rgx) and rgx[j] != "]":
+        j += 2 if rgx[j] == "\\" else 1
+    return j + 1
+
+
+def _inner(group):
+    """Return the regex string inside a group's parentheses"""
+    if group.startswith("(?:"):
+        return group[3:-1]
+    else:
+        return group[1:-1]
+
+
+def _split_tail(group):
+    """
+    Split the regex string inside the group ``group`` into the regex for
+    everything but the literal characters at its end and those characters.
+    If the regex has alternatives at its top level, the characters are empty.
+    """
+    inner = _inner(group)
+    items = []
+    i = 0
+    while i < len(inner):
+        c = inner[i]
+        if c == "\\":
+            j = i + 2
+            nxt = inner[i + 1 : i + 2]
+            items.append((i, j, None if nxt.isalnum() else nxt))
+        elif c == "(":
+            j = _group_end(inner, i) or len(inner)
+            items.append((i, j, None))
+        elif c == "[":
+            j = _class_end(inner, i)
+            items.append((i, j, None))
+        elif c == "|":
+            return (inner, "")
+        elif c in "*+?":
+            j = i + 1
+            items[-1:] = [(items[-1][0] if items else i, j, None)]
+        elif c == "{":
+            j = inner.index("}", i) + 1
+            items[-1:] = [(items[-1][0] if items else i, j, None)]
+        elif c in ".^$":
+            j = i + 1
+            items.append((i, j, None))
+        else:
+            j = i + 1
+            items.append((i, j, c))
+        i = j
+    tail = ""
+    while items and items[-1][2] is not None:
+        tail = items.pop()[2] + tail
+    body = inner[: items[-1][1]] if items else ""
+    return (body, tail)
+
+
+def _may_match(rgx, c):
+    """
+    Return whether the regex string ``rgx`` could possibly match a string
+    containing the character ``c``.  False positives are possible, as the
+    structure of ``rgx`` is ignored and only the characters, escapes, and
+    classes in it are considered.
+    """
+    if not c.isascii():
+        # `bytes` regexes match the characters' encodings byte by byte
+        return True
+    i = 0
+    while i < len(rgx):
+        ch = rgx[i]
+        if ch == "\\":
+            nxt = rgx[i + 1 : i + 2]
+            if nxt == "x":
+                atom = rgx[i : i + 4]
+            elif nxt in "dDsSwW":
+                atom = rgx[i : i + 2]
+            elif nxt.isalnum():
+                return True
+            else:
+                atom = rgx[i : i + 2]
+            i += len(atom)
+        elif ch == "[":
+            j = _class_end(rgx, i)
+            atom = rgx[i:j]
+            i = j
+        elif ch == "(":
+            if rgx[i + 1 : i + 3] == "?:":
+                i += 3
+            elif rgx[i + 1 : i + 2] == "?":
+                return True
+            else:
+                i += 1
+            continue
+        elif ch == "{":
+            i = rgx.index("}", i) + 1
+            continue
+        elif ch in ")|*+?^$":
+            i += 1
+            continue
+        else:
+            atom = re.escape(ch) if ch != "." else ch
+            i += 1
+        if re.fullmatch(atom, c):
+            return True
+    return False
+
+
+def _linearize(group):
+    """
+    Replace the regexes for string field types in the regex string ``group``
+    (for a single group) with their unambiguous equivalents from `_LINEAR`
+    """
+    for rgx, linear in _LINEAR.items():
+        group = group.replace(rgx, linear)
+    return group
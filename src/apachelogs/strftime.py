@@ -3,10 +3,10 @@
 # Apache implements `%{*}t` via `apr_strftime()`, which just calls the native
 # platform's `strftime()`.
 
-from datetime import datetime
+from datetime import date, time
 import re
-from .timeutil import parse_apache_timestamp
-from .util import FieldType, integer
+from .timeutil import _timezone, parse_apache_timestamp
+from .util import FieldType, int_converter, integer
 
 YEAR = r"[0-9]{4,}"
 MONTH = r"(?:0[1-9]|1[012])"
@@ -26,12 +26,58 @@ word = FieldType(r"\w+", lambda s: s)
 word0 = FieldType(r"\w*", lambda s: s)
 
 
+@int_converter
 def none_int(s):
     return None if s is None else int(s)
 
 
 none_integer = integer._replace(converter=none_int)
 
+# The converters for `%D`, `%F`, `%R`, `%T`, and `%z` take their values apart
+# by position rather than with `datetime.strptime()`, which is far slower.
+# They accept & reject the same strings that `strptime()` would (given that the
+# strings have already matched the directives' regexes).
+
+
+def convert_mdy_date(s):
+    if not s:
+        return s
+    yy = int(s[-2:])
+    return date(yy + (2000 if yy < 69 else 1900), int(s[:2]), int(s[3:5]))
+
+
+def convert_ymd_date(s):
+    # The regex allows years of more than four digits, but `strptime()` (and
+    # `date`) doesn't.
+    if not s:
+        return s
+    if len(s) != 10:
+        raise ValueError(s)
+    return date(int(s[:4]), int(s[5:7]), int(s[8:]))
+
+
+def convert_hour_min(s):
+    # `strptime()` rejects the space-padded hours & minutes that the regex
+    # allows.
+    if not s:
+        return s
+    if " " in s:
+        raise ValueError(s)
+    return time(int(s[:2]), int(s[3:5]))
+
+
+def convert_time(s):
+    if not s:
+        return s
+    if " " in s:
+        raise ValueError(s)
+    return time(int(s[:2]), int(s[3:5]), int(s[6:8]))
+
+
+def convert_tzoffset(s):
+    return _timezone(s) if s else None
+
+
 STRFTIME_DIRECTIVES = {
     "%": (None, FieldType("%", None)),
     "a": ("abbrev_wday", word),
@@ -44,7 +90,7 @@ STRFTIME_DIRECTIVES = {
         "date",
         FieldType(
             f"{MONTH}/{MDAY}/[0-9][0-9]",
-            lambda s: s and datetime.strptime(s, "%m/%d/%y").date(),
+            convert_mdy_date,
         ),
     ),
     "e": ("mday", FieldType(MDAY, none_int)),
@@ -52,7 +98,7 @@ STRFTIME_DIRECTIVES = {
         "date",
         FieldType(
             f"{YEAR}-{MONTH}-{MDAY}",
-            lambda s: s and datetime.strptime(s, "%Y-%m-%d").date(),
+            convert_ymd_date,
         ),
     ),
     "g": ("abbrev_iso_year", FieldType(r"[0-9][0-9]", none_int)),
@@ -78,7 +124,7 @@ STRFTIME_DIRECTIVES = {
         "hour_min",
         FieldType(
             f"{HOUR}:{MINUTE}",
-            lambda s: s and datetime.strptime(s, "%H:%M").time(),
+            convert_hour_min,
         ),
     ),
     "s": ("epoch", none_integer),
@@ -88,7 +134,7 @@ STRFTIME_DIRECTIVES = {
         "time",
         FieldType(
             f"{HOUR}:{MINUTE}:{SECOND}",
-            lambda s: s and datetime.strptime(s, "%H:%M:%S").time(),
+            convert_time,
         ),
     ),
     "u": ("iso_wday", FieldType(r"[1-7]", none_int)),
@@ -102,7 +148,7 @@ STRFTIME_DIRECTIVES = {
         "timezone",
         FieldType(
             r"(?:[-+](?:[01][0-9]|2[0-3])[0-5][0-9])?",
-            lambda s: datetime.strptime(s, "%z").tzinfo if s else None,
+            convert_tzoffset,
         ),
     ),
     "Z": ("tzname", word0),
@@ -113,8 +159,17 @@ STRFTIME_DIRECTIVES = {
     #    'E*', 'O*': No.
 }
 
+#: `FieldType` instance for an Apache timestamp in square brackets (directive
+#: ``%t``).  The regex accepts the same texts as `parse_apache_timestamp()`
+#: does rather than anything in brackets, as the latter can begin at every
+#: ``[`` in a string field before it and then run to the end of the entry,
+#: making rejecting an entry take time quadratic in its length.
+apache_timestamp = FieldType(
+    r"\[\d\d/\w\w\w/\d{4,}:\d\d:\d\d:\d\d\s*[-+]\d\d\d\d\]", parse_apache_timestamp
+)
+
 SPECIAL_PARAMETERS = {
-    "": ("timestamp", FieldType(r"\[[^]]+\]", parse_apache_timestamp)),
+    "": ("timestamp", apache_timestamp),
     "sec": ("epoch", none_integer),
     "msec": ("milliepoch", none_integer),
     "usec": ("microepoch", none_integer),
@@ -0,0 +1,243 @@
+"""
+Sidecar indices of the times of the entries in log files
+
+.. versionadded:: 0.7.0
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import accumulate
+import os
+import struct
+import sys
+import tempfile
+import attr
+from .errors import StaleIndexError
+from .filters import _time_getter
+from .timeutil import EPOCH_UNITS, _datetime_to_epoch
+
+#: The default number of lines in each block of a `TimeIndex`
+DEFAULT_INDEX_INTERVAL = 1000
+
+#: The suffix appended to the path of a log file to get the default path of its
+#: index file
+INDEX_SUFFIX = ".timeidx"
+
+#: The magic number at the start of an index file, followed by the log file's
+#: size & modification time (in nanoseconds), the interval, the number of
+#: samples, and the length of the UTF-8 encoding of the field name.  This is
+#: followed by the field name and then by the arrays of the samples' offsets &
+#: times as little-endian signed 64-bit integers.
+_MAGIC = b"APLGTI01"
+_HEADER = struct.Struct("<8sQqIQH")
+
+
+@attr.s(eq=False)
+class TimeIndex:
+    """
+    .. versionadded:: 0.7.0
+
+    A sparse index of the times of the entries in a log file, as built by
+    `LogParser.build_time_index()` and read by `TimeIndex.load()`.  For the
+    first entry with a time in each block of ``interval`` lines, the index
+    records the entry's byte offset & time.  Passing the index to
+    `LogParser.parse_time_range()` lets it start reading the file within a
+    block of the start of a range of times instead of searching the file for
+    it.
+
+    Times are stored as integer microseconds since the epoch (with naïve times
+    treated as local time, as by `datetime.datetime.timestamp()`).
+    """
+
+    #: The path to the indexed log file
+    path = attr.ib()
+    #: The size of the log file when it was indexed
+    size = attr.ib()
+    #: The modification time of the log file when it was indexed, in
+    #: nanoseconds
+    mtime_ns = attr.ib()
+    #: The ``request_time`` attribute (or variant) that was indexed
+    field = attr.ib()
+    #: The number of lines in each block
+    interval = attr.ib()
+    #: An `array.array` of the byte offsets of the sampled entries
+    offsets = attr.ib(repr=False)
+    #: An `array.array` of the times of the sampled entries
+    times = attr.ib(repr=False)
+
+    def __attrs_post_init__(self):
+        # The latest time of each sample and all samples before it, which is
+        # nondecreasing (and so can be bisected) even if the entries are
+        # slightly out of order
+        self._max_before = list(accumulate(self.times, max))
+
+    def is_current(self):
+        """
+        Return whether the log file still has the same size & modification time
+        as when it was indexed
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    def find_offset(self, target):
+        """
+        Return the byte offset of the last sampled entry that (along with all
+        sampled entries before it) is before ``target`` (given in microseconds
+        since the epoch), or 0 if there is no such entry.  If the entries in
+        the file are in order of time, no entry before the offset is at or
+        after ``target``.
+        """
+        i = bisect_left(self._max_before, target)
+        return self.offsets[i - 1] if i > 0 else 0
+
+    def save(self, index_path=None):
+        """
+        Write the index to ``index_path`` (default: the log file's path plus
+        `INDEX_SUFFIX`)
+        """
+        if index_path is None:
+            index_path = os.fspath(self.path) + INDEX_SUFFIX
+        field = self.field.encode("utf-8")
+        # The index is written to a temporary file that then replaces any
+        # existing index, so that readers never see a partially-written file.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.fspath(index_path)) or None,
+            prefix=os.path.basename(os.fspath(index_path)) + ".",
+            suffix=".tmp",
+        )
+        try:
+            with open(fd, "wb") as fp:
+                fp.write(
+                    _HEADER.pack(
+                        _MAGIC,
+                        self.size,
+                        self.mtime_ns,
+                        self.interval,
+                        len(self.offsets),
+                        len(field),
+                    )
+                )
+                fp.write(field)
+                for arr in (self.offsets, self.times):
+                    fp.write(_little_endian(arr).tobytes())
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, index_path=None):
+        """
+        Read the index of the log file at ``path`` from ``index_path``
+        (default: the log file's path plus `INDEX_SUFFIX`)
+
+        :raises ValueError: if ``index_path`` is not an index file or is
+            truncated
+        :raises StaleIndexError: if the log file has changed since the index
+            was built
+        """
+        if index_path is None:
+            index_path = os.fspath(path) + INDEX_SUFFIX
+        with open(index_path, "rb") as fp:
+            data = fp.read()
+        try:
+            magic, size, mtime_ns, interval, count, flen = _HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC:
+            raise ValueError(f"Not a time index file: {os.fspath(index_path)!r}")
+        pos = _HEADER.size
+        if len(data) != pos + flen + 2 * 8 * count:
+            raise ValueError(f"Corrupt time index file: {os.fspath(index_path)!r}")
+        field = data[pos : pos + flen].decode("utf-8")
+        pos += flen
+        arrays = []
+        for _ in range(2):
+            arr = array("q")
+            arr.frombytes(data[pos : pos + 8 * count])
+            arrays.append(_little_endian(arr))
+            pos += 8 * count
+        index = cls(path, size, mtime_ns, field, interval, *arrays)
+        if not index.is_current():
+            raise StaleIndexError(path)
+        return index
+
+
+def _little_endian(arr):
+    """
+    Return the `array.array` ``arr`` in little-endian byte order, converting
+    between that and native order (an involution)
+    """
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def build_time_index(
+    parser, path, index_path=None, interval=DEFAULT_INDEX_INTERVAL, field="request_time"
+):
+    """Implementation of `LogParser.build_time_index()`"""
+    if not 1 <= interval < 2**32:
+        raise ValueError(f"Invalid time index interval: {interval!r}")
+    # A parser that only captures & converts the date & time directives and
+    # assembles times as microseconds
+    tparser = attr.evolve(
+        parser,
+        fields=[field],
+        epoch="usec",
+        lazy=False,
+        slots=False,
+        intern_fields=None,
+    )
+    compiled = tparser._binary()
+    get_time = _time_getter(tparser, compiled, field)
+    st = os.stat(path)
+    offsets = array("q")
+    times = array("q")
+    with open(path, "rb") as fp:
+        pos = 0
+        sampled = True
+        for i, line in enumerate(fp):
+            if i % interval == 0:
+                sampled = False
+            if not sampled:
+                # Only the lines until the first one with a time in each block
+                # are parsed.
+                m = compiled.regex.fullmatch(line.rstrip(b"\r\n"))
+                if m and (t := get_time(m)) is not None:
+                    offsets.append(pos)
+                    times.append(t)
+                    sampled = True
+            pos += len(line)
+    index = TimeIndex(
+        path=path,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        field=field,
+        interval=interval,
+        offsets=offsets,
+        times=times,
+    )
+    index.save(index_path)
+    return index
+
+
+def time_to_usec(t, epoch=None):
+    """
+    Convert a time as used by a `LogParser` with the given ``epoch`` unit (a
+    `datetime.datetime`, or an `int` count of ``epoch`` units) to microseconds
+    since the epoch.  `None` is returned unchanged.
+    """
+    if t is None:
+        return None
+    elif isinstance(t, datetime):
+        return _datetime_to_epoch(t, 1000000)
+    elif epoch is None:
+        raise TypeError(f"Time must be a datetime, got {t!r}")
+    else:
+        return t * (1000000 // EPOCH_UNITS[epoch])
@@ -1,5 +1,9 @@
 import calendar
-from datetime import date, datetime, timedelta, timezone
+from collections import namedtuple
+from datetime import MAXYEAR, MINYEAR, date, datetime, timedelta, timezone
+from functools import lru_cache, partial
+import locale
+from operator import attrgetter, itemgetter
 import re
 import time
 
@@ -79,35 +83,235 @@ def parse_apache_timestamp(s):
     >>> parse_apache_timestamp('[01/Nov/2017:07:28:29 +0000]')
     datetime.datetime(2017, 11, 1, 7, 28, 29, tzinfo=datetime.timezone.utc)
 
+    .. versionchanged:: 0.7.0
+
+        All timestamps with the same UTC offset now share a single
+        `datetime.timezone` instance.
+
     :param str s: a string of the form ``DD/Mon/YYYY:HH:MM:SS +HHMM``
         (optionally enclosed in square brackets)
     :return: an aware `datetime.datetime`
     :raises ValueError: if ``s`` is not in the expected format
     """
+    if s is None:
+        return None
+    year, month, day, hour, minute, second, offset = _split_apache_timestamp(s)
+    return datetime(year, month, day, hour, minute, second, tzinfo=_timezone(offset))
+
+
+def apache_timestamp_to_epoch(s):
+    """
+    .. versionadded:: 0.7.0
+
+    Parse an Apache timestamp into an integer number of seconds since the
+    epoch without creating a `datetime.datetime`.  The timestamp is subject
+    to the same requirements as for `parse_apache_timestamp()`.
+
+    >>> apache_timestamp_to_epoch('[01/Nov/2017:07:28:29 +0000]')
+    1509521309
+
+    :param str s: a string of the form ``DD/Mon/YYYY:HH:MM:SS +HHMM``
+        (optionally enclosed in square brackets)
+    :rtype: int
+    :raises ValueError: if ``s`` is not in the expected format
+    """
+    if s is None:
+        return None
+    year, month, day, hour, minute, second, offset = _split_apache_timestamp(s)
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(s)
+    return (
+        _days_since_epoch(year, month, day, s) * 86400
+        + hour * 3600
+        + minute * 60
+        + second
+        - _offset_seconds(offset)
+    )
+
+
+def _split_apache_timestamp(s):
+    r"""
+    Split an Apache timestamp into a tuple of its year, month, day, hour,
+    minute, and second as `int`\s plus its UTC offset in ``+HHMM`` form
+
+    :raises ValueError: if ``s`` is not in the expected format
+    """
+    # Fast path for the fixed-width layout that Apache actually writes (with a
+    # four-digit year and a single space before the offset), parsed by
+    # position.  Anything else is left to the regex.
+    o = 1 if s[:1] == "[" else 0
+    if (
+        len(s) == 26 + 2 * o
+        and (not o or s[-1] == "]")
+        and s[o + 2] == s[o + 6] == "/"
+        and s[o + 11] == s[o + 14] == s[o + 17] == ":"
+        and s[o + 20] == " "
+        and s[o + 21] in "+-"
+        and (
+            s[o : o + 2]
+            + s[o + 7 : o + 11]
+            + s[o + 12 : o + 14]
+            + s[o + 15 : o + 17]
+            + s[o + 18 : o + 20]
+            + s[o + 22 : o + 26]
+        ).isdecimal()
+    ):
+        try:
+            month = MONTH_SNAMES[s[o + 3 : o + 6]]
+        except KeyError:
+            raise ValueError(s)
+        return (
+            int(s[o + 7 : o + 11]),
+            month,
+            int(s[o : o + 2]),
+            int(s[o + 12 : o + 14]),
+            int(s[o + 15 : o + 17]),
+            int(s[o + 18 : o + 20]),
+            s[o + 21 : o + 26],
+        )
+    return _split_apache_timestamp_regex(s)
+
+
+def _split_apache_timestamp_regex(s):
+    """
+    Split an Apache timestamp like `_split_apache_timestamp()` using
+    `APACHE_TS_RGX`.  This handles all of the variations accepted by
+    `parse_apache_timestamp()`.
+    """
     # Apache timestamps always use English month abbreviations.  Thus, parsing
     # with strptime like the below will fail when in a locale with different
     # month snames:
     # return datetime.strptime(s.strip('[]'), '%d/%b/%Y:%H:%M:%S %z')
-    if s is None:
-        return None
     m = APACHE_TS_RGX.match(s)
     if not m:
         raise ValueError(s)
-    data = m.groupdict()
-    for k in "year day hour minute second".split():
-        data[k] = int(data[k])
     try:
-        data["month"] = MONTH_SNAMES[data["month"]]
+        month = MONTH_SNAMES[m["month"]]
     except KeyError:
         raise ValueError(s)
-    tzoffset = timedelta(
-        hours=int(data.pop("tzoffset_hour")),
-        minutes=int(data.pop("tzoffset_min")),
+    return (
+        int(m["year"]),
+        month,
+        int(m["day"]),
+        int(m["hour"]),
+        int(m["minute"]),
+        int(m["second"]),
+        m["tzoffset_sign"] + m["tzoffset_hour"] + m["tzoffset_min"],
+    )
+
+
+#: The number of days before the start of each month (1-12) in a non-leap year
+_DAYS_BEFORE_MONTH = [0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+
+#: The number of days in each month (1-12) in a non-leap year
+_DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+#: `datetime.date.toordinal()` of 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+
+def _days_since_epoch(year, month, day, s):
+    """
+    Return the number of days from 1970-01-01 to the given date, raising
+    ``ValueError(s)`` if the date is not one that `datetime.date` accepts
+    """
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if not (
+        MINYEAR <= year <= MAXYEAR
+        and 1 <= month <= 12
+        and 1 <= day <= _DAYS_IN_MONTH[month] + (month == 2 and leap)
+    ):
+        raise ValueError(s)
+    y = year - 1
+    return (
+        y * 365
+        + y // 4
+        - y // 100
+        + y // 400
+        + _DAYS_BEFORE_MONTH[month]
+        + (month > 2 and leap)
+        + day
+        - _EPOCH_ORDINAL
     )
-    if data.pop("tzoffset_sign") == "-":
-        tzoffset *= -1
-    data["tzinfo"] = timezone(tzoffset)
-    return datetime(**data)
+
+
+#: Mapping from UTC offsets in ``+HHMM`` form (with ASCII digits) to the shared
+#: `datetime.timezone` instances for them.  There are at most 20,000 possible
+#: keys.
+_timezones = {}
+
+
+def _timezone(offset):
+    """
+    Return the shared `datetime.timezone` for a UTC offset of the form
+    ``+HHMM`` or ``-HHMM``
+    """
+    try:
+        return _timezones[offset]
+    except KeyError:
+        if not offset.isascii():
+            return _timezone(_ascii_offset(offset))
+        tzoffset = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+        if offset[0] == "-":
+            tzoffset *= -1
+        return _timezones.setdefault(offset, timezone(tzoffset))
+
+
+#: Mapping from UTC offsets in ``+HHMM`` form (with ASCII digits) to their
+#: values in seconds
+_offsets = {}
+
+
+def _offset_seconds(offset):
+    """
+    Return the number of seconds in a UTC offset of the form ``+HHMM`` or
+    ``-HHMM``
+    """
+    try:
+        return _offsets[offset]
+    except KeyError:
+        if not offset.isascii():
+            return _offset_seconds(_ascii_offset(offset))
+        secs = _timezone(offset).utcoffset(None) // timedelta(seconds=1)
+        return _offsets.setdefault(offset, secs)
+
+
+def _ascii_offset(offset):
+    r"""
+    Respell a UTC offset with ASCII digits.  `int()` and ``\d`` accept all
+    Unicode decimal digits, so this keeps the caches of offsets from being
+    keyed by anything other than their 20,000 ASCII spellings.
+    """
+    return f"{offset[0]}{int(offset[1:3]):02d}{int(offset[3:5]):02d}"
+
+
+#: The names of the weekdays & months in the current ``LC_TIME`` locale, as
+#: returned by `_locale_names()`
+LocaleNames = namedtuple(
+    "LocaleNames", "wday_names wday_abbrevs month_names month_abbrevs"
+)
+
+#: Mapping from ``LC_TIME`` locale names to their `LocaleNames`
+_locale_names_cache = {}
+
+
+def _locale_names():
+    """
+    Return the `LocaleNames` for the current ``LC_TIME`` locale.  Computing
+    these (via `calendar`) is slow, so they are computed once per locale and
+    only when an entry contains a weekday or month name that is not in English.
+    """
+    key = locale.setlocale(locale.LC_TIME)
+    try:
+        return _locale_names_cache[key]
+    except KeyError:
+        names = LocaleNames(
+            wday_names={w: i for i, w in enumerate(calendar.day_name, start=1)},
+            wday_abbrevs={w: i for i, w in enumerate(calendar.day_abbr, start=1)},
+            month_names={m: i for i, m in enumerate(calendar.month_name) if i != 0},
+            month_abbrevs={m: i for i, m in enumerate(calendar.month_abbr) if i != 0},
+        )
+        return _locale_names_cache.setdefault(key, names)
 
 
 def assemble_datetime(fields):
@@ -144,9 +348,6 @@ def assemble_datetime(fields):
     elif fields.get("epoch") is not None:
         return datetime.fromtimestamp(fields["epoch"], tz or timezone.utc)
     else:
-        locale_wday_names = {w: i for i, w in enumerate(calendar.day_name, start=1)}
-        locale_wday_abbrevs = {w: i for i, w in enumerate(calendar.day_abbr, start=1)}
-
         if fields.get("iso_wday") is not None:
             iso_wday = fields["iso_wday"]
         elif fields.get("wday") is not None:
@@ -158,9 +359,9 @@ def assemble_datetime(fields):
             iso_wday = WDAY_FULL_NAMES[fields["full_wday"]]
         elif (
             fields.get("full_wday") is not None
-            and fields["full_wday"] in locale_wday_names
+            and fields["full_wday"] in _locale_names().wday_names
         ):
-            iso_wday = locale_wday_names[fields["full_wday"]]
+            iso_wday = _locale_names().wday_names[fields["full_wday"]]
         elif (
             fields.get("abbrev_wday") is not None
             and fields["abbrev_wday"] in WDAY_SNAMES
@@ -168,9 +369,9 @@ def assemble_datetime(fields):
             iso_wday = WDAY_SNAMES[fields["abbrev_wday"]]
         elif (
             fields.get("abbrev_wday") is not None
-            and fields["abbrev_wday"] in locale_wday_abbrevs
+            and fields["abbrev_wday"] in _locale_names().wday_abbrevs
         ):
-            iso_wday = locale_wday_abbrevs[fields["abbrev_wday"]]
+            iso_wday = _locale_names().wday_abbrevs[fields["abbrev_wday"]]
         else:
             iso_wday = None
 
@@ -210,26 +411,15 @@ def assemble_datetime(fields):
         else:
             return None
 
-        locale_month_names = {m: i for i, m in enumerate(calendar.month_name) if i != 0}
-        locale_month_abbrevs = {
-            m: i for i, m in enumerate(calendar.month_abbr) if i != 0
-        }
-
         if thedate is None:
             if fields.get("date") is not None:
                 thedate = fields["date"]
             elif fields.get("yday") is not None:
                 thedate = date(year, 1, 1) + timedelta(days=fields["yday"] - 1)
             elif fields.get("sunday_weeknum") is not None and iso_wday is not None:
-                thedate = datetime.strptime(
-                    f'{year} {fields["sunday_weeknum"]} {iso_wday % 7}',
-                    "%Y %U %w",
-                ).date()
+                thedate = fromweeknum(year, fields["sunday_weeknum"], iso_wday, False)
             elif fields.get("monday_weeknum") is not None and iso_wday is not None:
-                thedate = datetime.strptime(
-                    f'{year} {fields["monday_weeknum"]} {iso_wday % 7}',
-                    "%Y %W %w",
-                ).date()
+                thedate = fromweeknum(year, fields["monday_weeknum"], iso_wday, True)
 
         if fields.get("mon") is not None:
             month = fields["mon"]
@@ -237,12 +427,12 @@ def assemble_datetime(fields):
             month = thedate.month
         elif fields.get("full_mon") in MONTH_FULL_NAMES:
             month = MONTH_FULL_NAMES[fields["full_mon"]]
-        elif fields.get("full_mon") in locale_month_names:
-            month = locale_month_names[fields["full_mon"]]
+        elif fields.get("full_mon") in _locale_names().month_names:
+            month = _locale_names().month_names[fields["full_mon"]]
         elif fields.get("abbrev_mon") in MONTH_SNAMES:
             month = MONTH_SNAMES[fields["abbrev_mon"]]
-        elif fields.get("abbrev_mon") in locale_month_abbrevs:
-            month = locale_month_abbrevs[fields["abbrev_mon"]]
+        elif fields.get("abbrev_mon") in _locale_names().month_abbrevs:
+            month = _locale_names().month_abbrevs[fields["abbrev_mon"]]
         else:
             return None
 
@@ -305,6 +495,193 @@ def assemble_datetime(fields):
         )
 
 
+#: The units in which `assemble_epoch()` can return times, mapped to the
+#: number of units per second
+EPOCH_UNITS = {"sec": 1, "msec": 1000, "usec": 1000000}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_USEC = timedelta(microseconds=1)
+
+
+def assemble_epoch(fields, unit="sec"):
+    """
+    .. versionadded:: 0.7.0
+
+    Like `assemble_datetime()`, but return the time as an integer number of
+    seconds, milliseconds, or microseconds (``unit`` is ``"sec"``,
+    ``"msec"``, or ``"usec"``, respectively) since the epoch, rounded down.
+    The ``epoch``, ``milliepoch``, & ``microepoch`` fields are converted
+    directly, and a ``timestamp`` field that is already an `int` is assumed
+    to be in ``unit``.  Naïve times are treated as local time, as by
+    `datetime.datetime.timestamp()`.
+    """
+    per_sec = EPOCH_UNITS[unit]
+    if fields.get("timestamp") is not None:
+        ts = fields["timestamp"]
+        if isinstance(ts, int):
+            return ts
+        return _datetime_to_epoch(ts, per_sec)
+    elif fields.get("microepoch") is not None:
+        return fields["microepoch"] * per_sec // 1000000
+    elif fields.get("milliepoch") is not None:
+        return fields["milliepoch"] * per_sec // 1000
+    elif fields.get("epoch") is not None:
+        return fields["epoch"] * per_sec
+    dt = assemble_datetime(fields)
+    return None if dt is None else _datetime_to_epoch(dt, per_sec)
+
+
+def _datetime_to_epoch(dt, per_sec):
+    """
+    Convert a `datetime.datetime` to an integer number of ``1/per_sec``-second
+    units since the epoch
+    """
+    if dt.tzinfo is None:
+        usecs = int(dt.replace(microsecond=0).timestamp()) * 1000000 + dt.microsecond
+    else:
+        usecs = (dt - _EPOCH) // _USEC
+    return usecs * per_sec // 1000000
+
+
+#: For each of the year, month, day, hour, minute, and second of a time, the
+#: fields that `assemble_datetime()` can take it from without needing any
+#: other fields, in its order of preference, each paired with a function for
+#: extracting the component from the field's value (`None` if the value is the
+#: component itself)
+_COMPONENT_SOURCES = [
+    [("year", None), ("date", attrgetter("year"))],
+    [
+        ("mon", None),
+        ("date", attrgetter("month")),
+        ("full_mon", lambda m: _month_from_name(m, MONTH_FULL_NAMES, 2)),
+        ("abbrev_mon", lambda m: _month_from_name(m, MONTH_SNAMES, 3)),
+    ],
+    [("mday", None), ("date", attrgetter("day"))],
+    [
+        ("hour", None),
+        ("time", attrgetter("hour")),
+        ("hour_min", attrgetter("hour")),
+    ],
+    [
+        ("min", None),
+        ("time", attrgetter("minute")),
+        ("hour_min", attrgetter("minute")),
+    ],
+    [("sec", None), ("time", attrgetter("second"))],
+]
+
+#: The fields besides ``date`` from which `assemble_datetime()` derives a date
+#: that takes precedence over ``full_mon`` & ``abbrev_mon``
+_DATE_FIELDS = {"yday", "sunday_weeknum", "monday_weeknum"}
+
+
+def _month_from_name(name, english, localized):
+    """
+    Return the number of the month with the given name in English (looked up
+    in ``english``) or in the current locale (looked up in the ``localized``-th
+    element of its `LocaleNames`), or `None` if there is no such month
+    """
+    try:
+        return english[name]
+    except KeyError:
+        return _locale_names()[localized].get(name)
+
+
+def time_assembler(keys, unit=None):
+    r"""
+    .. versionadded:: 0.7.0
+
+    Return a function that assembles a time from a `dict` of time fields with
+    the given keys, like `assemble_datetime()` (or `assemble_epoch()` with the
+    given ``unit``, if not `None`).
+
+    For the common combinations of fields (a ``timestamp``, or a year, month,
+    day, hour, minute, and second possibly with fractional seconds & a UTC
+    offset), the fields to use are chosen once, here, and each time is built
+    directly from them; other combinations, and `dict`\s in which any of the
+    chosen fields is `None`, are passed to `assemble_datetime()`.
+    """
+    keys = frozenset(keys)
+    if unit is not None:
+        if keys & {"timestamp", "microepoch", "milliepoch", "epoch"}:
+            return partial(assemble_epoch, unit=unit)
+        to_datetime = time_assembler(keys)
+        per_sec = EPOCH_UNITS[unit]
+
+        def assemble_as_epoch(fields):
+            dt = to_datetime(fields)
+            return None if dt is None else _datetime_to_epoch(dt, per_sec)
+
+        return assemble_as_epoch
+    if "timestamp" in keys:
+
+        def assemble_timestamp(fields):
+            ts = fields.get("timestamp")
+            return assemble_datetime(fields) if ts is None else ts
+
+        return assemble_timestamp
+    if keys & {"microepoch", "milliepoch", "epoch", "tzname"}:
+        return assemble_datetime
+    sources = []
+    for options in _COMPONENT_SOURCES:
+        for key, func in options:
+            if key in keys:
+                sources.append((key, func))
+                break
+        else:
+            return assemble_datetime
+    if sources[1][0] in ("full_mon", "abbrev_mon") and keys & _DATE_FIELDS:
+        return assemble_datetime
+    ntime = 6
+    if "usec_frac" in keys:
+        sources.append(("usec_frac", None))
+        ntime = 7
+    elif "msec_frac" in keys:
+        sources.append(("msec_frac", lambda ms: ms * 1000))
+        ntime = 7
+    has_tz = "timezone" in keys
+    if has_tz:
+        sources.append(("timezone", None))
+    getter = itemgetter(*(key for key, _ in sources))
+    derived = [(i, func) for i, (_, func) in enumerate(sources) if func is not None]
+
+    if not derived:
+
+        def assemble(fields):
+            try:
+                values = getter(fields)
+            except KeyError:
+                return assemble_datetime(fields)
+            if None in values:
+                return assemble_datetime(fields)
+            return datetime(*values[:ntime], tzinfo=values[ntime] if has_tz else None)
+
+    else:
+
+        def assemble(fields):
+            try:
+                values = getter(fields)
+            except KeyError:
+                return assemble_datetime(fields)
+            values = list(values)
+            for i, func in derived:
+                if values[i] is not None:
+                    values[i] = func(values[i])
+            if None in values:
+                return assemble_datetime(fields)
+            return datetime(*values[:ntime], tzinfo=values[ntime] if has_tz else None)
+
+    return assemble
+
+
+# The following two functions are called for every entry in logs with week-based
+# dates, but their arguments only change once a day, so the results are
+# memoized.  They compute what `datetime.strptime()` (which they replace)
+# computed for the same arguments, including rolling over into the next year
+# for week numbers past the end of the year & only accepting four-digit years.
+
+
+@lru_cache(maxsize=128)
 def fromisocalendar(iso_year, iso_weeknum, iso_wday):
     """
     Convert an ISO year, ISO week number, and ISO weekday to a `datetime.date`.
@@ -315,11 +692,46 @@ def fromisocalendar(iso_year, iso_weeknum, iso_wday):
     >>> fromisocalendar(2004, 1, 7)
     datetime.date(2004, 1, 4)
     """
+    if not 1000 <= iso_year <= 9999:
+        raise ValueError(f"Year must have four digits: {iso_year}")
+    try:
+        return date.fromisocalendar(iso_year, 1, iso_wday) + timedelta(
+            weeks=iso_weeknum - 1
+        )
+    except OverflowError as e:
+        raise ValueError(str(e))
+
 
-    # Python 3.8+:
-    # date.fromisocalendar(iso_year, iso_weeknum, iso_wday)
+@lru_cache(maxsize=128)
+def fromweeknum(year, weeknum, iso_wday, monday_first):
+    """
+    Convert a year, week number, and ISO weekday to a `datetime.date`.  Week
+    number 1 is the week containing the first Monday of the year if
+    ``monday_first`` is true (as for ``%W``) or the first Sunday of the year
+    otherwise (as for ``%U``); any days of the year before that are in week 0.
 
-    return datetime.strptime(
-        f"{iso_year} {iso_weeknum} {iso_wday}",
-        "%G %V %u",
-    ).date()
+    >>> fromweeknum(2019, 0, 2, True)
+    datetime.date(2019, 1, 1)
+    >>> fromweeknum(2019, 1, 1, True)
+    datetime.date(2019, 1, 7)
+    >>> fromweeknum(2019, 1, 7, False)
+    datetime.date(2019, 1, 6)
+    """
+    if not 1000 <= year <= 9999:
+        raise ValueError(f"Year must have four digits: {year}")
+    jan1 = date(year, 1, 1)
+    # Days since the start of the week, for January 1st and for the weekday:
+    if monday_first:
+        jan1_offset = jan1.weekday()
+        wday_offset = iso_wday - 1
+    else:
+        jan1_offset = jan1.isoweekday() % 7
+        wday_offset = iso_wday % 7
+    if weeknum == 0:
+        days = wday_offset - jan1_offset
+    else:
+        days = (7 - jan1_offset) % 7 + 7 * (weeknum - 1) + wday_offset
+    try:
+        return jan1 + timedelta(days=days)
+    except OverflowError as e:
+        raise ValueError(str(e))
@@ -1,5 +1,8 @@
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+import ipaddress
 import re
+import threading
 
 #: `collections.namedtuple` class for describing how to match various types and
 #: how to convert them from strings.  The two attributes are ``regex``, a regex
@@ -8,6 +11,163 @@ import re
 FieldType = namedtuple("FieldType", "regex converter")
 
 
+class CacheInfo(namedtuple("CacheInfo", "hits misses evictions maxsize currsize")):
+    """
+    `collections.namedtuple` class for reporting the statistics of an
+    `LRUCache`.  The attributes are ``hits``, ``misses``, ``evictions``,
+    ``maxsize``, and ``currsize``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """
+        .. versionadded:: 0.7.0
+
+        The fraction of lookups that were hits, or 0 if there have been no
+        lookups
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    A thread-safe mapping from keys to lazily-computed values that holds at
+    most ``maxsize`` entries, discarding the least recently used entry when
+    full.  A ``maxsize`` of `None` makes the cache unbounded.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        """
+        Return the value cached for ``key``.  If there is no such value,
+        compute one by calling ``factory()``, cache it, and return it.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        # Call the factory outside of the lock so that a slow computation
+        # doesn't block lookups of other keys
+        return self.add(key, factory())
+
+    def add(self, key, value):
+        """
+        Cache ``value`` for ``key`` (without counting a lookup) unless a value
+        is already cached for ``key``, and return the cached value
+        """
+        with self._lock:
+            # Another thread may have cached a value in the meantime; prefer it
+            # so that all callers end up sharing the same object.
+            value = self._data.setdefault(key, value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def info(self):
+        """Return a `CacheInfo` describing the cache's current statistics"""
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._data),
+            )
+
+    def clear(self):
+        """Discard all cached values and reset the statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MemoizedConverter:
+    """
+    A wrapper around a converter function that reuses the results for recently
+    converted values.  The most recently converted value is checked first, as
+    log entries written close together often have identical fields (e.g.,
+    timestamps), followed by an `LRUCache` of up to ``maxsize`` others.  Only
+    suitable for converters whose results are immutable.
+    """
+
+    def __init__(self, converter, maxsize=128):
+        self.converter = converter
+        self.maxsize = maxsize
+        self.last_hits = 0
+        # The `LRUCache` is only created once a second distinct value is seen
+        # so that memoization costs next to nothing for parsers that only
+        # parse one entry (e.g., those created by `apachelogs.parse()`).
+        self._cache = None
+        self._first_misses = 0
+        # The most recent value & its result are kept in one tuple so that
+        # other threads never see a mismatched pair.
+        self._last = (_NOTHING, None)
+
+    def __call__(self, value):
+        last_value, last_result = self._last
+        if value == last_value:
+            # Not atomic, but this is only used for statistics
+            self.last_hits += 1
+            return last_result
+        if last_value is _NOTHING:
+            result = self.converter(value)
+            self._first_misses += 1
+        else:
+            if self._cache is None:
+                self._cache = LRUCache(self.maxsize)
+                self._cache.add(last_value, last_result)
+            result = self._cache.get(value, lambda: self.converter(value))
+        self._last = (value, result)
+        return result
+
+    def info(self):
+        """
+        Return a `CacheInfo` describing the memo's statistics, counting repeats
+        of the most recent value as hits
+        """
+        if self._cache is None:
+            info = CacheInfo(0, 0, 0, self.maxsize, 0)
+        else:
+            info = self._cache.info()
+        return info._replace(
+            hits=info.hits + self.last_hits,
+            misses=info.misses + self._first_misses,
+        )
+
+    def clear(self):
+        """Discard all memoized results and reset the statistics"""
+        self._last = (_NOTHING, None)
+        self.last_hits = 0
+        self._first_misses = 0
+        self._cache = None
+
+
+#: Placeholder for the most recent value of a `MemoizedConverter` that has not
+#: converted anything yet
+_NOTHING = object()
+
+
 def clf(ftype):
     """
     Convert a `FieldType` instance to one whose ``regex`` accepts the string
@@ -16,10 +176,79 @@ def clf(ftype):
     :param FieldType ftype:
     :rtype: FieldType
     """
-    return FieldType(
-        regex=rf"(?:{ftype.regex}|-)",
-        converter=lambda s: None if s == "-" else ftype.converter(s),
-    )
+    inner = ftype.converter
+
+    def converter(s):
+        return None if s == "-" else inner(s)
+
+    # Record the wrapped converter so that `bytes_converter()` can derive a
+    # converter for `bytes` input
+    converter.clf_converter = inner
+    return FieldType(regex=rf"(?:{ftype.regex}|-)", converter=converter)
+
+
+def int_converter(func):
+    """
+    Mark the converter function ``func`` as one that converts every captured
+    value it accepts to an `int` (and `None` to `None`), so that
+    `converts_to_int()` knows it, and return it
+
+    .. versionadded:: 0.7.0
+    """
+    func.converts_to_int = True
+    return func
+
+
+def converts_to_int(converter):
+    """
+    Return whether ``converter`` (possibly wrapped by `clf()`,
+    `bytes_converter()`, or a `MemoizedConverter`) is `int` or has been marked
+    with `int_converter()`
+
+    .. versionadded:: 0.7.0
+    """
+    while True:
+        if isinstance(converter, MemoizedConverter):
+            converter = converter.converter
+        elif hasattr(converter, "clf_converter"):
+            converter = converter.clf_converter
+        else:
+            break
+    return converter is int or getattr(converter, "converts_to_int", False)
+
+
+def bytes_converter(converter, encoding="iso-8859-1", errors="strict"):
+    """
+    Given a ``converter`` for captured `str` values, return an equivalent
+    converter for values captured from a `bytes` log entry.  Values that
+    ``converter`` does not know how to handle as `bytes` are decoded with the
+    given ``encoding`` and ``errors`` before being passed to it.
+
+    .. versionadded:: 0.7.0
+    """
+    if converter is unescape:
+        return unescape_bytes
+    elif converter is int:
+        # `int()` accepts `bytes` directly
+        return int
+    elif hasattr(converter, "clf_converter"):
+        inner = bytes_converter(converter.clf_converter, encoding, errors)
+
+        def clf_converter(b):
+            return None if b == b"-" else inner(b)
+
+        clf_converter.clf_converter = inner
+        return clf_converter
+    else:
+
+        def decoding_converter(b):
+            # Groups inside an unmatched alternative (e.g., the subdirectives
+            # of a conditional ``%{*}t`` that matched "-") are `None`.
+            return converter(None if b is None else b.decode(encoding, errors))
+
+        if converts_to_int(converter):
+            int_converter(decoding_converter)
+        return decoding_converter
 
 
 def unescape(s):
@@ -29,9 +258,22 @@ def unescape(s):
     """
     # Escape sequences used by Apache: \b \n \r \t \v \\ \" \xHH
     # cf. ap_escape_logitem() in server/util.c
+    if "\\" not in s:
+        return s.encode("iso-8859-1")
     return re.sub(r"\\(x[0-9A-Fa-f]{2}|.)", _unesc, s).encode("iso-8859-1")
 
 
+def unescape_bytes(b):
+    """
+    Like `unescape()`, but for a `bytes` string
+
+    .. versionadded:: 0.7.0
+    """
+    if b"\\" not in b:
+        return b
+    return re.sub(rb"\\(x[0-9A-Fa-f]{2}|.)", _unesc_bytes, b)
+
+
 _unescapes = {
     "t": "\t",
     "n": "\n",
@@ -45,14 +287,25 @@ _unescapes = {
 
 def _unesc(m):
     esc = m.group(1)
-    if esc[0] == "x":
+    if len(esc) == 3:
         return chr(int(esc[1:], 16))
     else:
         return _unescapes.get(esc, esc)
 
 
+_unescapes_bytes = {k.encode(): v.encode() for k, v in _unescapes.items()}
+
+
+def _unesc_bytes(m):
+    esc = m.group(1)
+    if len(esc) == 3:
+        return bytes([int(esc[1:], 16)])
+    else:
+        return _unescapes_bytes.get(esc, esc)
+
+
 #: Regex matching a base-10 integer from 0 to 255
-BYTE = r"(?:[1-9]?[0-9]|[1-9][0-9][0-9]|2[0-4][0-9]|25[0-5])"
+BYTE = r"(?:[1-9]?[0-9]|1[0-9][0-9]|2[0-4][0-9]|25[0-5])"
 
 #: Regex matching one to four hexadecimal digits
 HEXTET = r"[0-9A-Fa-f]{1,4}"
@@ -78,6 +331,66 @@ IP_ADDRESS_RGX = (
 #: `FieldType` instance for an IP address, either IPv4 or IPv6
 ip_address = FieldType(IP_ADDRESS_RGX, str)
 
+#: Regex for a nonempty string of the characters that can occur in an IP
+#: address, which is much cheaper to match than `IP_ADDRESS_RGX`
+LOOSE_IP_ADDRESS_RGX = r"[0-9A-Fa-f:.]+"
+
+
+class InvalidAddressError(ValueError):
+    """
+    Raised by the converters of `loose_ip_address` and `ip_address_obj` for
+    captured text that is not a valid IP address.  A non-lazy `LogParser`
+    treats an entry containing such an address as not matching the log
+    format.
+
+    .. versionadded:: 0.7.0
+    """
+
+    pass
+
+
+@lru_cache(maxsize=4096)
+def ip_address_object(s):
+    """
+    Convert an IP address string to an `ipaddress.IPv4Address` or
+    `ipaddress.IPv6Address`.  The results for the most recently converted 4096
+    strings are cached, so repeated addresses share one object.
+
+    .. versionadded:: 0.7.0
+
+    :raises InvalidAddressError: if ``s`` is not a valid IP address
+    """
+    try:
+        return ipaddress.ip_address(s)
+    except ValueError as e:
+        raise InvalidAddressError(str(e)) from None
+
+
+def validate_ip_address(s):
+    """
+    Return the string ``s`` if it is a valid IP address (i.e., matches
+    `IP_ADDRESS_RGX`)
+
+    .. versionadded:: 0.7.0
+
+    :raises InvalidAddressError: if ``s`` is not a valid IP address
+    """
+    if _ip_address.fullmatch(s) is None:
+        raise InvalidAddressError(f"Invalid IP address: {s!r}")
+    return s
+
+
+_ip_address = re.compile(IP_ADDRESS_RGX)
+
+
+#: `FieldType` instance for an IP address that is only checked for validity
+#: when it is converted
+loose_ip_address = FieldType(LOOSE_IP_ADDRESS_RGX, validate_ip_address)
+
+#: Like `loose_ip_address`, but converted to an `ipaddress.IPv4Address` or
+#: `ipaddress.IPv6Address`
+ip_address_obj = FieldType(LOOSE_IP_ADDRESS_RGX, ip_address_object)
+
 #: `FieldType` instance for a base-10 integer
 integer = FieldType(r"(?:0|-?[1-9][0-9]*)", int)
 
@@ -96,14 +409,18 @@ esc_string = FieldType(
     # (everything rejected by `apr_isprint` = `isprint`, i.e., control
     # characters plus everything over 0x7F).
     # cf. server/gen_test_char.c
-    r"(?:[ !\x23-\x5B\x5D-\x7E]|\\x[0-9A-Fa-f]{2}|\\.)*?",
+    # An `\xHH` escape sequence is matched as `\\.` followed by two ordinary
+    # characters; giving it an alternative of its own would let it be matched
+    # in two ways, making the regex backtrack exponentially on long runs of
+    # such sequences that fail to match.
+    r"(?:[ !\x23-\x5B\x5D-\x7E]|\\.)*?",
     unescape,
 )
 
 #: Like `esc_string`, but without any whitespace.  (Whitespace escape sequences
 #: are still allowed just because it's easier.)
 esc_word = FieldType(
-    r"(?:[!\x23-\x5B\x5D-\x7E]|\\x[0-9A-Fa-f]{2}|\\.)*?",
+    r"(?:[!\x23-\x5B\x5D-\x7E]|\\.)*?",
     unescape,
 )
 
@@ -125,7 +442,7 @@ remote_user = FieldType(
 
 #: Regex for a single non-space atom in a cookie value; this is the same as an
 #: `esc_word` atom, except semicolons are not matched
-CRUMB = r"(?:[!\x23-\x3A\x3C-\x5B\x5D-\x7E]|\\x[0-9A-Fa-f]{2}|\\.)"
+CRUMB = r"(?:[!\x23-\x3A\x3C-\x5B\x5D-\x7E]|\\.)"
 
 #: `FieldType` instance for a cookie value; like `clf_string`, but with no
 #: leading or trailing spaces and no semicolons
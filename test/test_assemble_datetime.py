@@ -1,6 +1,6 @@
 from datetime import date, datetime, time, timedelta, timezone
 import pytest
-from apachelogs.timeutil import assemble_datetime
+from apachelogs.timeutil import assemble_datetime, fromisocalendar, fromweeknum
 
 w4 = timezone(timedelta(hours=-4))
 
@@ -682,3 +682,37 @@ def test_assemble_datetime(fields, dt):
         assert res == dt
         assert res.replace(tzinfo=None) == dt.replace(tzinfo=None)
         assert res.tzinfo == dt.tzinfo
+
+
+@pytest.mark.parametrize("year", [2016, 2017, 2018, 2019, 2020, 2021, 2022])
+@pytest.mark.parametrize("monday_first,fmt", [(True, "%Y %W %w"), (False, "%Y %U %w")])
+def test_fromweeknum(year, monday_first, fmt):
+    for weeknum in range(54):
+        for iso_wday in range(1, 8):
+            assert (
+                fromweeknum(year, weeknum, iso_wday, monday_first)
+                == datetime.strptime(f"{year} {weeknum} {iso_wday % 7}", fmt).date()
+            )
+
+
+@pytest.mark.parametrize(
+    "args,d",
+    [
+        ((2004, 1, 1), date(2003, 12, 29)),
+        ((2004, 1, 7), date(2004, 1, 4)),
+        ((2020, 53, 7), date(2021, 1, 3)),
+        # Week numbers past the end of the ISO year roll over into the next
+        # one:
+        ((2019, 53, 1), date(2019, 12, 30)),
+    ],
+)
+def test_fromisocalendar(args, d):
+    assert fromisocalendar(*args) == d
+
+
+@pytest.mark.parametrize("year", [999, 10000])
+def test_week_dates_bad_year(year):
+    with pytest.raises(ValueError):
+        fromisocalendar(year, 1, 1)
+    with pytest.raises(ValueError):
+        fromweeknum(year, 1, 1, True)
@@ -0,0 +1,114 @@
+from pydicti import dicti
+import pytest
+from apachelogs import COMBINED, COMMON, VHOST_COMBINED, LogParser
+from apachelogs.codegen import _ascii_compatible
+
+ENTRIES = {
+    COMMON: [
+        '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577',
+        '1.2.3.4 - b\\x6fb [06/May/2019:06:28:21 +0100] "-" 200 -',
+    ],
+    COMBINED: [
+        '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+        ' "Mozilla/5.0 (X11; Linux x86_64)"',
+        '1.2.3.4 - "" [06/May/2019:06:28:21 +0100] "GET /\\xc3\\xa9 HTTP/1.1" 200 -'
+        ' "http://example.com/" "curl/7.58.0 \\"quoted\\""',
+    ],
+    VHOST_COMBINED: [
+        "www.example.com:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000]"
+        ' "GET / HTTP/1.1" 301 577 "-" "curl/7.58.0"',
+    ],
+    "%{%Y-%m-%d %H:%M:%S}t.%{usec_frac}t %{%z}t %a %>s %D": [
+        "2019-05-06 06:28:20.123456 +0200 192.0.2.1 200 1234",
+    ],
+    "%400D %{us}T %<s %>s %{Foo}C %400{%Y}t": [
+        "- 5 200 404 bar -",
+        "3 5 200 404 b\\x61r 2019",
+    ],
+    '%{cookie}i "%{Set-Cookie}o" %{X-Forwarded-For}i %{c}a %l %%': [
+        '- "a=b" 10.0.0.1 10.0.0.2 - %',
+    ],
+}
+
+CASES = [(fmt, e) for fmt, entries in ENTRIES.items() for e in entries]
+
+
+@pytest.mark.parametrize("fmt,entry", CASES)
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize(
+    "opts",
+    [
+        {},
+        {"encoding": "utf-8"},
+        {"encoding": "bytes"},
+        {"encoding": "cp1252", "errors": "replace"},
+        {"slots": True},
+        {"epoch": "usec", "timestamp_cache_size": 0},
+        {"ip_addresses": "objects", "hostname_lookups": False},
+    ],
+)
+def test_matches_generic(fmt, entry, binary, opts):
+    parser = LogParser(fmt, **opts)
+    if binary:
+        entry = entry.encode("utf-8")
+    e = parser.parse(entry)
+    compiled = parser._binary() if binary else parser._compiled
+    generic = parser._convert_match(
+        e.entry, compiled, compiled.regex.fullmatch(e.entry)
+    )
+    assert e == generic
+    assert type(e) is type(generic)
+    assert parser.generated_source(binary) is not None
+    for k, v in vars(generic).items() if not opts.get("slots") else ():
+        assert type(getattr(e, k)) is type(v)
+
+
+def test_generated_source():
+    parser = LogParser(COMBINED)
+    source = parser.generated_source()
+    assert "def build(entry, m):" in source
+    assert "for " not in source
+    assert "'headers_in': dicti({'Referer': v7, 'User-Agent': v8})" in source
+    assert parser.generated_source(binary=True) != source
+    assert LogParser(COMBINED).generated_source() == source
+    assert LogParser(COMBINED, lazy=True).generated_source() is None
+
+
+def test_generated_code_shared():
+    p1 = LogParser(COMBINED)
+    p2 = LogParser(COMBINED)
+    assert p1._build is not p2._build
+    assert p1._build.__code__ is p2._build.__code__
+    # Each parser's own timestamp memo is called:
+    p1.parse(ENTRIES[COMBINED][0])
+    assert p1.timestamp_cache_info().misses == 1
+    assert p2.timestamp_cache_info().misses == 0
+
+
+def test_case_insensitive_duplicate_keys():
+    parser = LogParser("%{Referer}i %{referer}i")
+    assert parser.generated_source() is None
+    e = parser.parse("- http://example.com/")
+    assert e.headers_in == {"Referer": "http://example.com/"}
+    assert isinstance(e.headers_in, dicti)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_interned_fields(binary):
+    parser = LogParser(COMBINED, intern_fields=["%r", ("headers_in", "User-Agent")])
+    entries = [ENTRIES[COMBINED][1]] * 2
+    if binary:
+        entries = [e.encode() for e in entries]
+    e1, e2 = parser.parse_lines(entries)
+    assert e1 == e2
+    assert e1.request_line == "GET /\xc3\xa9 HTTP/1.1"
+    assert e1.request_line is e2.request_line
+    assert e1.headers_in["User-Agent"] is e2.headers_in["User-Agent"]
+
+
+@pytest.mark.parametrize(
+    "encoding,compatible",
+    [("iso-8859-1", True), ("utf-8", True), ("cp1252", True), ("utf-16", False)],
+)
+def test_ascii_compatible(encoding, compatible):
+    assert _ascii_compatible(encoding) is compatible
@@ -0,0 +1,222 @@
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from apachelogs import COMBINED, VHOST_COMBINED, ColumnBatch, LogParser
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+
+def test_parse_columns_all_fields():
+    parser = LogParser(VHOST_COMBINED)
+    with LOG.open() as fp:
+        lines = list(fp)
+    entries = list(parser.parse_lines(lines, ignore_invalid=True))
+    (batch,) = parser.parse_columns(lines)
+    assert isinstance(batch, ColumnBatch)
+    assert batch.size == len(entries) == 6
+    assert batch.rejected == 1
+    assert set(batch) == {
+        "virtual_host",
+        "server_port",
+        "remote_host",
+        "remote_logname",
+        "remote_user",
+        "request_line",
+        "final_status",
+        "bytes_out",
+        ("headers_in", "Referer"),
+        ("headers_in", "User-Agent"),
+        "request_time",
+    }
+    assert batch["final_status"] == array("q", [e.final_status for e in entries])
+    assert batch["bytes_out"] == array("q", [e.bytes_out for e in entries])
+    assert batch["server_port"] == array("q", [80] * 6)
+    assert batch["request_line"] == [e.request_line for e in entries]
+    assert batch["remote_logname"] == [None] * 6
+    assert batch["headers_in", "User-Agent"] == [
+        e.headers_in["User-Agent"] for e in entries
+    ]
+    assert batch["request_time"] == array(
+        "q", [int(e.request_time.timestamp()) for e in entries]
+    )
+
+
+def test_parse_columns_selected_fields():
+    parser = LogParser(COMBINED)
+    lines = [
+        '127.0.0.1 - - [01/Nov/2017:07:28:29 +0000] "GET / HTTP/1.1" 200 - "-" "curl"',
+        "garbage",
+        '127.0.0.1 - - [01/Nov/2017:07:28:30 +0000] "GET / HTTP/1.1" - 42 "-" "-"',
+    ]
+    (batch,) = parser.parse_columns(
+        lines, fields=["final_status", "bytes_sent", "headers_in", "request_time"]
+    )
+    assert dict(batch) == {
+        "final_status": array("q", [200, -1]),
+        "bytes_sent": array("q", [-1, 42]),
+        ("headers_in", "Referer"): [None, None],
+        ("headers_in", "User-Agent"): ["curl", None],
+        "request_time": array(
+            "q",
+            [
+                int(datetime(2017, 11, 1, 7, 28, 29, tzinfo=timezone.utc).timestamp()),
+                int(datetime(2017, 11, 1, 7, 28, 30, tzinfo=timezone.utc).timestamp()),
+            ],
+        ),
+    }
+    assert batch.size == 2
+    assert batch.rejected == 1
+    (batch,) = parser.parse_columns(
+        lines, fields=["final_status", ("headers_in", "User-Agent")], int_null=0
+    )
+    assert dict(batch) == {
+        "final_status": array("q", [200, 0]),
+        ("headers_in", "User-Agent"): ["curl", None],
+    }
+
+
+def test_parse_columns_batches():
+    parser = LogParser("%>s %b")
+    batches = list(
+        parser.parse_columns(["200 1", "404 -", "x", "500 3", b"200 4"], batch_size=2)
+    )
+    assert [(b.size, b.rejected) for b in batches] == [(2, 0), (1, 1), (1, 0)]
+    assert [list(b["final_status"]) for b in batches] == [[200, 404], [500], [200]]
+    assert [list(b["bytes_sent"]) for b in batches] == [[1, -1], [3], [4]]
+
+
+def test_parse_columns_all_rejected():
+    (batch,) = LogParser("%>s %b").parse_columns(["x", "y"])
+    assert dict(batch) == {"final_status": array("q"), "bytes_sent": array("q")}
+    assert batch.size == 0
+    assert batch.rejected == 2
+
+
+def test_parse_columns_first_non_none():
+    (batch,) = LogParser("%200b %b").parse_columns(["- 42", "17 -"])
+    assert batch["bytes_sent"] == array("q", [42, 17])
+
+
+def test_parse_columns_int_overflow():
+    big = 2**63
+    (batch,) = LogParser("%>s %B").parse_columns([f"200 {big}", "200 1"])
+    assert batch["bytes_sent"] == [big, 1]
+    assert batch["final_status"] == array("q", [200, 200])
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_parse_columns_int_kinds(binary):
+    # Integer columns are decided by the field types, even for converters that
+    # are wrapped for interning or for `bytes` entries.
+    parser = LogParser("%>s %400D %{hextid}P %u %{%Y}t", intern_fields=["%>s"])
+    entry = "200 - 7f bob 2019"
+    if binary:
+        entry = entry.encode()
+    (batch,) = parser.parse_columns([entry])
+    assert dict(batch) == {
+        "final_status": array("q", [200]),
+        "request_duration_microseconds": array("q", [-1]),
+        "tid": array("q", [127]),
+        "remote_user": ["bob"],
+        "request_time": batch["request_time"],
+    }
+
+
+def test_parse_columns_time_fields():
+    (batch,) = LogParser("%{%Y-%m-%d}t %{%H:%M:%S %z}t").parse_columns(
+        ["2019-05-06 06:28:20 +0000"], fields=["request_time", "request_time_fields"]
+    )
+    assert dict(batch) == {
+        "request_time": array(
+            "q",
+            [int(datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc).timestamp())],
+        ),
+        ("request_time_fields", "year"): array("q", [2019]),
+        ("request_time_fields", "mon"): array("q", [5]),
+        ("request_time_fields", "mday"): array("q", [6]),
+        ("request_time_fields", "hour"): array("q", [6]),
+        ("request_time_fields", "min"): array("q", [28]),
+        ("request_time_fields", "sec"): array("q", [20]),
+        ("request_time_fields", "timezone"): [timezone.utc],
+    }
+
+
+def test_parse_columns_bad_field():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED).parse_columns([], fields=["virtual_host"])
+    assert str(excinfo.value) == "Field not produced by log format: 'virtual_host'"
+
+
+def test_parse_columns_encode():
+    parser = LogParser(VHOST_COMBINED)
+    with LOG.open() as fp:
+        lines = list(fp)
+    entries = list(parser.parse_lines(lines, ignore_invalid=True))
+    (batch,) = parser.parse_columns(
+        lines, encode=["virtual_host", "headers_in", "remote_logname"]
+    )
+    for name, values in [
+        ("virtual_host", [e.virtual_host for e in entries]),
+        (("headers_in", "User-Agent"), [e.headers_in["User-Agent"] for e in entries]),
+        (("headers_in", "Referer"), [e.headers_in["Referer"] for e in entries]),
+        ("remote_logname", [None] * 6),
+    ]:
+        codes = batch[name]
+        table = batch.dictionaries[name]
+        assert isinstance(codes, array)
+        assert table == list(dict.fromkeys(values))
+        assert [table[c] for c in codes] == values
+    assert batch.dictionaries["remote_logname"] == [None]
+    assert set(batch.dictionaries) == {
+        "virtual_host",
+        "remote_logname",
+        ("headers_in", "Referer"),
+        ("headers_in", "User-Agent"),
+    }
+    assert batch["request_line"] == [e.request_line for e in entries]
+
+
+def test_parse_columns_encode_batches():
+    parser = LogParser("%m %>s")
+    lines = ["GET 200", "POST 200", "GET 404", "HEAD 200", "GET 200", "x"]
+    batches = list(parser.parse_columns(lines, batch_size=2, encode=["request_method"]))
+    assert [list(b["request_method"]) for b in batches] == [[0, 1], [0, 1], [0]]
+    assert [b.dictionaries["request_method"] for b in batches] == [
+        ["GET", "POST"],
+        ["GET", "HEAD"],
+        ["GET"],
+    ]
+    batches = list(
+        parser.parse_columns(
+            lines, batch_size=2, encode=["request_method"], shared_dictionaries=True
+        )
+    )
+    assert [list(b["request_method"]) for b in batches] == [[0, 1], [0, 2], [0]]
+    for b in batches:
+        assert b.dictionaries["request_method"] == ["GET", "POST", "HEAD"]
+
+
+def test_parse_columns_encode_empty():
+    (batch,) = LogParser("%m %>s").parse_columns(["x"], encode=["request_method"])
+    assert batch["request_method"] == array("q")
+    assert batch.dictionaries == {"request_method": []}
+
+
+@pytest.mark.parametrize(
+    "fields,encode,msg",
+    [
+        (None, ["virtual_host"], "Field not produced by log format: 'virtual_host'"),
+        (None, ["final_status"], "Field cannot be dictionary-encoded: 'final_status'"),
+        (None, ["request_time"], "Field cannot be dictionary-encoded: 'request_time'"),
+        (
+            ["final_status"],
+            ["request_line"],
+            "Field cannot be dictionary-encoded: 'request_line'",
+        ),
+    ],
+)
+def test_parse_columns_bad_encode(fields, encode, msg):
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED).parse_columns([], fields=fields, encode=encode)
+    assert str(excinfo.value) == msg
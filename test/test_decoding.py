@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
+from pathlib import Path
 import pytest
-from apachelogs import COMBINED, LogParser
+from apachelogs import COMBINED, VHOST_COMBINED, InvalidEntryError, LogParser
 
 ENTRY = '66.240.205.34 - - [18/Nov/2017:12:30:55 +0000] "Gh0st\\xad" 400 0 "-" "-"'
 
@@ -54,3 +55,74 @@ def test_parse_ip_address(encoding):
         LogParser("%a", encoding=encoding).parse("127.0.0.1").remote_address
         == "127.0.0.1"
     )
+
+
+@pytest.mark.parametrize(
+    "encoding,errors,request_line",
+    [
+        ("iso-8859-1", None, "Gh0st\xad"),
+        ("utf-8", "surrogateescape", "Gh0st\udcad"),
+        ("bytes", None, b"Gh0st\xad"),
+    ],
+)
+def test_parse_bytes_entry(encoding, errors, request_line):
+    parser = LogParser(COMBINED, encoding=encoding, errors=errors)
+    log_entry = parser.parse(ENTRY.encode("ascii") + b"\r\n")
+    assert log_entry.entry == ENTRY.encode("ascii")
+    for k, v in NON_STR_FIELDS.items():
+        assert getattr(log_entry, k) == v
+    assert log_entry.request_line == log_entry.directives["%r"] == request_line
+    assert log_entry == parser.parse(ENTRY.encode("ascii"))
+    assert vars(log_entry) == dict(vars(parser.parse(ENTRY)), entry=log_entry.entry)
+
+
+def test_parse_bytes_non_ascii_format():
+    parser = LogParser("%{%d %b %Y}t → %s", encoding="utf-8")
+    log_entry = parser.parse("19 Mär 2019 → 200".encode("utf-8"))
+    assert log_entry.status == 200
+    assert log_entry.request_time_fields == {
+        "mday": 19,
+        "abbrev_mon": "Mär",
+        "year": 2019,
+    }
+
+
+@pytest.mark.parametrize("encoding", ["iso-8859-1", "bytes", "ascii"])
+def test_parse_bytes_unencodable_format(encoding):
+    parser = LogParser("%s → %b", encoding=encoding)
+    assert parser.parse("200 → 5").bytes_sent == 5
+    with pytest.raises(ValueError) as excinfo:
+        parser.parse(b"200 \xe2\x86\x92 5")
+    assert not isinstance(excinfo.value, UnicodeError)
+    assert str(excinfo.value) == (
+        f"Log format '%s → %b' cannot be encoded in"
+        f" {'ascii' if encoding == 'ascii' else 'iso-8859-1'!r}"
+        " for parsing bytes entries"
+    )
+
+
+def test_parse_bytes_unescaped_value():
+    log_entry = LogParser("%{SSL_PROTOCOL}x|%X", encoding="utf-8").parse(
+        "TLSv1.2 ✓|+".encode("utf-8")
+    )
+    assert log_entry.variables == {"SSL_PROTOCOL": "TLSv1.2 ✓"}
+    assert log_entry.connection_status == "+"
+
+
+def test_parse_bytes_invalid_entry():
+    with pytest.raises(InvalidEntryError) as excinfo:
+        LogParser(COMBINED).parse(b"not a log entry\n")
+    assert excinfo.value.entry == b"not a log entry"
+
+
+def test_parse_lines_binary_file():
+    path = Path(__file__).with_name("data") / "vhost_combined.log"
+    parser = LogParser(VHOST_COMBINED)
+    with path.open("rb") as fp:
+        bentries = list(parser.parse_lines(fp, ignore_invalid=True))
+    with path.open() as fp:
+        entries = list(parser.parse_lines(fp, ignore_invalid=True))
+    assert len(bentries) == len(entries)
+    for be, e in zip(bentries, entries):
+        assert be.entry == e.entry.encode("iso-8859-1")
+        assert be.directives == e.directives
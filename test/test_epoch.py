@@ -0,0 +1,125 @@
+from array import array
+from datetime import datetime, timezone
+import pickle
+import pytest
+from apachelogs import COMBINED, LogParser, TimeRange, parse
+
+ENTRY = (
+    '209.126.136.4 - - [01/Nov/2017:07:28:29 +0000] "GET / HTTP/1.1" 301 521'
+    ' "-" "Mozilla/5.0"'
+)
+
+EPOCH = 1509521309
+
+
+@pytest.mark.parametrize(
+    "unit,value",
+    [
+        ("sec", EPOCH),
+        ("msec", EPOCH * 1000),
+        ("usec", EPOCH * 1000000),
+    ],
+)
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"lazy": True}, {"slots": True}, {"timestamp_cache_size": 0}],
+)
+def test_epoch_timestamp(unit, value, options):
+    parser = LogParser(COMBINED, epoch=unit, **options)
+    for e in [ENTRY, ENTRY.encode("iso-8859-1")]:
+        entry = parser.parse(e)
+        assert entry == LogParser(COMBINED, epoch=unit).parse(e)
+        assert entry.request_time == value
+        assert type(entry.request_time) is int
+        assert entry.request_time_fields == {"timestamp": value}
+        assert entry.directives["%t"] == value
+        assert entry.final_status == 301
+
+
+def test_epoch_matches_datetime():
+    entry = parse(COMBINED, ENTRY)
+    assert LogParser(COMBINED, epoch="sec").parse(ENTRY).request_time == int(
+        entry.request_time.timestamp()
+    )
+
+
+@pytest.mark.parametrize(
+    "fmt,line,value",
+    [
+        ("%{sec}t", "1509521309", 1509521309000),
+        ("%{msec}t", "1509521309123", 1509521309123),
+        ("%{usec}t", "1509521309123456", 1509521309123),
+        (
+            "%{%Y-%m-%d %H:%M:%S %z}t",
+            "2017-11-01 07:28:29 +0000",
+            1509521309000,
+        ),
+        ("%{%s}t", "1509521309", 1509521309000),
+    ],
+)
+def test_epoch_assembled(fmt, line, value):
+    entry = LogParser(fmt, epoch="msec").parse(line)
+    assert entry.request_time == value
+
+
+def test_epoch_begin_end():
+    entry = LogParser("%{begin:sec}t %{end:msec}t", epoch="usec").parse(
+        "1509521309 1509521310500"
+    )
+    assert entry.begin_request_time == 1509521309000000
+    assert entry.end_request_time == 1509521310500000
+
+
+def test_epoch_conditional_timestamp():
+    parser = LogParser("%200t %s", epoch="msec")
+    assert parser.parse("[01/Nov/2017:07:28:29 +0000] 200").request_time == (
+        EPOCH * 1000
+    )
+    entry = parser.parse("- 404")
+    assert entry.request_time_fields == {"timestamp": None}
+    assert entry.request_time is None
+
+
+def test_epoch_naive():
+    entry = LogParser("%{%Y-%m-%d %H:%M:%S}t", epoch="sec").parse("2017-11-01 07:28:29")
+    assert entry.request_time == int(datetime(2017, 11, 1, 7, 28, 29).timestamp())
+
+
+def test_epoch_invalid_unit():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, epoch="hours")
+    assert str(excinfo.value) == "Invalid epoch unit: 'hours'"
+
+
+def test_epoch_separate_cache():
+    p1 = LogParser(COMBINED)
+    p2 = LogParser(COMBINED, epoch="sec")
+    assert p1.parse(ENTRY).request_time == datetime(
+        2017, 11, 1, 7, 28, 29, tzinfo=timezone.utc
+    )
+    assert p2.parse(ENTRY).request_time == EPOCH
+
+
+def test_epoch_slots_pickle():
+    entry = LogParser(COMBINED, slots=True, epoch="usec").parse(ENTRY)
+    entry2 = pickle.loads(pickle.dumps(entry))
+    assert entry2 == entry
+    assert entry2.request_time == EPOCH * 1000000
+
+
+def test_epoch_columns():
+    (batch,) = LogParser(COMBINED, epoch="msec").parse_columns(
+        [ENTRY], fields=["request_time"]
+    )
+    assert batch["request_time"] == array("q", [EPOCH * 1000])
+
+
+def test_epoch_time_range():
+    parser = LogParser(COMBINED, epoch="sec")
+    entries = list(
+        parser.parse_lines(
+            [ENTRY, ENTRY.replace("07:28:29", "07:28:30")],
+            filters=[TimeRange(start=EPOCH + 1)],
+        )
+    )
+    assert [e.request_time for e in entries] == [EPOCH + 1]
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+import pickle
+import re
+import pytest
+from apachelogs import COMBINED, VHOST_COMBINED, LogParser
+from apachelogs.directives import format2regex
+from apachelogs.parser import _uncapture
+
+ENTRY = (
+    'www.varonathe.org:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET /'
+    ' HTTP/1.1" 301 577 "-" "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0)'
+    ' Gecko/20100101 Firefox/58.0"'
+)
+
+UA = "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101 Firefox/58.0"
+
+
+@pytest.mark.parametrize("opts", [{}, {"lazy": True}, {"slots": True}])
+def test_fields(opts):
+    parser = LogParser(
+        VHOST_COMBINED, fields=["%h", "request_time", "%{User-Agent}i"], **opts
+    )
+    assert parser._compiled.regex.groups == 3
+    entry = parser.parse(ENTRY)
+    assert entry.remote_host == "203.62.1.80"
+    assert entry.request_time == datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc)
+    assert entry.headers_in == {"User-Agent": UA}
+    assert entry.headers_in["user-agent"] == UA
+    assert entry.directives == {
+        "%h": "203.62.1.80",
+        "%t": datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc),
+        "%{User-Agent}i": UA,
+    }
+    for attrname in ("virtual_host", "request_line", "final_status", "bytes_out"):
+        assert not hasattr(entry, attrname)
+    assert parser.parse(ENTRY.encode("iso-8859-1")).headers_in == {"User-Agent": UA}
+
+
+def test_fields_still_validate():
+    parser = LogParser(COMBINED, fields=["%h"])
+    with pytest.raises(ValueError):
+        parser.parse(
+            '127.0.0.1 - - [01/Nov/2017:07:28:29 +0000] "GET / HTTP/1.1" xxx - "-" "-"'
+        )
+
+
+def test_fields_by_name_and_path():
+    entry = LogParser(
+        VHOST_COMBINED, fields=[("headers_in", "Referer"), "final_status"]
+    ).parse(ENTRY)
+    assert entry.headers_in == {"Referer": None}
+    assert entry.final_status == 301
+    assert entry.directives == {"%>s": 301, "%{Referer}i": None}
+
+
+def test_fields_dict_attribute():
+    entry = LogParser(VHOST_COMBINED, fields=["headers_in", "final_status"]).parse(
+        ENTRY
+    )
+    assert vars(entry) == {
+        "entry": ENTRY,
+        "format": VHOST_COMBINED,
+        "headers_in": {"Referer": None, "User-Agent": UA},
+        "final_status": 301,
+        "directives": {
+            "%>s": 301,
+            "%{Referer}i": None,
+            "%{User-Agent}i": UA,
+        },
+    }
+
+
+def test_fields_time_components():
+    parser = LogParser("%{%Y-%m-%d}t %{%H:%M:%S}t %s", fields=["request_time"])
+    entry = parser.parse("2019-05-06 06:28:20 200")
+    assert entry.request_time == datetime(2019, 5, 6, 6, 28, 20)
+    assert not hasattr(entry, "status")
+    entry = LogParser("%{%Y-%m-%d}t %{%H:%M:%S}t %s", fields=["%{%Y}t"]).parse(
+        "2019-05-06 06:28:20 200"
+    )
+    assert entry.request_time_fields == {"year": 2019}
+    assert entry.request_time is None
+
+
+def test_fields_unknown():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, fields=["%h", "virtual_host"])
+    assert str(excinfo.value) == "Field not produced by log format: 'virtual_host'"
+
+
+def test_fields_pickle_slots():
+    parser = LogParser(VHOST_COMBINED, fields=["%h"], slots=True)
+    entry = parser.parse(ENTRY)
+    entry2 = pickle.loads(pickle.dumps(entry))
+    assert entry2 == entry
+    assert type(entry2) is type(entry)
+
+
+@pytest.mark.parametrize("fmt", [COMBINED, VHOST_COMBINED, "%{%Y-%m-%d %H:%M:%S}t %a"])
+def test_uncapture(fmt):
+    groups, rgx = format2regex(fmt)
+    n = len(groups)
+    assert _uncapture(rgx, set(range(n))) == rgx
+    assert re.compile(_uncapture(rgx, set())).groups == 0
+    assert re.compile(_uncapture(rgx, {0, n - 1})).groups == 2
+
+
+def test_uncapture_classes_and_escapes():
+    rgx = r"([]()])\((x)[^]()](y)"
+    assert _uncapture(rgx, {1}) == r"(?:[]()])\((x)[^]()](?:y)"
@@ -0,0 +1,171 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from apachelogs import (
+    COMBINED,
+    VHOST_COMBINED,
+    AnyOf,
+    Equals,
+    Filter,
+    InvalidEntryError,
+    LogParser,
+    OneOf,
+    Prefix,
+    Range,
+    TimeRange,
+    parse_lines,
+)
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+LINES = [
+    '1.2.3.4 - - [01/Nov/2017:07:28:29 +0000] "GET /api/x HTTP/1.1" 200 12 "-" "curl"',
+    '1.2.3.4 - - [01/Nov/2017:07:28:29 +0000] "GET /api/y HTTP/1.1" 503 - "-" "curl"',
+    '1.2.3.5 - - [01/Nov/2017:07:28:30 +0000] "GET / HTTP/1.1" 404 7 "-" "\\x63url"',
+    '1.2.3.5 - - [01/Nov/2017:07:28:31 +0000] "GET /\\x61pi HTTP/1.1" 500 - "-" "-"',
+    '1.2.3.6 - - [01/Nov/2017:07:28:32 +0000] "-" 200 0 "-" "Mozilla/5.0"',
+]
+
+UTC = timezone.utc
+
+
+def posthoc(parser, lines, pred):
+    return [e for e in parser.parse_lines(lines) if pred(e)]
+
+
+@pytest.mark.parametrize(
+    "filt,pred",
+    [
+        (Range("final_status", 500), lambda e: e.final_status >= 500),
+        (Range("%>s", 400, 500), lambda e: 400 <= e.final_status < 500),
+        (
+            Range("bytes_sent", max=10),
+            lambda e: e.bytes_sent is not None and e.bytes_sent < 10,
+        ),
+        (Equals("final_status", 200), lambda e: e.final_status == 200),
+        (Equals("remote_host", "1.2.3.5"), lambda e: e.remote_host == "1.2.3.5"),
+        (
+            Equals(("headers_in", "User-Agent"), "curl"),
+            lambda e: e.headers_in["User-Agent"] == "curl",
+        ),
+        (
+            Equals("%{User-Agent}i", None),
+            lambda e: e.headers_in["User-Agent"] is None,
+        ),
+        (Equals("request_line", None), lambda e: e.request_line is None),
+        (OneOf("final_status", [404, 503]), lambda e: e.final_status in (404, 503)),
+        (
+            OneOf("remote_host", {"1.2.3.4", "1.2.3.6"}),
+            lambda e: e.remote_host in ("1.2.3.4", "1.2.3.6"),
+        ),
+        (
+            Prefix("request_line", "GET /api"),
+            lambda e: (e.request_line or "").startswith("GET /api"),
+        ),
+        (
+            Prefix("request_line", "GET /a"),
+            lambda e: (e.request_line or "").startswith("GET /a"),
+        ),
+        (Prefix("request_line", ""), lambda e: e.request_line is not None),
+        (
+            Prefix(("headers_in", "User-Agent"), ""),
+            lambda e: e.headers_in["User-Agent"] is not None,
+        ),
+        (
+            TimeRange(
+                datetime(2017, 11, 1, 7, 28, 30, tzinfo=UTC),
+                datetime(2017, 11, 1, 7, 28, 32, tzinfo=UTC),
+            ),
+            lambda e: e.request_time.second in (30, 31),
+        ),
+        (
+            TimeRange(end=datetime(2017, 11, 1, 7, 28, 30, tzinfo=UTC)),
+            lambda e: e.request_time.second == 29,
+        ),
+        (
+            AnyOf([Range("final_status", 500), Equals("remote_host", "1.2.3.6")]),
+            lambda e: e.final_status >= 500 or e.remote_host == "1.2.3.6",
+        ),
+    ],
+)
+@pytest.mark.parametrize("binary", [False, True])
+def test_filter(filt, pred, binary):
+    parser = LogParser(COMBINED)
+    lines = [ln.encode("iso-8859-1") for ln in LINES] if binary else LINES
+    expected = posthoc(parser, lines, pred)
+    assert 0 < len(expected) < len(LINES)
+    assert list(parser.parse_lines(lines, filters=[filt])) == expected
+
+
+def test_filter_escapes():
+    parser = LogParser(COMBINED)
+    (entry,) = parser.parse_lines(
+        LINES, filters=[Equals("%{User-Agent}i", "curl"), Equals("final_status", 404)]
+    )
+    assert entry.headers_in["User-Agent"] == "curl"
+    (entry,) = parser.parse_lines(
+        LINES, filters=[Prefix("request_line", "GET /api "), Range("final_status", 500)]
+    )
+    assert entry.request_line == "GET /api HTTP/1.1"
+
+
+def test_filters_combined():
+    parser = LogParser(COMBINED)
+    entries = list(
+        parser.parse_lines(
+            LINES, filters=[Range("final_status", 200, 300), Equals("bytes_sent", 0)]
+        )
+    )
+    assert [e.remote_host for e in entries] == ["1.2.3.6"]
+
+
+def test_filters_skip_conversion(mocker):
+    parser = LogParser(VHOST_COMBINED)
+    spy = mocker.spy(parser, "_entry_from_match")
+    with LOG.open() as fp:
+        entries = list(
+            parser.parse_lines(
+                fp,
+                ignore_invalid=True,
+                filters=[TimeRange(end=datetime(2019, 5, 6, 6, 28, 21, tzinfo=UTC))],
+            )
+        )
+    assert len(entries) == 2
+    assert spy.call_count == 2
+
+
+def test_filters_invalid_entries():
+    parser = LogParser(VHOST_COMBINED)
+    with LOG.open() as fp:
+        with pytest.raises(InvalidEntryError):
+            list(parser.parse_lines(fp, filters=[Equals("final_status", 999)]))
+
+
+def test_filters_bad_field():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED).parse_lines(LINES, filters=[Range("virtual_host", 1)])
+    assert str(excinfo.value) == "Field not produced by log format: 'virtual_host'"
+    with pytest.raises(ValueError):
+        LogParser("%h").parse_lines([], filters=[TimeRange()])
+
+
+def test_filters_naive_times():
+    entries = parse_lines(
+        "%{%Y-%m-%d}t %{%H:%M:%S}t %s",
+        ["2019-05-06 06:28:20 200", "2019-05-06 07:28:20 200"],
+        filters=[TimeRange(start=datetime(2019, 5, 6, 7))],
+    )
+    assert [e.request_time for e in entries] == [datetime(2019, 5, 6, 7, 28, 20)]
+
+
+def test_filters_bytes_encoding():
+    parser = LogParser(COMBINED, encoding="bytes")
+    (entry,) = parser.parse_lines(
+        LINES, filters=[Equals(("headers_in", "User-Agent"), b"Mozilla/5.0")]
+    )
+    assert entry.remote_host == b"1.2.3.6"
+
+
+def test_filter_is_abstract():
+    with pytest.raises(TypeError):
+        Filter()
@@ -0,0 +1,131 @@
+from pathlib import Path
+import pytest
+from apachelogs import (
+    COMBINED,
+    COMMON,
+    VHOST_COMBINED,
+    FormatGuess,
+    LogParser,
+    clear_parser_cache,
+    infer_format,
+    parser_cache_info,
+)
+from apachelogs.infer import _directive_count, _generic_format
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+COMBINED_ENTRY = (
+    '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+    ' "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101'
+    ' Firefox/58.0"'
+)
+
+COMMON_ENTRIES = [
+    '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577',
+    '192.0.2.7 - bob [06/May/2019:06:28:21 +0000] "POST /login HTTP/1.1" 200 -',
+    '198.51.100.2 - - [06/May/2019:06:28:23 +0000] "GET /robots.txt HTTP/1.0"'
+    " 404 209",
+]
+
+
+def test_infer_common():
+    guesses = infer_format(COMMON_ENTRIES)
+    assert all(isinstance(g, FormatGuess) for g in guesses)
+    assert all(g.match_rate == 1.0 for g in guesses)
+    assert all(g.parse_usec > 0 for g in guesses)
+    assert guesses[0].format in (COMMON, '%h %l %u %t "%r" %>s %O')
+    for g in guesses:
+        for e in COMMON_ENTRIES:
+            LogParser(g.format).parse(e)
+
+
+def test_infer_combined_bytes():
+    guesses = infer_format([COMBINED_ENTRY.encode() + b"\n"] * 3)
+    assert guesses[0].format in (COMBINED, COMBINED.replace("%b", "%O"))
+    assert COMMON not in [g.format for g in guesses]
+
+
+def test_infer_suffix():
+    guesses = infer_format([COMBINED_ENTRY + " 1234"])
+    formats = [g.format for g in guesses]
+    assert COMBINED + " %D" in formats
+    assert COMBINED not in formats
+    assert _directive_count(guesses[0].format) == _directive_count(COMBINED) + 1
+
+
+def test_infer_vhost_combined_file():
+    with LOG.open() as fp:
+        entries = fp.readlines()
+    # The file contains one invalid entry:
+    assert infer_format(entries) == []
+    guesses = infer_format(entries, threshold=0.8)
+    assert guesses[0].format.startswith("%v:%p ")
+    assert guesses[0].match_rate == (len(entries) - 1) / len(entries)
+    assert VHOST_COMBINED in [g.format for g in guesses]
+
+
+def test_infer_threshold():
+    entries = COMMON_ENTRIES * 4 + ["Bad line"]
+    assert infer_format(entries) == []
+    guesses = infer_format(entries, threshold=0.9)
+    assert COMMON in [g.format for g in guesses]
+    assert all(g.match_rate == 12 / 13 for g in guesses)
+    # Only the first 12 entries are probed, and all of them match:
+    assert infer_format(entries, threshold=0.95, probe_size=12) == []
+
+
+def test_infer_conversion_failure():
+    # The last entry matches COMMON's regex, but its date doesn't exist:
+    entries = COMMON_ENTRIES * 3 + [COMMON_ENTRIES[0].replace("06/May", "31/Feb")]
+    # Only the generic format, with a placeholder for the date, parses all:
+    (guess,) = infer_format(entries)
+    assert "%t" not in guess.format
+    guesses = infer_format(entries, threshold=0.9)
+    assert COMMON in [g.format for g in guesses]
+    assert all(g.match_rate == 9 / 10 for g in guesses)
+
+
+def test_infer_empty():
+    assert infer_format([]) == []
+
+
+def test_infer_bypasses_parser_cache():
+    clear_parser_cache()
+    LogParser(COMMON)
+    assert infer_format(COMMON_ENTRIES)
+    info = parser_cache_info()
+    assert info.currsize == 1
+    assert (info.hits, info.misses) == (0, 1)
+
+
+def test_generic_format():
+    entries = [
+        '10.0.0.1 www.example.com:80 - 200 "GET / HTTP/1.1" [foo bar] 17 x%y',
+        '10.0.0.2 www.example.com:443 - 404 "POST /x HTTP/1.1" [baz] - q',
+    ]
+    fmt = '%a %v:%p %l %>s "%r" [%{field1}e] %b %{field2}e'
+    assert _generic_format(entries) == fmt
+    guesses = infer_format(entries)
+    assert [g.format for g in guesses] == [fmt]
+    e = LogParser(fmt).parse(entries[0])
+    assert e.env_vars == {"field1": "foo bar", "field2": "x%y"}
+
+
+def test_generic_format_timestamp():
+    entries = ['2019-05-06 06:28:20 +0000 "quoted text" [06/May/2019:06:28:20 +0000] 5']
+    assert _generic_format(entries) == (
+        '%{field1}e %v:%p %{field2}e "%{field3}e" %t %b'
+    )
+
+
+@pytest.mark.parametrize(
+    "fmt,count",
+    [
+        (COMMON, 7),
+        (COMBINED, 9),
+        ("%%h 100%% %{%Y-%m-%d}t", 1),
+        ("literal", 0),
+    ],
+)
+def test_directive_count(fmt, count):
+    assert _directive_count(fmt) == count
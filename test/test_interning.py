@@ -0,0 +1,104 @@
+import pickle
+import pytest
+from apachelogs import COMBINED, VHOST_COMBINED, LogParser
+
+ENTRIES = [
+    '1.2.3.4 - - [01/Nov/2017:07:28:29 +0000] "GET / HTTP/1.1" 200 12 "-"'
+    ' "Mozilla/5.0 (X11; Linux x86_64)"',
+    '1.2.3.5 - - [01/Nov/2017:07:28:30 +0000] "GET /foo HTTP/1.1" 200 34 "-"'
+    ' "Mozilla/5.0 (X11; Linux x86_64)"',
+    '1.2.3.4 - - [01/Nov/2017:07:28:31 +0000] "POST /\\x2e HTTP/1.1" 404 56'
+    ' "http://example.com/" "Mozilla/5.0 (X11; Linux x86_64)"',
+]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize(
+    "opts",
+    [
+        {},
+        {"lazy": True},
+        {"slots": True},
+        {"encoding": "utf-8"},
+    ],
+)
+def test_intern_fields(binary, opts):
+    parser = LogParser(COMBINED, intern_fields=["headers_in", "%h"], **opts)
+    plain = LogParser(COMBINED, **opts)
+    lines = [e.encode() if binary else e for e in ENTRIES]
+    entries = list(parser.parse_lines(lines))
+    expected = list(plain.parse_lines(lines))
+    for e, x in zip(entries, expected):
+        assert e.remote_host == x.remote_host
+        assert e.headers_in == x.headers_in
+        assert e.request_line == x.request_line
+        assert e.directives == x.directives
+    ua = [e.headers_in["User-Agent"] for e in entries]
+    assert isinstance(ua[0], str)
+    assert ua[0] is ua[1] is ua[2]
+    assert entries[0].remote_host is entries[2].remote_host
+    assert entries[0].headers_in["Referer"] is entries[1].headers_in["Referer"]
+
+
+def test_intern_bytes_encoding():
+    parser = LogParser(COMBINED, encoding="bytes", intern_fields=["headers_in"])
+    entries = list(parser.parse_lines(ENTRIES))
+    ua = [e.headers_in["User-Agent"] for e in entries]
+    assert ua[0] == b"Mozilla/5.0 (X11; Linux x86_64)"
+    assert ua[0] is ua[1] is ua[2]
+
+
+def test_intern_cache_info():
+    parser = LogParser(COMBINED, intern_fields=[("headers_in", "User-Agent")])
+    assert parser.intern_cache_info() == (0, 0, 0, 1024, 0)
+    list(parser.parse_lines(ENTRIES))
+    info = parser.intern_cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+    assert info.hit_rate == pytest.approx(2 / 3)
+    assert LogParser(COMBINED).intern_cache_info() == (0, 0, 0, 1024, 0)
+
+
+def test_intern_cache_bounded():
+    parser = LogParser("%{X-Id}i", intern_fields=["headers_in"], intern_cache_size=3)
+    entries = [parser.parse(str(i % 10)) for i in range(100)]
+    info = parser.intern_cache_info()
+    assert info.currsize == 3
+    assert info.evictions == 100 - 3
+    assert [e.headers_in["X-Id"] for e in entries] == [str(i % 10) for i in range(100)]
+
+
+def test_intern_with_fields():
+    parser = LogParser(
+        VHOST_COMBINED,
+        fields=["virtual_host", "request_line"],
+        intern_fields=["virtual_host"],
+    )
+    e1 = parser.parse(
+        'www.example.com:80 1.2.3.4 - - [01/Nov/2017:07:28:29 +0000] "GET /'
+        ' HTTP/1.1" 200 12 "-" "curl"'
+    )
+    e2 = parser.parse(
+        'www.example.com:443 1.2.3.5 - - [01/Nov/2017:07:28:30 +0000] "GET /x'
+        ' HTTP/1.1" 200 12 "-" "curl"'
+    )
+    assert e1.virtual_host == "www.example.com"
+    assert e1.virtual_host is e2.virtual_host
+
+
+@pytest.mark.parametrize(
+    "fields,intern_fields,bad",
+    [
+        (None, ["virtual_host"], "'virtual_host'"),
+        (["request_line"], ["remote_host"], "'remote_host'"),
+    ],
+)
+def test_intern_bad_field(fields, intern_fields, bad):
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, fields=fields, intern_fields=intern_fields)
+    assert str(excinfo.value) == f"Field not produced by log format: {bad}"
+
+
+def test_intern_pickle():
+    parser = LogParser(COMBINED, intern_fields=["headers_in"])
+    entry = parser.parse(ENTRIES[0])
+    assert pickle.loads(pickle.dumps(entry)) == entry
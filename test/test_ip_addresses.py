@@ -0,0 +1,179 @@
+from ipaddress import IPv4Address, IPv6Address
+import pytest
+from apachelogs import (
+    COMBINED,
+    VHOST_COMBINED,
+    Equals,
+    InvalidEntryError,
+    LogParser,
+    MultiFormatParser,
+)
+
+ENTRY = (
+    '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+    ' "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101'
+    ' Firefox/58.0"'
+)
+
+
+@pytest.mark.parametrize(
+    "addr,obj",
+    [
+        ("127.0.0.1", IPv4Address("127.0.0.1")),
+        ("::1", IPv6Address("::1")),
+        ("fe80::7:8", IPv6Address("fe80::7:8")),
+        ("::ffff:192.0.2.128", IPv6Address("::ffff:192.0.2.128")),
+        (
+            "2001:db8:85a3:0:0:8a2e:370:7334",
+            IPv6Address("2001:db8:85a3::8a2e:370:7334"),
+        ),
+    ],
+)
+@pytest.mark.parametrize("binary", [False, True])
+def test_ip_address_modes(addr, obj, binary):
+    entry = f"{addr}:8080 <-> {addr}"
+    if binary:
+        entry = entry.encode()
+    fmt = "%a:%{remote}p <-> %A"
+    strict = LogParser(fmt).parse(entry)
+    loose = LogParser(fmt, ip_addresses="loose").parse(entry)
+    assert loose == strict
+    assert loose.remote_address == addr
+    objects = LogParser(fmt, ip_addresses="objects").parse(entry)
+    assert objects.remote_address == obj
+    assert objects.local_address == obj
+    assert objects.remote_port == 8080
+    assert objects.directives["%a"] == obj
+
+
+@pytest.mark.parametrize("addr", ["1.2.3.999", "1.2.3", ":::", "abc", "1.2.3.4.5"])
+def test_loose_invalid_address(addr):
+    entry = ENTRY.replace("203.62.1.80", addr)
+    fmt = COMBINED.replace("%h", "%a")
+    with pytest.raises(InvalidEntryError):
+        LogParser(fmt).parse(entry)
+    for mode in ["loose", "objects"]:
+        with pytest.raises(InvalidEntryError) as excinfo:
+            LogParser(fmt, ip_addresses=mode).parse(entry)
+        assert excinfo.value.entry == entry
+        # Not validated unless converted:
+        e = LogParser(fmt, ip_addresses=mode, lazy=True).parse(entry)
+        assert e.final_status == 301
+        with pytest.raises(ValueError):
+            e.remote_address
+        e = LogParser(fmt, ip_addresses=mode, fields=["%>s"]).parse(entry)
+        assert e.final_status == 301
+
+
+@pytest.mark.parametrize("mode", ["loose", "objects"])
+@pytest.mark.parametrize("binary", [False, True])
+def test_loose_invalid_address_ignored(mode, binary):
+    entries = ["1.2.3.999 200", "1.2.3.4 200"]
+    if binary:
+        entries = [e.encode() for e in entries]
+    parser = LogParser("%a %>s", ip_addresses=mode)
+    parsed = list(parser.parse_lines(entries, ignore_invalid=True))
+    assert [e.entry for e in parsed] == entries[1:]
+    with pytest.raises(InvalidEntryError):
+        list(parser.parse_lines(entries))
+    parsed = list(
+        parser.parse_lines(
+            entries, ignore_invalid=True, filters=[Equals("final_status", 200)]
+        )
+    )
+    assert [e.entry for e in parsed] == entries[1:]
+    (batch,) = parser.parse_columns(entries, fields=["final_status", "remote_address"])
+    assert batch.size == 1
+    assert batch.rejected == 1
+    assert list(batch["final_status"]) == [200]
+    assert list(batch["remote_address"]) == [parsed[0].remote_address]
+
+
+def test_loose_invalid_address_multi():
+    parser = MultiFormatParser(["%a %>s", "%h %>s"], ip_addresses="loose")
+    e = parser.parse("1.2.3.999 200")
+    assert e.format == "%h %>s"
+    assert e.remote_host == "1.2.3.999"
+
+
+def test_loose_invalid_address_mmap(tmp_path):
+    path = tmp_path / "access.log"
+    path.write_text(
+        "1.2.3.999 200 [06/May/2019:06:28:20 +0000]\n"
+        "1.2.3.4 200 [06/May/2019:06:28:21 +0000]\n"
+    )
+    parser = LogParser("%a %>s %t", ip_addresses="loose")
+    entries = list(parser.parse_mmap(path, ignore_invalid=True))
+    assert [e.remote_address for e in entries] == ["1.2.3.4"]
+    with pytest.raises(InvalidEntryError) as excinfo:
+        list(parser.parse_mmap(path))
+    assert excinfo.value.offset == 0
+    entries = list(parser.parse_time_range(path, ignore_invalid=True))
+    assert [e.remote_address for e in entries] == ["1.2.3.4"]
+
+
+def test_loose_rejects_non_address_characters():
+    fmt = COMBINED.replace("%h", "%a")
+    with pytest.raises(InvalidEntryError):
+        LogParser(fmt, ip_addresses="loose").parse(
+            ENTRY.replace("203.62.1.80", "example.com")
+        )
+
+
+def test_objects_shared():
+    parser = LogParser(COMBINED.replace("%h", "%a"), ip_addresses="objects")
+    e1 = parser.parse(ENTRY)
+    e2 = LogParser(COMBINED.replace("%h", "%a"), ip_addresses="objects").parse(ENTRY)
+    assert e1.remote_address is e2.remote_address
+
+
+@pytest.mark.parametrize("mode", ["strict", "loose", "objects"])
+def test_hostname_lookups_off(mode):
+    parser = LogParser(COMBINED, ip_addresses=mode, hostname_lookups=False)
+    e = parser.parse(ENTRY)
+    if mode == "objects":
+        assert e.remote_host == IPv4Address("203.62.1.80")
+    else:
+        assert e.remote_host == "203.62.1.80"
+    with pytest.raises(InvalidEntryError):
+        parser.parse(ENTRY.replace("203.62.1.80", "example.com"))
+    assert (
+        LogParser(COMBINED, ip_addresses=mode)
+        .parse(ENTRY.replace("203.62.1.80", "example.com"))
+        .remote_host
+        == "example.com"
+    )
+    e = LogParser("%{c}h", ip_addresses=mode, hostname_lookups=False).parse("::1")
+    assert e.remote_underlying_host == (
+        "::1" if mode != "objects" else IPv6Address("::1")
+    )
+
+
+@pytest.mark.parametrize("engine", ["regex", "split"])
+def test_objects_engines(engine):
+    fmt = VHOST_COMBINED
+    opts = {"ip_addresses": "objects", "hostname_lookups": False, "engine": engine}
+    parser = LogParser(fmt, **opts)
+    entries = list(
+        LogParser(fmt).parse_lines(
+            [
+                "www.example.com:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000]"
+                ' "GET / HTTP/1.1" 301 577 "-" "-"'
+            ]
+        )
+    )
+    e = parser.parse(entries[0].entry)
+    assert e.remote_host == IPv4Address("203.62.1.80")
+    assert e.request_line == entries[0].request_line
+    assert list(
+        parser.parse_lines(
+            [entries[0].entry],
+            filters=[Equals("remote_host", IPv4Address("203.62.1.80"))],
+        )
+    ) == [e]
+
+
+def test_bad_ip_addresses():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, ip_addresses="lax")
+    assert str(excinfo.value) == "Invalid ip_addresses: 'lax'"
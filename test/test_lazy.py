@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import pickle
+import pytest
+from apachelogs import VHOST_COMBINED, LogEntry, LogParser
+
+ENTRY = (
+    'www.varonathe.org:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET /'
+    ' HTTP/1.1" 301 577 "-" "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0)'
+    ' Gecko/20100101 Firefox/58.0"'
+)
+
+
+def test_lazy_converts_on_access(mocker):
+    parser = LogParser(VHOST_COMBINED, lazy=True)
+    spy = mocker.spy(parser, "_convert")
+    entry = parser.parse(ENTRY)
+    assert isinstance(entry, LogEntry)
+    assert spy.call_count == 0
+    assert entry.final_status == 301
+    assert spy.call_count == 1
+    assert entry.final_status == 301
+    assert spy.call_count == 1
+    assert entry.headers_in == {
+        "Referer": None,
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101"
+            " Firefox/58.0"
+        ),
+    }
+    assert entry.headers_in["user-agent"] == entry.headers_in["User-Agent"]
+    assert spy.call_count == 3
+    assert entry.request_time == datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc)
+    assert spy.call_count == 4
+    assert entry.directives["%>s"] == 301
+    assert entry.directives["%O"] == 577
+    assert spy.call_count == 11
+
+
+def test_lazy_missing_attribute():
+    entry = LogParser(VHOST_COMBINED, lazy=True).parse(ENTRY)
+    with pytest.raises(AttributeError):
+        entry.status
+    with pytest.raises(AttributeError):
+        entry.begin_request_time
+    assert not hasattr(entry, "_foo")
+
+
+def test_lazy_first_non_none():
+    entry = LogParser("%{us}T %D", lazy=True).parse("42 42")
+    assert entry.request_duration_microseconds == 42
+    entry = LogParser("%200b %b", lazy=True).parse("- 42")
+    assert entry.bytes_sent == 42
+
+
+def test_lazy_vars_and_eq():
+    eager = LogParser(VHOST_COMBINED).parse(ENTRY)
+    entry = LogParser(VHOST_COMBINED, lazy=True).parse(ENTRY)
+    assert vars(entry) == {"entry": ENTRY, "format": VHOST_COMBINED}
+    assert entry == eager
+    assert eager == entry
+    assert vars(entry) == vars(eager)
+
+
+def test_lazy_pickle():
+    entry = LogParser(VHOST_COMBINED, lazy=True).parse(ENTRY)
+    entry2 = pickle.loads(pickle.dumps(entry))
+    assert entry2 == LogParser(VHOST_COMBINED).parse(ENTRY)
+    assert entry2.server_port == 80
+    with pytest.raises(AttributeError):
+        entry2.status
+
+
+def test_lazy_parse_lines():
+    parser = LogParser(VHOST_COMBINED)
+    lazy_parser = LogParser(VHOST_COMBINED, lazy=True)
+    with (Path(__file__).with_name("data") / "vhost_combined.log").open() as fp:
+        lines = list(fp)
+    assert list(lazy_parser.parse_lines(lines, ignore_invalid=True)) == list(
+        parser.parse_lines(lines, ignore_invalid=True)
+    )
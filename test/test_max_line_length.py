@@ -0,0 +1,161 @@
+from pathlib import Path
+import time
+import pytest
+from apachelogs import COMBINED, VHOST_COMBINED, InvalidEntryError, LogParser
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+ENTRY = (
+    '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+    ' "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101'
+    ' Firefox/58.0"'
+)
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        # Runs of `\xHH` escapes used to make the regex backtrack exponentially
+        # when the rest of the entry failed to match:
+        '1.2.3.4 - - [06/May/2019:06:28:20 +0000] "' + "\\x41" * 40 + '" 200 1 x',
+        '1.2.3.4 - - [06/May/2019:06:28:20 +0000] "-" 200 1 "' + "\\x41" * 40,
+        '1.2.3.4 - - [06/May/2019:06:28:20 +0000] "' + "\\" * 1000,
+        '1.2.3.4 - - [06/May/2019:06:28:20 +0000] "' + '" "' * 1000 + "x",
+        # Hosts that could contain spaces and timestamps that could be anything
+        # in brackets used to make the regex take time quadratic in the length
+        # of the entry:
+        "1.2.3.4 - " + "a [x] " * 4000 + "zz",
+        "1.2.3.4 " * 4000 + '- - [x] "r" 200 1 "-" "-" x',
+        "1.2.3.4 - " + ' \\"1 [ ' * 4000,
+    ],
+)
+@pytest.mark.parametrize("engine", ["regex", "split"])
+def test_pathological_entries(entry, engine):
+    parser = LogParser(COMBINED, engine=engine)
+    start = time.perf_counter()
+    with pytest.raises(InvalidEntryError):
+        parser.parse(entry)
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        "1.2.3.4 - " + "a [x] " * 4000 + "zz",
+        "a:1 " * 4000 + "zz",
+        "h:1 1.2.3.4 - " + "a:1 [x] " * 4000 + "zz",
+        # Entries containing all of the format's literals, in which every colon
+        # could be the end of `%v`:
+        "a:1 " * 4000 + '[x] "r" 200 1 "-" "-"',
+        "a:1 " * 4000 + '[06/May/2019:06:28:20 +0000] "r" 200 x "-" "-"',
+        "a:1 [x] " * 4000 + '"r" 200 1 "-" "-"',
+    ],
+)
+@pytest.mark.parametrize("engine", ["regex", "split"])
+@pytest.mark.parametrize("binary", [False, True])
+def test_pathological_vhost_entries(entry, engine, binary):
+    parser = LogParser(VHOST_COMBINED, engine=engine)
+    if binary:
+        entry = entry.encode()
+    start = time.perf_counter()
+    with pytest.raises(InvalidEntryError):
+        parser.parse(entry)
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.parametrize(
+    "fmt,entry",
+    [
+        ("%h %>s", "example com 200"),
+        ("%{c}h %>s", "example com 200"),
+        (COMBINED, ENTRY.replace("06/May/2019:06:28:20 +0000", "06/May/2019 06:28")),
+        (COMBINED, ENTRY.replace("[06/May/2019:06:28:20 +0000]", "[x]")),
+    ],
+)
+def test_spaced_host_and_bad_timestamp_rejected(fmt, entry):
+    with pytest.raises(InvalidEntryError):
+        LogParser(fmt).parse(entry)
+    with pytest.raises(InvalidEntryError):
+        LogParser(fmt, lazy=True).parse(entry)
+
+
+@pytest.mark.parametrize("engine", ["regex", "split"])
+def test_spaced_vhost_parsed(engine):
+    # With `UseCanonicalName Off`, `%V` is taken from the Host header, which
+    # may contain spaces.
+    assert (
+        LogParser("%V %>s", engine=engine).parse("example com 200").server_name
+        == "example com"
+    )
+    entry = "www.example.com:80 " * 100 + ENTRY
+    assert len(entry) > 2048
+    e = LogParser(VHOST_COMBINED, engine=engine).parse(entry)
+    assert e.virtual_host == "www.example.com"
+    assert e.server_port == 80
+    assert e.remote_host == "www.example.com:80"
+    assert e.remote_user.startswith("www.example.com:80 ")
+
+
+def test_escaped_hex_still_parsed():
+    entry = ENTRY.replace('"-"', '"\\x41\\x4a\\x4"')
+    assert LogParser(COMBINED).parse(entry).headers_in["Referer"] == "AJx4"
+
+
+@pytest.mark.parametrize("engine", ["regex", "split"])
+def test_max_line_length(engine):
+    parser = LogParser(COMBINED, engine=engine, max_line_length=len(ENTRY))
+    assert parser.parse(ENTRY + "\r\n") == LogParser(COMBINED).parse(ENTRY)
+    long_entry = ENTRY.replace("Firefox", "Firefox!")
+    with pytest.raises(InvalidEntryError) as excinfo:
+        parser.parse(long_entry)
+    assert excinfo.value.entry == long_entry
+    assert excinfo.value.format == COMBINED
+
+
+def test_max_line_length_bytes():
+    # The limit counts bytes for `bytes` entries
+    fmt = "é " + COMBINED
+    entry = "é " + ENTRY
+    parser = LogParser(fmt, encoding="utf-8", max_line_length=len(entry))
+    assert parser.parse(entry).entry == entry
+    with pytest.raises(InvalidEntryError):
+        parser.parse(entry.encode("utf-8"))
+    parser = LogParser(fmt, encoding="utf-8", max_line_length=len(entry) + 1)
+    assert parser.parse(entry.encode("utf-8")).entry == entry.encode("utf-8")
+
+
+@pytest.mark.parametrize("opts", [{}, {"lazy": True}, {"slots": True}])
+def test_max_line_length_ignore_invalid(opts):
+    parser = LogParser(COMBINED, max_line_length=len(ENTRY), **opts)
+    entries = [ENTRY, ENTRY + "x" * 1000, ENTRY]
+    assert list(parser.parse_lines(entries, ignore_invalid=True)) == [
+        parser.parse(ENTRY),
+        parser.parse(ENTRY),
+    ]
+    with pytest.raises(InvalidEntryError):
+        list(parser.parse_lines(entries))
+
+
+def test_max_line_length_files():
+    with LOG.open("rb") as fp:
+        entries = list(LogParser(VHOST_COMBINED).parse_lines(fp, ignore_invalid=True))
+    limit = max(len(e.entry) for e in entries) - 1
+    parser = LogParser(VHOST_COMBINED, max_line_length=limit)
+    expected = [e for e in entries if len(e.entry) <= limit]
+    assert 0 < len(expected) < len(entries)
+    assert list(parser.parse_mmap(LOG, ignore_invalid=True)) == expected
+    assert list(parser.parse_file_parallel(LOG, workers=1, ignore_invalid=True)) == (
+        expected
+    )
+
+
+def test_max_line_length_zero():
+    parser = LogParser("%h", max_line_length=0)
+    with pytest.raises(InvalidEntryError):
+        parser.parse("x")
+
+
+def test_bad_max_line_length():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, max_line_length=-1)
+    assert str(excinfo.value) == "Invalid max_line_length: -1"
@@ -0,0 +1,55 @@
+from pathlib import Path
+import pytest
+from apachelogs import VHOST_COMBINED, InvalidEntryError, LogParser
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+
+@pytest.mark.parametrize("opts", [{}, {"lazy": True}, {"slots": True}])
+def test_parse_mmap(opts):
+    parser = LogParser(VHOST_COMBINED, **opts)
+    with LOG.open("rb") as fp:
+        expected = list(parser.parse_lines(fp, ignore_invalid=True))
+    entries = list(parser.parse_mmap(LOG, ignore_invalid=True))
+    assert entries == expected
+    assert len(entries) == 6
+    assert all(isinstance(e.entry, bytes) for e in entries)
+    # Lazy entries must still work after the file is unmapped:
+    assert [e.final_status for e in entries] == [e.final_status for e in expected]
+
+
+def test_parse_mmap_invalid():
+    data = LOG.read_bytes()
+    with pytest.raises(InvalidEntryError) as excinfo:
+        list(LogParser(VHOST_COMBINED).parse_mmap(LOG))
+    assert excinfo.value.entry == b"Bad line"
+    assert excinfo.value.offset == data.index(b"Bad line")
+
+
+@pytest.mark.parametrize(
+    "data,statuses",
+    [
+        (b"", []),
+        (b"200 1", [200]),
+        (b"200 1\n", [200]),
+        (b"200 1\r\n404 -\r\n", [200, 404]),
+        (b"200 1\n404 -", [200, 404]),
+        (b"200 1\n\n404 -\n", [200, 404]),
+    ],
+)
+def test_parse_mmap_line_endings(tmp_path, data, statuses):
+    path = tmp_path / "access.log"
+    path.write_bytes(data)
+    entries = list(LogParser("%>s %b").parse_mmap(path, ignore_invalid=True))
+    assert [e.final_status for e in entries] == statuses
+    assert b"\n" not in b"".join(e.entry for e in entries)
+    assert b"\r" not in b"".join(e.entry for e in entries)
+
+
+def test_parse_mmap_blank_line_invalid(tmp_path):
+    path = tmp_path / "access.log"
+    path.write_bytes(b"200 1\n\n404 -\n")
+    with pytest.raises(InvalidEntryError) as excinfo:
+        list(LogParser("%>s %b").parse_mmap(path))
+    assert excinfo.value.entry == b""
+    assert excinfo.value.offset == 6
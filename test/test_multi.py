@@ -0,0 +1,162 @@
+from pathlib import Path
+import pytest
+from apachelogs import (
+    COMBINED,
+    COMMON,
+    VHOST_COMBINED,
+    InvalidEntryError,
+    LogParser,
+    MultiFormatParser,
+)
+from apachelogs.multi import _format_literals, _has_literals
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+CUSTOM = "%{%Y-%m-%d %H:%M:%S}t %h %>s %D"
+
+ENTRIES = {
+    COMMON: '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577',
+    COMBINED: (
+        '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+        ' "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101'
+        ' Firefox/58.0"'
+    ),
+    VHOST_COMBINED: (
+        "www.example.com:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000]"
+        ' "GET / HTTP/1.1" 301 577 "-" "curl/7.58.0"'
+    ),
+    CUSTOM: "2019-05-06 06:28:20 203.62.1.80 200 1234",
+}
+
+
+@pytest.mark.parametrize("fmt", list(ENTRIES))
+@pytest.mark.parametrize("binary", [False, True])
+def test_parse(fmt, binary):
+    parser = MultiFormatParser([VHOST_COMBINED, COMBINED, COMMON, CUSTOM])
+    entry = ENTRIES[fmt]
+    if binary:
+        entry = entry.encode()
+    e = parser.parse(entry + ("\n" if not binary else "\n".encode()))
+    assert e.format == fmt
+    assert e == LogParser(fmt).parse(entry)
+    assert parser.hits == {parser.formats.index(fmt): 1}
+
+
+def test_first_match_wins():
+    # As `%u` may contain spaces, a `VHOST_COMBINED` entry also matches
+    # `COMBINED`.
+    entry = ENTRIES[VHOST_COMBINED]
+    assert MultiFormatParser([COMBINED, VHOST_COMBINED]).parse(entry).format == (
+        COMBINED
+    )
+    assert MultiFormatParser([VHOST_COMBINED, COMBINED]).parse(entry).format == (
+        VHOST_COMBINED
+    )
+
+
+def test_last_format_per_source():
+    parser = MultiFormatParser([VHOST_COMBINED, COMBINED])
+    entry = ENTRIES[VHOST_COMBINED]
+    # Only matches `COMBINED`:
+    assert parser.parse(ENTRIES[COMBINED], source="a").format == COMBINED
+    assert parser.parse(entry, source="a").format == COMBINED
+    assert parser.parse(entry, source="b").format == VHOST_COMBINED
+    assert parser.parse(entry, source="a").format == COMBINED
+    # Without a source, the formats are always tried in order:
+    assert parser.parse(ENTRIES[COMBINED]).format == COMBINED
+    assert parser.parse(entry).format == VHOST_COMBINED
+    assert parser.hits == {1: 4, 0: 2}
+
+
+def test_last_format_sources_bounded():
+    parser = MultiFormatParser([VHOST_COMBINED, COMBINED], max_sources=2)
+    entry = ENTRIES[VHOST_COMBINED]
+    assert parser.parse(ENTRIES[COMBINED], source="a").format == COMBINED
+    assert parser.parse(ENTRIES[COMBINED], source="b").format == COMBINED
+    assert parser.parse(entry, source="a").format == COMBINED
+    assert parser.parse(entry, source="c").format == VHOST_COMBINED
+    assert len(parser._last) == 2
+    # "b" was the least recently seen source and has been forgotten:
+    assert parser.parse(entry, source="b").format == VHOST_COMBINED
+    assert parser.parse(entry, source="c").format == VHOST_COMBINED
+
+
+def test_hits_same_format_different_options():
+    parser = MultiFormatParser([LogParser(COMMON, hostname_lookups=False), COMMON])
+    assert parser.parse(ENTRIES[COMMON]).remote_host == "203.62.1.80"
+    e = parser.parse(ENTRIES[COMMON].replace("203.62.1.80", "www.example.com"))
+    assert e.remote_host == "www.example.com"
+    assert parser.hits == {0: 1, 1: 1}
+
+
+def test_invalid():
+    parser = MultiFormatParser([COMMON, COMBINED])
+    with pytest.raises(InvalidEntryError) as excinfo:
+        parser.parse("Bad line")
+    assert excinfo.value.entry == "Bad line"
+    assert excinfo.value.format == (COMMON, COMBINED)
+    assert parser.hits == {None: 1}
+
+
+def test_parse_lines():
+    parser = MultiFormatParser([COMMON, VHOST_COMBINED, COMBINED])
+    with LOG.open() as fp:
+        entries = list(parser.parse_lines(fp, ignore_invalid=True))
+    with LOG.open() as fp:
+        assert entries == list(
+            LogParser(VHOST_COMBINED).parse_lines(fp, ignore_invalid=True)
+        )
+    assert parser.hits == {1: len(entries), None: 1}
+    with LOG.open() as fp, pytest.raises(InvalidEntryError):
+        list(parser.parse_lines(fp))
+
+
+def test_parser_instances_and_options():
+    parser = MultiFormatParser(
+        [LogParser(COMMON, epoch="sec"), COMBINED], lazy=True, encoding="bytes"
+    )
+    assert parser.formats == (COMMON, COMBINED)
+    e = parser.parse(ENTRIES[COMMON])
+    assert e.request_time == LogParser(COMMON, epoch="sec").parse(e.entry).request_time
+    e = parser.parse(ENTRIES[COMBINED])
+    assert e.headers_in["User-Agent"].startswith(b"Mozilla")
+
+
+def test_no_formats():
+    with pytest.raises(ValueError):
+        MultiFormatParser([])
+
+
+@pytest.mark.parametrize(
+    "fmt,literals",
+    [
+        (COMMON, ("", [" ", " ", " ", ' "', '" ', " "], "")),
+        (CUSTOM, ("", [" ", " ", " "], "")),
+        ("[%h] 100%% %u.", ("[", ["] 100% "], ".")),
+        ("literal", ("literal", [], "")),
+        ("%h%u", ("", [], "")),
+    ],
+)
+def test_format_literals(fmt, literals):
+    assert _format_literals(fmt) == literals
+
+
+@pytest.mark.parametrize(
+    "entry,expected",
+    [
+        ("[a] b c.", True),
+        ("[] .", True),
+        ("[a]b c.", False),
+        ("[a] b c", False),
+        ("a] b c.", False),
+        ("[ .", False),
+    ],
+)
+def test_has_literals(entry, expected):
+    assert _has_literals(entry, "[", ["] "], ".") is expected
+
+
+def test_has_literals_overlap():
+    # The middle and the trail can't overlap:
+    assert not _has_literals("[a.", "[", ["a."], ".")
+    assert _has_literals("[a..", "[", ["a."], ".")
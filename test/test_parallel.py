@@ -0,0 +1,92 @@
+from pathlib import Path
+import pytest
+from apachelogs import (
+    VHOST_COMBINED,
+    InvalidEntryError,
+    LogParser,
+    parse_file_parallel,
+)
+from apachelogs.parallel import split_file
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+
+@pytest.fixture
+def logfile(tmp_path):
+    lines = [ln for ln in LOG.read_bytes().splitlines(True) if ln != b"Bad line\n"]
+    path = tmp_path / "access.log"
+    path.write_bytes(b"".join(lines * 20))
+    return path
+
+
+def test_split_file(logfile):
+    data = logfile.read_bytes()
+    ranges = split_file(logfile, 1000)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+    assert all(end - start >= 1000 for start, end in ranges[:-1])
+
+
+def test_split_empty_file(tmp_path):
+    path = tmp_path / "empty.log"
+    path.touch()
+    assert split_file(path) == []
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_split_file_bad_chunk_size(logfile, chunk_size):
+    with pytest.raises(ValueError) as excinfo:
+        split_file(logfile, chunk_size)
+    assert str(excinfo.value) == f"Invalid chunk size: {chunk_size}"
+    with pytest.raises(ValueError):
+        LogParser(VHOST_COMBINED).parse_file_parallel(logfile, chunk_size=chunk_size)
+    with pytest.raises(ValueError):
+        parse_file_parallel(VHOST_COMBINED, logfile, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000, 100000])
+def test_parse_file_parallel_ordered(logfile, chunk_size):
+    parser = LogParser(VHOST_COMBINED)
+    with logfile.open("rb") as fp:
+        expected = list(parser.parse_lines(fp))
+    entries = list(
+        parser.parse_file_parallel(logfile, workers=2, chunk_size=chunk_size)
+    )
+    assert entries == expected
+
+
+def test_parse_file_parallel_unordered(logfile):
+    parser = LogParser(VHOST_COMBINED, slots=True)
+    with logfile.open("rb") as fp:
+        expected = list(parser.parse_lines(fp))
+    entries = list(
+        parser.parse_file_parallel(logfile, workers=2, ordered=False, chunk_size=1000)
+    )
+    assert sorted(e.entry for e in entries) == sorted(e.entry for e in expected)
+    assert all(type(e) is parser._entry_class for e in entries)
+
+
+def test_parse_file_parallel_invalid(tmp_path):
+    path = tmp_path / "access.log"
+    path.write_bytes(LOG.read_bytes())
+    with pytest.raises(InvalidEntryError) as excinfo:
+        list(parse_file_parallel(VHOST_COMBINED, path, workers=2))
+    data = LOG.read_bytes()
+    bad = data.splitlines()[4]
+    assert excinfo.value.entry == bad
+    assert excinfo.value.offset == data.index(bad)
+    assert str(excinfo.value) == (
+        f"Could not match log entry {bad!r} against log format"
+        f" {VHOST_COMBINED!r} at byte offset {excinfo.value.offset}"
+    )
+    entries = list(parse_file_parallel(VHOST_COMBINED, path, ignore_invalid=True))
+    assert len(entries) == 6
+    entries = list(
+        parse_file_parallel(
+            VHOST_COMBINED, path, workers=2, ignore_invalid=True, chunk_size=100
+        )
+    )
+    assert len(entries) == 6
@@ -569,8 +569,23 @@ from apachelogs import COMBINED, VHOST_COMBINED, LogParser
     ],
 )
 def test_parse(fmt, entry, fields):
-    log_entry = LogParser(fmt).parse(entry)
+    parser = LogParser(fmt)
+    log_entry = parser.parse(entry)
     assert log_entry.entry == entry.rstrip("\r\n")
     assert log_entry.format == fmt
     for k, v in fields.items():
         assert getattr(log_entry, k) == v
+    m = parser._compiled.regex.fullmatch(log_entry.entry)
+    assert parser._convert_match(log_entry.entry, parser._compiled, m) == log_entry
+    lazy_entry = LogParser(fmt, lazy=True).parse(entry)
+    for k, v in fields.items():
+        assert getattr(lazy_entry, k) == v
+    assert lazy_entry == log_entry
+    slotted_entry = LogParser(fmt, slots=True).parse(entry)
+    for k, v in fields.items():
+        assert getattr(slotted_entry, k) == v
+    assert slotted_entry == log_entry
+    bytes_entry = LogParser(fmt).parse(entry.encode("iso-8859-1"))
+    assert bytes_entry.entry == entry.rstrip("\r\n").encode("iso-8859-1")
+    for k, v in fields.items():
+        assert getattr(bytes_entry, k) == v
@@ -1,6 +1,13 @@
 from datetime import datetime, timedelta, timezone
 import pytest
 from apachelogs import parse_apache_timestamp
+from apachelogs.timeutil import (
+    _offsets,
+    _split_apache_timestamp,
+    _split_apache_timestamp_regex,
+    _timezones,
+    apache_timestamp_to_epoch,
+)
 
 
 def mktz(hours, mins=0):
@@ -103,6 +110,7 @@ def test_parse_apache_timestamp(ts, dt):
     assert apts == dt
     assert apts.replace(tzinfo=None) == dt.replace(tzinfo=None)
     assert apts.tzinfo == dt.tzinfo
+    assert apache_timestamp_to_epoch(ts) == int(dt.timestamp())
 
 
 @pytest.mark.parametrize(
@@ -121,3 +129,109 @@ def test_parse_bad_apache_timestamp(ts):
     with pytest.raises(ValueError) as excinfo:
         parse_apache_timestamp(ts)
     assert str(excinfo.value) == ts
+    with pytest.raises(ValueError) as excinfo:
+        apache_timestamp_to_epoch(ts)
+    assert str(excinfo.value) == ts
+
+
+@pytest.mark.parametrize(
+    "ts",
+    [
+        "[29/Feb/2000:00:00:00 +0000]",
+        "[29/Feb/2016:23:59:59 -1200]",
+        "[31/Dec/1969:23:59:59 +0000]",
+        "[01/Jan/0001:00:00:00 +0000]",
+        "[31/Dec/9999:23:59:59 +0000]",
+        "[31/Dec/2099:12:00:00 +0945]",
+    ],
+)
+def test_apache_timestamp_to_epoch(ts):
+    dt = parse_apache_timestamp(ts)
+    assert apache_timestamp_to_epoch(ts) == (
+        dt - datetime(1970, 1, 1, tzinfo=utc)
+    ) // timedelta(seconds=1)
+
+
+@pytest.mark.parametrize(
+    "ts",
+    [
+        "[29/Feb/1900:00:00:00 +0000]",
+        "[31/Apr/2016:00:00:00 +0000]",
+        "[00/Jan/2016:00:00:00 +0000]",
+        "[01/Jan/0000:00:00:00 +0000]",
+        "[01/Jan/2016:00:00:60 +0000]",
+        "[01/Jan/2016:00:60:00 +0000]",
+        "[01/Jan/2016:24:00:00 +0000]",
+        "[01/Jan/2016:00:00:00 +2400]",
+    ],
+)
+def test_apache_timestamp_to_epoch_invalid(ts):
+    with pytest.raises(ValueError):
+        parse_apache_timestamp(ts)
+    with pytest.raises(ValueError):
+        apache_timestamp_to_epoch(ts)
+
+
+@pytest.mark.parametrize(
+    "ts",
+    [
+        "[01/Nov/2017:07:28:29 +0000]",
+        "01/Nov/2017:07:28:29 -0430",
+        "[01/Nov/2017:07:28:29 -0000]",
+        "[01/Nov/12017:07:28:29 +0000]",
+        "[01/Nov/2017:07:28:29+0000]",
+        "[01/Nov/2017:07:28:29   +0000]",
+        "[01/Nov/2017:07:28:29 +0000",
+        "01/Nov/2017:07:28:29 +0000]",
+        "[٠١/Nov/2017:07:28:29 +0000]",
+        "[32/Nov/2017:07:28:29 +0000]",
+        "[01/Nov/2017:24:28:29 +0000]",
+        "[01/Nov/2017:07:28:29 +2400]",
+        "[01/Nov/2017:07:28:29 *0000]",
+        "[01/Nov/2017:07:28:29 +00x0]",
+        "[01/xyz/2017:07:28:29 +0000]",
+        "[01-Nov-2017:07:28:29 +0000]",
+        "[01/Nov/2017 07:28:29 +0000]",
+        "[01/Nov/2017:07:28:2x +0000]",
+    ],
+)
+def test_parse_apache_timestamp_fast_path(ts):
+    # The fixed-width fast path must agree with the regex in every case,
+    # including which inputs are rejected.
+    try:
+        expected = _split_apache_timestamp_regex(ts)
+    except ValueError as e:
+        with pytest.raises(ValueError) as excinfo:
+            _split_apache_timestamp(ts)
+        assert str(excinfo.value) == str(e)
+    else:
+        assert _split_apache_timestamp(ts) == expected
+    # ... and the epoch conversion must agree with the `datetime` conversion
+    try:
+        dt = parse_apache_timestamp(ts)
+    except ValueError:
+        with pytest.raises(ValueError):
+            apache_timestamp_to_epoch(ts)
+    else:
+        assert apache_timestamp_to_epoch(ts) == int(dt.timestamp())
+
+
+def test_parse_apache_timestamp_shared_tzinfo():
+    dt1 = parse_apache_timestamp("[01/Nov/2017:07:28:29 -0400]")
+    dt2 = parse_apache_timestamp("[05/Nov/2017:01:01:01 -0400]")
+    dt3 = parse_apache_timestamp("05/Nov/2017:01:01:01   -0400")
+    assert dt1.tzinfo is dt2.tzinfo is dt3.tzinfo
+    assert parse_apache_timestamp("[01/Nov/2017:07:28:29 +0000]").tzinfo is utc
+    assert parse_apache_timestamp("[01/Nov/2017:07:28:29 -0000]").tzinfo is utc
+
+
+def test_parse_apache_timestamp_non_ascii_offset():
+    # Non-ASCII decimal digits are accepted, but only the ASCII spelling of the
+    # offset may become a key in the caches of offsets.
+    ts = "[01/Nov/2017:07:28:29 +٠١٠٠]"
+    ascii_ts = "[01/Nov/2017:07:28:29 +0100]"
+    assert parse_apache_timestamp(ts) == parse_apache_timestamp(ascii_ts)
+    assert parse_apache_timestamp(ts).tzinfo is parse_apache_timestamp(ascii_ts).tzinfo
+    assert apache_timestamp_to_epoch(ts) == apache_timestamp_to_epoch(ascii_ts)
+    assert all(k.isascii() for k in _timezones)
+    assert all(k.isascii() for k in _offsets)
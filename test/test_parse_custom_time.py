@@ -647,6 +647,9 @@ def test_parse_custom_time(fmt, entry, fields):
     log_entry = LogParser(fmt, encoding="utf-8").parse(entry)
     for k, v in fields.items():
         assert getattr(log_entry, k) == v
+    bytes_entry = LogParser(fmt, encoding="utf-8").parse(entry.encode("utf-8"))
+    for k, v in fields.items():
+        assert getattr(bytes_entry, k) == v
 
 
 @pytest.mark.parametrize(
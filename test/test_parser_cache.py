@@ -0,0 +1,87 @@
+import pytest
+from apachelogs import (
+    COMBINED,
+    COMMON,
+    LogParser,
+    clear_parser_cache,
+    parse,
+    parse_lines,
+    parser_cache_info,
+)
+import apachelogs.parser
+from apachelogs.util import LRUCache
+
+ENTRY = '209.126.136.4 - - [01/Nov/2017:07:28:29 +0000] "GET / HTTP/1.1" 301 521'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_parser_cache()
+    yield
+    clear_parser_cache()
+
+
+def test_parse_reuses_compiled_format():
+    e1 = parse(COMMON, ENTRY)
+    e2 = parse(COMMON, ENTRY)
+    assert e1 == e2
+    info = parser_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert info.currsize == 1
+
+
+def test_parsers_share_compiled_format():
+    p1 = LogParser(COMMON)
+    p2 = LogParser(COMMON)
+    assert p1._rgx is p2._rgx
+    assert p1._compiled.group_names is p2._compiled.group_names
+    list(parse_lines(COMMON, [ENTRY]))
+    assert parser_cache_info().hits == 2
+
+
+def test_cache_keyed_by_encoding():
+    LogParser(COMMON)
+    LogParser(COMMON, encoding="utf-8")
+    LogParser(COMMON, encoding="utf-8", errors="surrogateescape")
+    info = parser_cache_info()
+    assert info.misses == 3
+    assert info.hits == 0
+    assert info.currsize == 3
+
+
+def test_clear_parser_cache():
+    LogParser(COMMON)
+    LogParser(COMMON)
+    clear_parser_cache()
+    assert parser_cache_info() == (0, 0, 0, 128, 0)
+    LogParser(COMMON)
+    assert parser_cache_info().misses == 1
+
+
+def test_cache_eviction(monkeypatch):
+    monkeypatch.setattr(apachelogs.parser, "_parser_cache", LRUCache(maxsize=1))
+    LogParser(COMMON)
+    LogParser(COMBINED)
+    LogParser(COMMON)
+    info = parser_cache_info()
+    assert info.misses == 3
+    assert info.evictions == 2
+    assert info.currsize == 1
+
+
+def test_invalid_format_not_cached():
+    with pytest.raises(ValueError):
+        LogParser("%x")
+    assert parser_cache_info().currsize == 0
+
+
+def test_lru_cache_order():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 3) == 1
+    assert cache.get("c", lambda: 4) == 4
+    assert cache.get("b", lambda: 5) == 5
+    assert cache.get("a", lambda: 6) == 6
+    assert cache.info() == (1, 5, 3, 2, 2)
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+import random
+import pytest
+from apachelogs import (
+    COMMON,
+    InvalidEntryError,
+    LogParser,
+    parse,
+    parse_time_range,
+)
+from apachelogs.seek import find_time_offset
+
+BASE = datetime(2019, 5, 6, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_line(i, t):
+    return (
+        f"10.0.0.{i % 256} - - [{t:%d/%b/%Y:%H:%M:%S %z}]"
+        f' "GET /{i} HTTP/1.1" 200 {i}\n'
+    )
+
+
+def write_log(path, times):
+    path.write_text("".join(make_line(i, t) for i, t in enumerate(times)))
+    return path
+
+
+@pytest.fixture(scope="module")
+def ordered_log(tmp_path_factory):
+    rng = random.Random(42)
+    times = []
+    t = BASE
+    for _ in range(3000):
+        t += timedelta(seconds=rng.choice([0, 0, 1, 1, 2, 5]))
+        times.append(t)
+    return write_log(tmp_path_factory.mktemp("seek") / "access.log", times)
+
+
+def brute_force(path, start, end):
+    with path.open() as fp:
+        return [
+            e.entry
+            for e in LogParser(COMMON).parse_lines(fp)
+            if (start is None or start <= e.request_time)
+            and (end is None or e.request_time < end)
+        ]
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [
+        (BASE + timedelta(minutes=10), BASE + timedelta(minutes=20)),
+        (BASE + timedelta(seconds=1), BASE + timedelta(seconds=2)),
+        (BASE - timedelta(days=1), BASE + timedelta(minutes=1)),
+        (BASE + timedelta(hours=5), BASE + timedelta(hours=6)),
+        (BASE + timedelta(minutes=30), None),
+        (None, BASE + timedelta(minutes=3)),
+        (BASE + timedelta(minutes=7), BASE + timedelta(minutes=7)),
+    ],
+)
+def test_parse_time_range(ordered_log, start, end):
+    entries = list(LogParser(COMMON).parse_time_range(ordered_log, start, end))
+    assert [e.entry.decode() for e in entries] == brute_force(ordered_log, start, end)
+    assert all(isinstance(e.entry, bytes) for e in entries)
+
+
+def test_parse_time_range_random_windows(ordered_log):
+    parser = LogParser(COMMON)
+    rng = random.Random(0)
+    for _ in range(20):
+        start = BASE + timedelta(seconds=rng.randrange(0, 8000))
+        end = start + timedelta(seconds=rng.randrange(0, 600))
+        entries = list(parser.parse_time_range(ordered_log, start, end))
+        assert [e.entry.decode() for e in entries] == brute_force(
+            ordered_log, start, end
+        )
+
+
+def test_find_time_offset(ordered_log):
+    parser = LogParser(COMMON)
+    data = ordered_log.read_bytes()
+    with ordered_log.open("rb") as fp:
+        assert find_time_offset(parser, fp, BASE) == 0
+        assert find_time_offset(parser, fp, BASE + timedelta(days=1)) == len(data)
+        offset = find_time_offset(parser, fp, BASE + timedelta(minutes=10))
+    assert offset > 0
+    assert data[offset - 1 : offset] == b"\n"
+    before = data[:offset].splitlines()[-1].decode()
+    after = data[offset:].splitlines()[0].decode()
+    assert parse(COMMON, before).request_time < BASE + timedelta(minutes=10)
+    assert parse(COMMON, after).request_time >= BASE + timedelta(minutes=10)
+
+
+def test_parse_time_range_slack(tmp_path):
+    # Entries that are out of order by up to 3 seconds
+    offsets = [0, 1, 2, 5, 3, 4, 6, 9, 7, 8, 10, 11, 14, 12, 13, 15, 16, 17]
+    times = [BASE + timedelta(seconds=s) for s in offsets]
+    path = write_log(tmp_path / "access.log", times)
+    start = BASE + timedelta(seconds=5)
+    end = BASE + timedelta(seconds=12)
+    entries = list(
+        LogParser(COMMON).parse_time_range(path, start, end, slack=timedelta(seconds=3))
+    )
+    assert [e.request_time for e in entries] == [t for t in times if start <= t < end]
+    # Without the slack, out-of-order entries may be missed, but nothing
+    # outside the range is returned:
+    entries = list(LogParser(COMMON).parse_time_range(path, start, end))
+    assert all(start <= e.request_time < end for e in entries)
+
+
+def test_parse_time_range_invalid(tmp_path):
+    lines = [make_line(i, BASE + timedelta(seconds=i)) for i in range(50)]
+    lines.insert(40, "garbage\n")
+    lines.insert(10, "more garbage\n")
+    path = tmp_path / "access.log"
+    path.write_text("".join(lines))
+    parser = LogParser(COMMON)
+    start = BASE + timedelta(seconds=20)
+    end = BASE + timedelta(seconds=45)
+    entries = list(parser.parse_time_range(path, start, end, ignore_invalid=True))
+    assert [e.request_time for e in entries] == [
+        BASE + timedelta(seconds=i) for i in range(20, 45)
+    ]
+    with pytest.raises(InvalidEntryError) as excinfo:
+        list(parser.parse_time_range(path, start, end))
+    assert excinfo.value.entry == b"garbage"
+    assert excinfo.value.offset == len("".join(lines[:41]))
+
+
+def test_parse_time_range_epoch(ordered_log):
+    start = BASE + timedelta(minutes=10)
+    end = BASE + timedelta(minutes=20)
+    entries = list(
+        LogParser(COMMON, epoch="sec").parse_time_range(
+            ordered_log, int(start.timestamp()), int(end.timestamp()), slack=2
+        )
+    )
+    assert [e.entry.decode() for e in entries] == brute_force(ordered_log, start, end)
+
+
+def test_parse_time_range_empty(tmp_path):
+    path = tmp_path / "access.log"
+    path.touch()
+    assert list(LogParser(COMMON).parse_time_range(path, BASE, None)) == []
+
+
+def test_parse_time_range_function(ordered_log):
+    start = BASE + timedelta(minutes=10)
+    end = BASE + timedelta(minutes=11)
+    entries = list(parse_time_range(COMMON, ordered_log, start, end))
+    assert [e.entry.decode() for e in entries] == brute_force(ordered_log, start, end)
+
+
+def test_parse_time_range_bad_field(ordered_log):
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMMON).parse_time_range(
+            ordered_log, BASE, None, field="begin_request_time"
+        )
+    assert (
+        str(excinfo.value) == "Field not produced by log format: 'begin_request_time'"
+    )
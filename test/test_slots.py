@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+import pickle
+import pytest
+from apachelogs import COMBINED, VHOST_COMBINED, LogEntry, LogParser
+
+ENTRY = (
+    'www.varonathe.org:80 203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET /'
+    ' HTTP/1.1" 301 577 "-" "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0)'
+    ' Gecko/20100101 Firefox/58.0"'
+)
+
+
+def test_slotted_entry():
+    entry = LogParser(VHOST_COMBINED, slots=True).parse(ENTRY)
+    assert not isinstance(entry, LogEntry)
+    assert not hasattr(entry, "__dict__")
+    assert entry.format == VHOST_COMBINED
+    assert entry.virtual_host == "www.varonathe.org"
+    assert entry.final_status == 301
+    assert entry.request_time == datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc)
+    assert entry.request_time_fields == {"timestamp": entry.request_time}
+    assert entry.headers_in["user-agent"] == entry.headers_in["User-Agent"]
+    assert entry.directives["%>s"] == 301
+    assert entry == LogParser(VHOST_COMBINED).parse(ENTRY)
+    with pytest.raises(AttributeError):
+        entry.status
+    with pytest.raises(AttributeError):
+        entry.foo = 42
+
+
+def test_slotted_class_per_format():
+    p1 = LogParser(VHOST_COMBINED, slots=True)
+    p2 = LogParser(VHOST_COMBINED, encoding="utf-8", slots=True)
+    p3 = LogParser(COMBINED, slots=True)
+    assert type(p1.parse(ENTRY)) is type(p2.parse(ENTRY))
+    assert p1._entry_class is not p3._entry_class
+    assert "remote_host" in p3._entry_class.__slots__
+    assert "headers_in" not in p3._entry_class.__slots__
+
+
+def test_slotted_first_non_none():
+    entry = LogParser("%200b %b", slots=True).parse("- 42")
+    assert entry.bytes_sent == 42
+    assert entry.directives == {"%200b": None, "%b": 42}
+
+
+def test_slotted_pickle():
+    entry = LogParser(VHOST_COMBINED, slots=True).parse(ENTRY)
+    entry2 = pickle.loads(pickle.dumps(entry))
+    assert type(entry2) is type(entry)
+    assert entry2 == entry
+
+
+def test_lazy_slots_exclusive():
+    with pytest.raises(ValueError):
+        LogParser(COMBINED, lazy=True, slots=True)
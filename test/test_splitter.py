@@ -0,0 +1,206 @@
+from pathlib import Path
+import random
+import re
+import pytest
+from apachelogs import (
+    COMBINED,
+    COMBINED_DEBIAN,
+    COMMON,
+    COMMON_DEBIAN,
+    VHOST_COMBINED,
+    VHOST_COMMON,
+    InvalidEntryError,
+    LogParser,
+)
+from apachelogs.splitter import GuardedRegex, SplitMatcher
+
+LOG = Path(__file__).with_name("data") / "vhost_combined.log"
+
+ENTRY = (
+    '203.62.1.80 - - [06/May/2019:06:28:20 +0000] "GET / HTTP/1.1" 301 577 "-"'
+    ' "Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:58.0) Gecko/20100101'
+    ' Firefox/58.0"'
+)
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [COMMON, VHOST_COMMON, COMBINED, COMBINED_DEBIAN, COMMON_DEBIAN, VHOST_COMBINED],
+)
+def test_builtin_formats_split(fmt):
+    parser = LogParser(fmt, engine="split")
+    assert isinstance(parser._compiled.regex, SplitMatcher)
+    assert isinstance(parser._binary().regex, SplitMatcher)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize("opts", [{}, {"lazy": True}, {"fields": ["%h", "%r", "%t"]}])
+def test_same_as_regex(binary, opts):
+    with LOG.open() as fp:
+        lines = [line.rstrip("\n") for line in fp]
+    if binary:
+        lines = [line.encode("utf-8") for line in lines]
+    regex = LogParser(VHOST_COMBINED, **opts)
+    split = LogParser(VHOST_COMBINED, engine="split", **opts)
+    assert list(split.parse_lines(lines, ignore_invalid=True)) == list(
+        regex.parse_lines(lines, ignore_invalid=True)
+    )
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        ENTRY,
+        # A quote in a quoted string that isn't escaped:
+        ENTRY.replace("GET / HTTP/1.1", 'GET /"foo" HTTP/1.1'),
+        ENTRY.replace("GET / HTTP/1.1", 'GET /" 301 1 "-" "x HTTP/1.1'),
+        # Escape sequences:
+        ENTRY.replace("GET /", r"GET /\x22\" \\"),
+        ENTRY.replace("Firefox", r"Fire\"fox\" \"x"),
+        # A space in a field that can't contain spaces:
+        ENTRY.replace("- -", "- a b"),
+        ENTRY.replace("- -", '- ""'),
+        # The separator used for validation:
+        ENTRY.replace("GET /", "GET /\0"),
+        ENTRY.replace("- -", "- \0"),
+    ],
+)
+def test_tricky_entries(entry):
+    regex = LogParser(COMBINED)
+    split = LogParser(COMBINED, engine="split")
+    try:
+        expected = regex.parse(entry)
+    except InvalidEntryError:
+        with pytest.raises(InvalidEntryError):
+            split.parse(entry)
+    else:
+        assert split.parse(entry) == expected
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        "",
+        ENTRY[:-1],
+        ENTRY + " ",
+        ENTRY.replace("[", "("),
+        ENTRY.replace("301", "3O1"),
+        ENTRY.replace(' "-" ', " - "),
+    ],
+)
+def test_invalid_entries(entry):
+    with pytest.raises(InvalidEntryError):
+        LogParser(COMBINED, engine="split").parse(entry)
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        # A field that may contain the following literal:
+        '%h %{%Y-%m-%d %H:%M:%S}t "%r"',
+        "%400t %h",
+        # Nothing to split on:
+        "%h%l",
+        "literal",
+    ],
+)
+def test_unsplittable_formats(fmt):
+    assert isinstance(LogParser(fmt, engine="split")._compiled.regex, re.Pattern)
+
+
+@pytest.mark.parametrize("entry", ["host\\x4Aname", "hostA-", "\\x4A\\x4AA-"])
+def test_hex_digit_literal(entry):
+    split = LogParser("%hA%l", engine="split")
+    assert isinstance(split._compiled.regex, SplitMatcher)
+    assert split.parse(entry) == LogParser("%hA%l").parse(entry)
+
+
+def test_unquoted_request_line():
+    # "%r" ends at the first space after it, and the rest of the entry fails
+    # to match, so the regex is used.
+    entry = "1.2.3.4 GET / HTTP/1.1 200"
+    assert LogParser("%h %r %>s", engine="split").parse(entry) == LogParser(
+        "%h %r %>s"
+    ).parse(entry)
+
+
+def test_fuzz():
+    fmt = '%h %{X-A}i:%{X-B}i [%{%d/%b/%Y:%H:%M:%S %z}t] "%r" %>s "%{X-C}i"'
+    regex = LogParser(fmt)
+    split = LogParser(fmt, engine="split")
+    assert isinstance(split._compiled.regex, SplitMatcher)
+    rng = random.Random(1)
+    pieces = ["a", "-", " ", ":", '"', "\\", "\\x41", '\\"', "]", "[", "\0", "\\\\"]
+
+    def text():
+        return "".join(rng.choice(pieces) for _ in range(rng.randrange(4)))
+
+    valid = 0
+    for _ in range(3000):
+        entry = (
+            f'{text()} {text()}:{text()} [06/May/2019:06:28:20 +0000] "{text()}"'
+            f' 200 "{text()}"'
+        )
+        try:
+            expected = regex.parse(entry)
+        except InvalidEntryError:
+            with pytest.raises(InvalidEntryError):
+                split.parse(entry)
+        else:
+            valid += 1
+            assert split.parse(entry) == expected
+            assert split.parse(entry.encode()) == regex.parse(entry.encode())
+    assert valid > 100
+
+
+@pytest.mark.parametrize(
+    "fmt,guarded",
+    [
+        (COMMON, True),
+        ("%>s %b %D", False),
+        (VHOST_COMBINED, True),
+        ('%h %{%Y-%m-%d %H:%M:%S}t "%r"', False),
+    ],
+)
+def test_guarded_regex(fmt, guarded):
+    parser = LogParser(fmt)
+    assert isinstance(parser._compiled.regex, GuardedRegex) is guarded
+    assert isinstance(parser._binary().regex, GuardedRegex) is guarded
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_linear_check_fuzz(binary):
+    # The check must pass every entry that the regex matches.
+    fmt = '%v:%{X-A}i %u %t "%r" %{X-B}i:%{X-C}i'
+    regex = LogParser(fmt)._compiled.regex
+    check = LogParser(fmt, engine="split")._compiled.regex.check
+    if binary:
+        regex = LogParser(fmt)._binary().regex
+        check = LogParser(fmt, engine="split")._binary().regex.check
+    rng = random.Random(2)
+    pieces = ["a", "-", " ", ":", '"', '""', "\\", "\\\\", '\\"', "[", "]", "é"]
+
+    def text():
+        return "".join(rng.choice(pieces) for _ in range(rng.randrange(5)))
+
+    valid = rejected = 0
+    for _ in range(3000):
+        entry = (
+            f"{text()}:{text()} {text()} [06/May/2019:06:28:20 +0000]"
+            f' "{text()}" {text()}:{text()}'
+        )
+        if binary:
+            entry = entry.encode("utf-8")
+        if regex.regex.fullmatch(entry):
+            valid += 1
+            assert check.possible(entry)
+        elif not check.possible(entry):
+            rejected += 1
+    assert valid > 100
+    assert rejected > 100
+
+
+def test_bad_engine():
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMBINED, engine="fast")
+    assert str(excinfo.value) == "Invalid engine: 'fast'"
@@ -0,0 +1,68 @@
+from datetime import datetime
+import pytest
+from apachelogs.strftime import (
+    convert_hour_min,
+    convert_mdy_date,
+    convert_time,
+    convert_tzoffset,
+    convert_ymd_date,
+)
+
+
+def strptime(s, fmt):
+    try:
+        return datetime.strptime(s, fmt)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize(
+    "converter,fmt,attr,values",
+    [
+        (
+            convert_mdy_date,
+            "%m/%d/%y",
+            "date",
+            ["05/06/19", "12/ 1/68", "01/31/69", "02/29/00", "02/29/19", "04/31/99"],
+        ),
+        (
+            convert_ymd_date,
+            "%Y-%m-%d",
+            "date",
+            ["2019-05-06", "2019-01- 1", "2020-02-29", "2019-02-29", "0000-01-01"]
+            + ["12345-01-01", "9999-12-31"],
+        ),
+        (convert_hour_min, "%H:%M", "time", ["13:42", "00:00", "23:59", " 1:05"]),
+        (
+            convert_time,
+            "%H:%M:%S",
+            "time",
+            ["13:42:26", "00:00:00", "23:59:59", "01: 5:00", "12:00:60"],
+        ),
+        (convert_tzoffset, "%z", "tzinfo", ["+0000", "-0000", "-0500", "+2359"]),
+    ],
+)
+def test_matches_strptime(converter, fmt, attr, values):
+    for s in values:
+        expected = strptime(s, fmt)
+        if expected is None:
+            with pytest.raises(ValueError):
+                converter(s)
+        else:
+            expected = getattr(expected, attr)
+            if callable(expected):
+                expected = expected()
+            assert converter(s) == expected
+
+
+@pytest.mark.parametrize(
+    "converter",
+    [convert_mdy_date, convert_ymd_date, convert_hour_min, convert_time],
+)
+def test_none(converter):
+    assert converter(None) is None
+
+
+def test_tzoffset_empty():
+    assert convert_tzoffset("") is None
+    assert convert_tzoffset(None) is None
@@ -0,0 +1,182 @@
+from datetime import date, datetime, time, timedelta, timezone
+import pytest
+from apachelogs.timeutil import assemble_datetime, assemble_epoch, time_assembler
+
+UTC5 = timezone(timedelta(hours=5))
+
+
+@pytest.mark.parametrize(
+    "fields,specialized",
+    [
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+                "usec_frac": 123456,
+                "timezone": UTC5,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+                "timezone": UTC5,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "abbrev_mon": "May",
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+                "msec_frac": 123,
+                "abbrev_wday": "Mon",
+            },
+            True,
+        ),
+        (
+            {
+                "date": date(2019, 5, 6),
+                "time": time(6, 28, 20),
+                "timezone": timezone.utc,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour_min": time(6, 28),
+                "sec": 20,
+            },
+            True,
+        ),
+        (
+            {
+                "timestamp": datetime(2019, 5, 6, 6, 28, 20, tzinfo=timezone.utc),
+                "year": 2019,
+            },
+            True,
+        ),
+        # A chosen field is `None`:
+        (
+            {
+                "year": 2019,
+                "mon": None,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+                "timezone": None,
+            },
+            True,
+        ),
+        (
+            {
+                "year": 2019,
+                "abbrev_mon": "Foo",
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+            },
+            True,
+        ),
+        ({"timestamp": None, "epoch": 1557124100}, True),
+        # Combinations left to `assemble_datetime()`:
+        (
+            {
+                "year": 2019,
+                "yday": 126,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+            },
+            False,
+        ),
+        (
+            {
+                "year": 2019,
+                "abbrev_mon": "Jan",
+                "yday": 126,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+            },
+            False,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour12": 6,
+                "am_pm": "PM",
+                "min": 28,
+                "sec": 20,
+            },
+            False,
+        ),
+        (
+            {
+                "year": 2019,
+                "mon": 5,
+                "mday": 6,
+                "hour": 6,
+                "min": 28,
+                "sec": 20,
+                "tzname": "UTC",
+            },
+            False,
+        ),
+        ({"epoch": 1557124100}, False),
+        ({"year": 2019, "mon": 5, "mday": 6}, False),
+    ],
+)
+def test_time_assembler(fields, specialized):
+    assemble = time_assembler(fields)
+    assert (assemble is not assemble_datetime) is specialized
+    assert assemble(fields) == assemble_datetime(fields)
+    for unit in ("sec", "msec", "usec"):
+        assert time_assembler(fields, unit)(fields) == assemble_epoch(fields, unit)
+
+
+def test_time_assembler_invalid():
+    fields = {"year": 2019, "mon": 2, "mday": 30, "hour": 6, "min": 28, "sec": 20}
+    with pytest.raises(ValueError):
+        time_assembler(fields)(fields)
@@ -0,0 +1,199 @@
+from datetime import datetime, timedelta, timezone
+import os
+import random
+import pytest
+from apachelogs import COMMON, LogParser, StaleIndexError, TimeIndex
+
+BASE = datetime(2019, 5, 6, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_line(i, t):
+    return (
+        f"10.0.0.{i % 256} - - [{t:%d/%b/%Y:%H:%M:%S %z}]"
+        f' "GET /{i} HTTP/1.1" 200 {i}\n'
+    )
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    rng = random.Random(42)
+    lines = []
+    for i in range(2000):
+        # Out of order by up to a minute
+        t = BASE + timedelta(seconds=i * 3 - rng.randrange(60))
+        lines.append(make_line(i, t))
+        if i % 97 == 0:
+            lines.append("garbage\n")
+    path = tmp_path / "access.log"
+    path.write_text("".join(lines))
+    return path
+
+
+def brute_force(path, start, end):
+    with path.open() as fp:
+        return [
+            e.entry
+            for e in LogParser(COMMON).parse_lines(fp, ignore_invalid=True)
+            if (start is None or start <= e.request_time)
+            and (end is None or e.request_time < end)
+        ]
+
+
+def test_build_and_query(log_file):
+    parser = LogParser(COMMON)
+    index = parser.build_time_index(log_file, interval=50)
+    assert os.path.exists(str(log_file) + ".timeidx")
+    assert index.interval == 50
+    assert index.field == "request_time"
+    assert len(index.offsets) == len(log_file.read_text().splitlines()) // 50 + 1
+    loaded = TimeIndex.load(log_file)
+    assert list(loaded.offsets) == list(index.offsets)
+    assert list(loaded.times) == list(index.times)
+    assert (loaded.size, loaded.mtime_ns) == (index.size, index.mtime_ns)
+    rng = random.Random(0)
+    for _ in range(25):
+        start = BASE + timedelta(seconds=rng.randrange(-100, 6100))
+        end = start + timedelta(seconds=rng.randrange(0, 900))
+        entries = list(
+            parser.parse_time_range(
+                log_file,
+                start,
+                end,
+                slack=timedelta(minutes=1),
+                ignore_invalid=True,
+                index=loaded,
+            )
+        )
+        assert [e.entry.decode() for e in entries] == brute_force(log_file, start, end)
+    entries = list(
+        parser.parse_time_range(log_file, None, None, ignore_invalid=True, index=index)
+    )
+    assert len(entries) == 2000
+
+
+def test_epoch_parser(log_file):
+    parser = LogParser(COMMON, epoch="msec")
+    index = parser.build_time_index(log_file, interval=100)
+    start = BASE + timedelta(minutes=30)
+    end = BASE + timedelta(minutes=40)
+    entries = list(
+        parser.parse_time_range(
+            log_file,
+            int(start.timestamp()) * 1000,
+            int(end.timestamp()) * 1000,
+            slack=60000,
+            ignore_invalid=True,
+            index=index,
+        )
+    )
+    assert [e.entry.decode() for e in entries] == brute_force(log_file, start, end)
+
+
+def test_custom_index_path(log_file, tmp_path):
+    index_path = tmp_path / "index.bin"
+    LogParser(COMMON).build_time_index(log_file, index_path=index_path)
+    assert not os.path.exists(str(log_file) + ".timeidx")
+    index = TimeIndex.load(log_file, index_path)
+    assert index.interval == 1000
+    assert len(index.offsets) == 3
+
+
+def test_stale_index(log_file):
+    parser = LogParser(COMMON)
+    index = parser.build_time_index(log_file)
+    with log_file.open("a") as fp:
+        fp.write(make_line(2000, BASE + timedelta(hours=2)))
+    assert not index.is_current()
+    with pytest.raises(StaleIndexError) as excinfo:
+        TimeIndex.load(log_file)
+    assert str(excinfo.value) == (
+        f"Time index is out of date for log file {str(log_file)!r}"
+    )
+    with pytest.raises(StaleIndexError):
+        parser.parse_time_range(log_file, BASE, None, index=index)
+
+
+def test_not_an_index(log_file):
+    with pytest.raises(ValueError) as excinfo:
+        TimeIndex.load(log_file, log_file)
+    assert str(excinfo.value) == f"Not a time index file: {str(log_file)!r}"
+
+
+def test_truncated_index(log_file):
+    LogParser(COMMON).build_time_index(log_file)
+    index_path = str(log_file) + ".timeidx"
+    with open(index_path, "rb") as fp:
+        data = fp.read()
+    with open(index_path, "wb") as fp:
+        fp.write(data[:-8])
+    with pytest.raises(ValueError) as excinfo:
+        TimeIndex.load(log_file)
+    assert str(excinfo.value) == f"Corrupt time index file: {index_path!r}"
+
+
+def test_save_replaces_index(log_file):
+    parser = LogParser(COMMON)
+    parser.build_time_index(log_file, interval=500)
+    parser.build_time_index(log_file)
+    assert TimeIndex.load(log_file).interval == 1000
+    assert sorted(os.listdir(log_file.parent)) == [
+        log_file.name,
+        log_file.name + ".timeidx",
+    ]
+
+
+def test_index_field_mismatch(log_file):
+    parser = LogParser("%{begin:%Y-%m-%d %H:%M:%S}t %t")
+    index = parser.build_time_index(log_file, field="begin_request_time")
+    with pytest.raises(ValueError) as excinfo:
+        parser.parse_time_range(log_file, BASE, None, index=index)
+    assert str(excinfo.value) == (
+        "Time index is for field 'begin_request_time', not 'request_time'"
+    )
+
+
+def test_index_for_other_file(log_file, tmp_path):
+    other = tmp_path / "other.log"
+    other.write_bytes(log_file.read_bytes())
+    parser = LogParser(COMMON)
+    index = parser.build_time_index(log_file)
+    with pytest.raises(ValueError) as excinfo:
+        parser.parse_time_range(other, BASE, None, index=index)
+    assert str(excinfo.value) == (
+        f"Time index is for log file {str(log_file)!r}, not {str(other)!r}"
+    )
+
+
+@pytest.mark.parametrize("interval", [0, -1, 2**32])
+def test_bad_interval(log_file, interval):
+    with pytest.raises(ValueError) as excinfo:
+        LogParser(COMMON).build_time_index(log_file, interval=interval)
+    assert str(excinfo.value) == f"Invalid time index interval: {interval!r}"
+    assert not os.path.exists(str(log_file) + ".timeidx")
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "access.log"
+    path.touch()
+    parser = LogParser(COMMON)
+    index = parser.build_time_index(path)
+    assert list(index.offsets) == []
+    assert index.find_offset(1) == 0
+    assert list(parser.parse_time_range(path, BASE, None, index=index)) == []
+
+
+def test_find_offset(tmp_path):
+    times = [BASE + timedelta(seconds=i) for i in range(100)]
+    path = tmp_path / "access.log"
+    path.write_text("".join(make_line(i, t) for i, t in enumerate(times)))
+    index = LogParser(COMMON).build_time_index(path, interval=10)
+    assert len(index.offsets) == 10
+    data = path.read_bytes()
+    usec = int(BASE.timestamp()) * 1000000
+    assert index.find_offset(usec) == 0
+    assert index.find_offset(usec + 1) == 0
+    assert index.find_offset(usec + 25000000) == index.offsets[2]
+    assert index.find_offset(usec + 30000000) == index.offsets[2]
+    assert index.find_offset(usec + 30000001) == index.offsets[3]
+    assert index.offsets[3] == len("".join(data.decode().splitlines(True)[:30]))
+    assert index.find_offset(usec + 1000000000) == index.offsets[9]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from apachelogs import COMBINED, LogParser
+from apachelogs.util import MemoizedConverter
+
+ENTRY = '1.2.3.4 - - [{}] "GET / HTTP/1.1" 200 12 "-" "curl"'
+
+TS = ["01/Nov/2017:07:28:29 +0000", "01/Nov/2017:07:28:30 +0000"]
+
+
+def test_memoized_converter(mocker):
+    conv = mocker.Mock(side_effect=lambda s: int(s))
+    memo = MemoizedConverter(conv, maxsize=2)
+    assert [memo(s) for s in ["1", "1", "2", "1", "3", "2", "1"]] == [
+        1,
+        1,
+        2,
+        1,
+        3,
+        2,
+        1,
+    ]
+    assert [c.args for c in conv.call_args_list] == [
+        ("1",),
+        ("2",),
+        ("3",),
+        ("2",),
+        ("1",),
+    ]
+    info = memo.info()
+    assert info.hits == 2
+    assert info.misses == 5
+    assert info.evictions == 3
+    assert info.maxsize == 2
+    assert info.currsize == 2
+    assert info.hit_rate == 2 / 7
+    memo.clear()
+    assert memo.info() == (0, 0, 0, 2, 0)
+    assert memo.info().hit_rate == 0.0
+
+
+def test_memoized_converter_error():
+    memo = MemoizedConverter(int)
+    with pytest.raises(ValueError):
+        memo("x")
+    with pytest.raises(ValueError):
+        memo("x")
+    assert memo.info().currsize == 0
+
+
+@pytest.mark.parametrize("opts", [{}, {"lazy": True}, {"slots": True}])
+def test_timestamp_cache(opts):
+    parser = LogParser(COMBINED, **opts)
+    lines = [ENTRY.format(ts) for ts in [TS[0], TS[0], TS[1], TS[0], TS[1]]]
+    entries = list(parser.parse_lines(lines))
+    assert [e.request_time for e in entries] == [
+        datetime(2017, 11, 1, 7, 28, s, tzinfo=timezone.utc)
+        for s in (29, 29, 30, 29, 30)
+    ]
+    assert entries[0].request_time is entries[1].request_time
+    info = parser.timestamp_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 2, 2)
+    assert info.hit_rate == 0.6
+    (entry,) = parser.parse_lines([ENTRY.format(TS[0]).encode("iso-8859-1")])
+    assert entry.request_time == entries[0].request_time
+    assert parser.timestamp_cache_info().misses == 3
+
+
+def test_timestamp_cache_per_parser():
+    p1 = LogParser(COMBINED)
+    p2 = LogParser(COMBINED)
+    p1.parse(ENTRY.format(TS[0]))
+    assert p1.timestamp_cache_info().misses == 1
+    assert p2.timestamp_cache_info().misses == 0
+
+
+def test_timestamp_cache_disabled():
+    parser = LogParser(COMBINED, timestamp_cache_size=0)
+    e1 = parser.parse(ENTRY.format(TS[0]))
+    e2 = parser.parse(ENTRY.format(TS[0]))
+    assert e1.request_time == e2.request_time
+    assert e1.request_time is not e2.request_time
+    assert parser.timestamp_cache_info() == (0, 0, 0, 0, 0)
+
+
+def test_timestamp_cache_variants():
+    parser = LogParser("%{begin:}t %{end:}t %{%Y}t", timestamp_cache_size=None)
+    for _ in range(2):
+        entry = parser.parse(f"[{TS[0]}] [{TS[1]}] 2017")
+    assert entry.begin_request_time == datetime(
+        2017, 11, 1, 7, 28, 29, tzinfo=timezone(timedelta(0))
+    )
+    assert entry.end_request_time.second == 30
+    info = parser.timestamp_cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (2, 2, None)